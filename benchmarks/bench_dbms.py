@@ -0,0 +1,469 @@
+"""
+Benchmarks of the read/write paths of :class:`~pyhelpers.dbms.PostgreSQL`.
+
+Each case (an operation and a method, for a table of a given number of rows and columns) runs
+in a fresh process against a local PostgreSQL server, which records the throughput (rows/sec)
+and the peak resident set size (RSS) used by the operation. The cases are:
+
+- ``import_data``: ``PostgreSQL.import_data()`` with ``method=None``, ``'multi'``, ``'copy'``
+  (i.e. ``PostgreSQL.psql_insert_copy``), ``'copy_stream'`` and ``'copy_binary'``;
+- ``read_sql_query``: ``PostgreSQL.read_sql_query()`` with ``method='tempfile'``,
+  ``'stringio'``, ``'spooled'`` and ``'stream'``.
+
+The results are summarised by data shape, with the fastest method of each shape,
+saved as JSON, and (optionally) compared with the results of a previous run, e.g. of another
+version of pyhelpers, in which case a regression beyond ``--threshold`` fails the run.
+
+**Usage**::
+
+    # Against a temporary cluster (requires the PostgreSQL binaries `initdb` and `pg_ctl`)
+    $ python benchmarks/bench_dbms.py --initdb --output results-new.json
+
+    # Against a running server, e.g. in a Docker container started by
+    # `docker run -d -p 5432:5432 -e POSTGRES_PASSWORD=postgres postgres:16`
+    $ python benchmarks/bench_dbms.py --password postgres --baseline results-old.json
+
+The benchmarks use the installed version of pyhelpers (e.g. by ``pip install -e .``).
+The database ``--database-name`` (``'pyhelpers_bench'`` by default) is created if it does
+not exist, and the tables created in it are dropped afterwards. The peak RSS of a case is
+the increase in the peak RSS of its process during the operation; the tables read by the
+``read_sql_query`` cases are written beforehand in a separate process.
+"""
+
+import argparse
+import contextlib
+import datetime
+import getpass
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import sqlalchemy
+
+#: Methods of ``PostgreSQL.import_data()`` to be benchmarked.
+IMPORT_METHODS = [None, 'multi', 'copy', 'copy_stream', 'copy_binary']
+#: Methods of ``PostgreSQL.read_sql_query()`` to be benchmarked.
+READ_METHODS = ['tempfile', 'stringio', 'spooled', 'stream']
+#: Metrics compared between runs, and whether a higher value is better.
+METRICS = {'rows_per_sec': True, 'peak_rss_mb': False}
+
+
+def _peak_rss_mb():
+    """
+    Gets the peak resident set size of the current process.
+
+    :return: Peak RSS (in MiB), or ``None`` if it is not available on the platform.
+    :rtype: float | None
+    """
+
+    try:
+        import resource
+    except ImportError:  # e.g. on Windows
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().peak_wset / 1024 ** 2
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # In kilobytes on Linux, but in bytes on macOS
+    return peak_rss / 1024 ** (2 if sys.platform == 'darwin' else 1)
+
+
+def make_data(n_rows, n_cols, seed=0):
+    """
+    Makes a dataframe whose columns cycle through integer, float, text and timestamp columns.
+
+    :param n_rows: Number of rows.
+    :type n_rows: int
+    :param n_cols: Number of columns.
+    :type n_cols: int
+    :param seed: Seed of the random number generator; defaults to ``0``.
+    :type seed: int
+    :return: Data of the given shape, which is the same for the same arguments.
+    :rtype: pandas.DataFrame
+    """
+
+    rng = np.random.default_rng(seed)
+    words = np.array(['London', 'Birmingham', 'Manchester', 'Leeds', 'Glasgow, Scotland', ''])
+
+    columns = {}
+    for i in range(n_cols):
+        kind = i % 4
+        if kind == 0:
+            values = rng.integers(-2 ** 31, 2 ** 31, size=n_rows)
+        elif kind == 1:
+            values = rng.normal(size=n_rows)
+        elif kind == 2:
+            values = words[rng.integers(0, len(words), size=n_rows)]
+        else:
+            values = pd.Timestamp('2020-01-01') + pd.to_timedelta(
+                rng.integers(0, 10 ** 9, size=n_rows), unit='s')
+        columns[f'col_{i}'] = values
+
+    return pd.DataFrame(columns)
+
+
+def _connect(connection_kwargs):
+    from pyhelpers.dbms import PostgreSQL
+
+    return PostgreSQL(**connection_kwargs, confirm_db_creation=False, verbose=False)
+
+
+def _seed_table(connection_kwargs, table_name, n_rows, n_cols):
+    """
+    Creates a table of data to be read by the ``read_sql_query`` cases (in a separate process).
+    """
+
+    postgres = _connect(connection_kwargs)
+    try:
+        postgres.import_data(
+            make_data(n_rows=n_rows, n_cols=n_cols), table_name=table_name, if_exists='replace',
+            method='copy', confirmation_required=False)
+    finally:
+        postgres.engine.dispose()
+
+
+def _drop_table(connection_kwargs, table_name):
+    postgres = _connect(connection_kwargs)
+    try:
+        postgres.drop_table(table_name, confirmation_required=False)
+    finally:
+        postgres.engine.dispose()
+
+
+def _run_case(connection_kwargs, operation, method, n_rows, n_cols, chunk_size=None,
+              table_name=None):
+    """
+    Runs a benchmark case (in a fresh process).
+
+    For ``read_sql_query``, the table ``table_name`` is created beforehand by
+    :func:`_seed_table` in another process, as the peak RSS of a process never falls
+    and the data written to the table would otherwise hide the memory used by the read.
+
+    :return: Number of seconds taken by the operation, and the increase in peak RSS (in MiB).
+    :rtype: tuple[float, float | None]
+    """
+
+    postgres = _connect(connection_kwargs)
+
+    try:
+        if operation == 'read_sql_query':
+            sql_query = f'SELECT * FROM "{postgres.DEFAULT_SCHEMA}"."{table_name}"'
+
+            kwargs = {'chunksize': chunk_size} if chunk_size else {}
+            peak_rss = _peak_rss_mb()
+            start_time = time.perf_counter()
+            result = postgres.read_sql_query(sql_query, method=method, **kwargs)
+            if chunk_size:
+                n_read = sum(len(x) for x in result)
+            else:
+                n_read = len(result)
+            elapsed = time.perf_counter() - start_time
+            assert n_read == n_rows, f"{n_read} rows read, {n_rows} expected."
+
+        else:
+            table_name = f'bench_{os.getpid()}'
+            data = make_data(n_rows=n_rows, n_cols=n_cols)
+
+            peak_rss = _peak_rss_mb()
+            start_time = time.perf_counter()
+            try:
+                postgres.import_data(
+                    data, table_name=table_name, if_exists='replace', method=method,
+                    chunk_size=chunk_size, confirmation_required=False)
+            finally:
+                elapsed = time.perf_counter() - start_time
+                postgres.drop_table(table_name, confirmation_required=False)
+
+        peak_rss_ = _peak_rss_mb()
+        rss_increase = None if peak_rss is None else peak_rss_ - peak_rss
+
+    finally:
+        postgres.engine.dispose()
+
+    return elapsed, rss_increase
+
+
+def run_benchmarks(connection_kwargs, row_counts, widths, operations, repeat=3, chunk_size=None,
+                   verbose=True):
+    """
+    Runs the benchmark cases, each ``repeat`` times in a fresh process.
+
+    :param connection_kwargs: Parameters for creating an instance of
+        :class:`~pyhelpers.dbms.PostgreSQL`.
+    :type connection_kwargs: dict
+    :param row_counts: Numbers of rows of the tables.
+    :type row_counts: list[int]
+    :param widths: Numbers of columns of the tables.
+    :type widths: list[int]
+    :param operations: Operations to benchmark, i.e. ``'import_data'`` and/or ``'read_sql_query'``.
+    :type operations: list[str]
+    :param repeat: Number of times each case is run; defaults to ``3``.
+    :type repeat: int
+    :param chunk_size: Number of rows written (or read) at a time; defaults to ``None``.
+    :type chunk_size: int | None
+    :param verbose: Whether to print the progress; defaults to ``True``.
+    :type verbose: bool
+    :return: The median throughput and the maximum increase in peak RSS of each case.
+    :rtype: pandas.DataFrame
+    """
+
+    methods = {'import_data': IMPORT_METHODS, 'read_sql_query': READ_METHODS}
+    context = multiprocessing.get_context('spawn')
+
+    def _apply(func, *args):
+        # A fresh process for each call, so that the peak RSS is of this call only
+        with context.Pool(processes=1) as pool:
+            return pool.apply(func, args)
+
+    results = []
+    for operation in operations:
+        for n_rows in row_counts:
+            for n_cols in widths:
+                table_name = None
+                if operation == 'read_sql_query':
+                    table_name = f'bench_read_{os.getpid()}'
+                    _apply(_seed_table, connection_kwargs, table_name, n_rows, n_cols)
+
+                try:
+                    for method in methods[operation]:
+                        if verbose:
+                            print(f"{operation}(method={method!r}): "
+                                  f"{n_rows:,} rows x {n_cols} columns", end=" ... ", flush=True)
+
+                        timings, rss_increases = [], []
+                        for _ in range(repeat):
+                            elapsed, rss_increase = _apply(
+                                _run_case, connection_kwargs, operation, method, n_rows, n_cols,
+                                chunk_size, table_name)
+                            timings.append(elapsed)
+                            rss_increases.append(rss_increase)
+
+                        elapsed = statistics.median(timings)
+                        result = {
+                            'operation': operation,
+                            'method': str(method),
+                            'n_rows': n_rows,
+                            'n_cols': n_cols,
+                            'elapsed': elapsed,
+                            'rows_per_sec': n_rows / elapsed if elapsed > 0 else float('inf'),
+                            'peak_rss_mb': None if None in rss_increases else max(rss_increases),
+                        }
+                        results.append(result)
+
+                        if verbose:
+                            print(f"{result['rows_per_sec']:,.0f} rows/s")
+
+                finally:
+                    if table_name:
+                        _apply(_drop_table, connection_kwargs, table_name)
+
+    return pd.DataFrame(results)
+
+
+def summarise(results):
+    """
+    Tabulates the throughput of the methods by data shape, with the fastest method of each shape.
+
+    :param results: Results of :func:`run_benchmarks`.
+    :type results: pandas.DataFrame
+    :return: Throughput (rows/sec) of each method, and the fastest method,
+        by the operation and the shape of the table.
+    :rtype: pandas.DataFrame
+    """
+
+    summary = results.pivot_table(
+        index=['operation', 'n_rows', 'n_cols'], columns='method', values='rows_per_sec',
+        sort=False)
+    summary.columns.name = None
+    summary['fastest'] = summary.idxmax(axis=1)
+
+    return summary
+
+
+def compare(results, baseline, threshold=0.1):
+    """
+    Compares the results with those of a previous run.
+
+    :param results: Results of :func:`run_benchmarks`.
+    :type results: pandas.DataFrame
+    :param baseline: Results of a previous run.
+    :type baseline: pandas.DataFrame
+    :param threshold: Relative change beyond which a metric is regarded as regressed,
+        e.g. ``0.1`` for a 10% fall in the throughput or a 10% rise in the peak RSS;
+        defaults to ``0.1``.
+    :type threshold: float
+    :return: Relative changes of the metrics of the cases in both runs,
+        with whether each case has regressed.
+    :rtype: pandas.DataFrame
+    """
+
+    keys = ['operation', 'method', 'n_rows', 'n_cols']
+    merged = results.merge(baseline, on=keys, suffixes=('', '_baseline'))
+
+    regressed = pd.Series(False, index=merged.index)
+    for metric, higher_is_better in METRICS.items():
+        # Metrics with a baseline of zero (e.g. no increase in the peak RSS) have no relative
+        # change, and are left out of the check
+        base = merged[f'{metric}_baseline'].astype(float)
+        change = (merged[metric].astype(float) - base) / base.where(base != 0)
+        merged[f'{metric}_change'] = change
+        regressed |= (-change if higher_is_better else change) > threshold
+
+    merged['regressed'] = regressed
+
+    return merged[keys + [f'{x}_change' for x in METRICS] + ['regressed']]
+
+
+def _metadata(connection_kwargs):
+    import pyhelpers
+
+    postgres = _connect(connection_kwargs)
+    with postgres.engine.connect() as connection:
+        server_version = connection.execute(sqlalchemy.text('SHOW server_version;')).scalar()
+    postgres.engine.dispose()
+
+    return {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'pyhelpers': pyhelpers.__version__,
+        'pandas': pd.__version__,
+        'sqlalchemy': sqlalchemy.__version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'server_version': server_version,
+    }
+
+
+@contextlib.contextmanager
+def temporary_cluster():
+    """
+    Starts a temporary PostgreSQL cluster, which is removed on exit.
+
+    :return: Parameters for connecting to the cluster.
+    :rtype: typing.Generator[dict, None, None]
+    """
+
+    for binary in ('initdb', 'pg_ctl'):
+        if shutil.which(binary) is None:
+            raise RuntimeError(f"`{binary}` is not found; add the PostgreSQL binaries to PATH.")
+
+    with socket.socket() as s:  # Pick a free port
+        s.bind(('localhost', 0))
+        port = s.getsockname()[1]
+
+    data_dir = tempfile.mkdtemp(prefix='pyhelpers_bench_')
+    try:
+        subprocess.run(
+            ['initdb', '-D', data_dir, '-U', 'postgres', '--auth=trust', '--no-sync'],
+            check=True, capture_output=True)
+        subprocess.run(
+            ['pg_ctl', '-D', data_dir, '-l', os.path.join(data_dir, 'server.log'), '-w',
+             '-o', f'-p {port} -k {data_dir} -c listen_addresses=localhost -c fsync=off',
+             'start'],
+            check=True, capture_output=True)
+
+        try:
+            yield {'host': 'localhost', 'port': port, 'username': 'postgres', 'password': ''}
+        finally:
+            subprocess.run(['pg_ctl', '-D', data_dir, '-m', 'fast', 'stop'], capture_output=True)
+
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def _parse_args(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+
+    server = parser.add_argument_group('server')
+    server.add_argument(
+        '--initdb', action='store_true', help="run against a temporary cluster")
+    server.add_argument('--host', default=os.environ.get('PGHOST', 'localhost'))
+    server.add_argument('--port', type=int, default=int(os.environ.get('PGPORT', 5432)))
+    server.add_argument('--username', default=os.environ.get('PGUSER', 'postgres'))
+    server.add_argument('--password', default=os.environ.get('PGPASSWORD'))
+    server.add_argument('--database-name', default='pyhelpers_bench')
+
+    cases = parser.add_argument_group('cases')
+    cases.add_argument(
+        '--rows', type=int, nargs='+', default=[1000, 100000], help="numbers of rows")
+    cases.add_argument(
+        '--widths', type=int, nargs='+', default=[4, 32], help="numbers of columns")
+    cases.add_argument(
+        '--operations', nargs='+', default=['import_data', 'read_sql_query'],
+        choices=['import_data', 'read_sql_query'])
+    cases.add_argument('--repeat', type=int, default=3, help="runs of each case")
+    cases.add_argument('--chunk-size', type=int, default=None)
+
+    report = parser.add_argument_group('report')
+    report.add_argument('--output', default=None, help="path to a JSON file of the results")
+    report.add_argument(
+        '--baseline', default=None, help="path to a JSON file of the results of a previous run")
+    report.add_argument(
+        '--threshold', type=float, default=0.1, help="relative change regarded as a regression")
+
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    """
+    Runs the benchmarks from the command line.
+
+    :return: Exit status, which is ``1`` if any case has regressed from the baseline.
+    :rtype: int
+    """
+
+    args = _parse_args(args)
+
+    with contextlib.ExitStack() as stack:
+        if args.initdb:
+            connection_kwargs = stack.enter_context(temporary_cluster())
+        else:
+            password = args.password
+            if password is None:  # Prompt once, rather than in each process
+                password = getpass.getpass(f'Password ({args.username}@{args.host}:{args.port}): ')
+            connection_kwargs = {
+                'host': args.host, 'port': args.port, 'username': args.username,
+                'password': password}
+        connection_kwargs['database_name'] = args.database_name
+
+        metadata = _metadata(connection_kwargs)
+        results = run_benchmarks(
+            connection_kwargs, row_counts=args.rows, widths=args.widths,
+            operations=args.operations, repeat=args.repeat, chunk_size=args.chunk_size)
+
+    with pd.option_context('display.width', 120, 'display.float_format', '{:,.0f}'.format):
+        print(f"\nThroughput (rows/sec):\n{summarise(results)}")
+
+    if args.output:
+        with open(args.output, mode='w') as f:
+            json.dump({'metadata': metadata, 'results': results.to_dict('records')}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, mode='r') as f:
+            baseline = json.load(f)
+        comparison = compare(
+            results, pd.DataFrame(baseline['results']), threshold=args.threshold)
+
+        with pd.option_context('display.width', 120, 'display.float_format', '{:+.1%}'.format):
+            print(f"\nChanges from pyhelpers {baseline['metadata']['pyhelpers']} "
+                  f"(threshold: {args.threshold:.0%}):\n{comparison}")
+
+        if comparison['regressed'].any():
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -84,6 +84,7 @@ def _resolve_dependency_info(name):
         "pillow": ("PIL", "Pillow"),
 
         # File Formats
+        "lz4.frame": ("lz4.frame", "lz4"),
         "odfpy": ("odf", "odfpy"),
         "odf": ("odf", "odfpy"),
         "python-rapidjson": ("rapidjson", "python-rapidjson"),
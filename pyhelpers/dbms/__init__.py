@@ -6,6 +6,6 @@ Communication with databases.
 """
 
 from .mssql import MSSQL
-from .postgresql import PostgreSQL
+from .postgresql import AsyncPostgreSQL, PostgreSQL
 
-__all__ = ['MSSQL', 'PostgreSQL']
+__all__ = ['MSSQL', 'PostgreSQL', 'AsyncPostgreSQL']
@@ -2,17 +2,542 @@
 Communication with database servers.
 """
 
+import collections
+import contextlib
 import copy
+import functools
 import gc
 import inspect
 import itertools
+import logging
+import threading
+import time
 import typing
+import uuid
 
 import pandas as pd
 import sqlalchemy
 
 from .._cache import _confirmed, _lazy_check_dependencies, _print_failure_message
 
+# SQLAlchemy engines shared across instances, keyed by the URL and the engine options
+_ENGINE_REGISTRY = {}
+_ENGINE_REGISTRY_LOCK = threading.Lock()
+# Spans that are open in each thread (see _Base._span)
+_OPEN_SPANS = threading.local()
+
+
+class _MetadataCache:
+    """
+    A TTL/LRU cache of catalog metadata, keyed by database, schema and table names.
+
+    Lookups are bypassed while a method that modifies the catalog is running
+    (see :func:`_invalidates_metadata`), so that its own checks always see the current state.
+    """
+
+    def __init__(self, ttl=300, max_size=1024):
+        """
+        :param ttl: Number of seconds for which a cached item remains valid;
+            if ``ttl=None``, cached items do not expire.
+        :type ttl: int | float | None
+        :param max_size: Maximum number of cached items;
+            the least recently used items are evicted beyond this size.
+        :type max_size: int
+        """
+
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self._items = collections.OrderedDict()
+        self._lock = threading.RLock()
+        self._suspended = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        """
+        Gets a cached item.
+
+        :param key: Key of the item, i.e. ``(database, schema, table, method, arguments)``.
+        :type key: tuple
+        :return: Whether the item is cached, and (a copy of) the cached value.
+        :rtype: tuple[bool, typing.Any]
+        """
+
+        with self._lock:
+            if self._suspended or key not in self._items:
+                return False, None
+
+            expiry, value = self._items[key]
+            if expiry is not None and expiry < time.monotonic():
+                del self._items[key]
+                return False, None
+
+            self._items.move_to_end(key)
+
+            return True, copy.deepcopy(value)
+
+    def put(self, key, value):
+        """
+        Caches an item.
+
+        :param key: Key of the item, i.e. ``(database, schema, table, method, arguments)``.
+        :type key: tuple
+        :param value: Value of the item.
+        :type value: typing.Any
+        """
+
+        with self._lock:
+            if self._suspended:
+                return
+
+            expiry = None if self.ttl is None else time.monotonic() + self.ttl
+            self._items[key] = (expiry, copy.deepcopy(value))
+            self._items.move_to_end(key)
+
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def invalidate(self, database_name=None, schema_name=None, table_name=None):
+        """
+        Removes cached items of a database, schema or table (or all items if nothing specified).
+
+        Removing the items of a table also removes the schema-level items
+        (e.g. the primary keys of all tables) in the same schema.
+
+        :param database_name: Name of the database.
+        :type database_name: str | None
+        :param schema_name: Name of the schema.
+        :type schema_name: str | None
+        :param table_name: Name of the table.
+        :type table_name: str | None
+        """
+
+        def _matched(key):
+            db_name, sch_name, tbl_name = key[:3]
+            return (database_name is None or db_name == database_name) and \
+                (schema_name is None or sch_name == schema_name) and \
+                (table_name is None or tbl_name in {table_name, None})
+
+        with self._lock:
+            for key in [k for k in self._items if _matched(k)]:
+                del self._items[key]
+
+    def suspend(self):
+        """
+        Bypasses the cache until :meth:`resume` is called.
+        """
+
+        with self._lock:
+            self._suspended += 1
+
+    def resume(self):
+        """
+        Resumes the cache bypassed by :meth:`suspend`.
+        """
+
+        with self._lock:
+            self._suspended = max(0, self._suspended - 1)
+
+
+def _metadata_cache_key(dbms, func_name, arguments):
+    """
+    Makes a key for the metadata cache from the arguments of a method.
+
+    :param dbms: Instance of a database class.
+    :type dbms: _Base
+    :param func_name: Name of the method.
+    :type func_name: str
+    :param arguments: Arguments (bound to the parameters) of the method.
+    :type arguments: dict
+    :return: Key of the item, or ``None`` if the arguments cannot be used as a key.
+    :rtype: tuple | None
+    """
+
+    arguments_ = {k: v for k, v in arguments.items() if k != 'self'}
+
+    schema_name = dbms._schema_name(schema_name=arguments_.pop('schema_name', None))
+    table_name = arguments_.pop('table_name', None)
+
+    if not isinstance(schema_name, str) or not isinstance(table_name, (str, type(None))):
+        return None
+
+    key = (dbms.database_name, schema_name, table_name, func_name, repr(sorted(arguments_.items())))
+
+    return key
+
+
+def _cached_metadata(func):
+    """
+    Memoises a catalog lookup in the metadata cache of the instance (if the cache is enabled).
+
+    :param func: A method looking up the catalog, taking ``table_name`` and/or ``schema_name``.
+    :type func: typing.Callable
+    :return: The decorated method.
+    :rtype: typing.Callable
+    """
+
+    signature = inspect.signature(func)
+
+    def _cache_key(dbms, args, kwargs):
+        if getattr(dbms, 'metadata_cache', None) is None:
+            return None
+
+        bound_args = signature.bind(dbms, *args, **kwargs)
+        bound_args.apply_defaults()
+
+        return _metadata_cache_key(dbms, func.__name__, bound_args.arguments)
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            key = _cache_key(self, args, kwargs)
+            if key is None:
+                return await func(self, *args, **kwargs)
+
+            cached, value = self.metadata_cache.get(key)
+            if not cached:
+                value = await func(self, *args, **kwargs)
+                self.metadata_cache.put(key, value)
+
+            return value
+
+    else:
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key = _cache_key(self, args, kwargs)
+            if key is None:
+                return func(self, *args, **kwargs)
+
+            cached, value = self.metadata_cache.get(key)
+            if not cached:
+                value = func(self, *args, **kwargs)
+                self.metadata_cache.put(key, value)
+
+            return value
+
+    return wrapper
+
+
+def _invalidates_metadata(func):
+    """
+    Invalidates the metadata cache of the instance for the objects modified by a method.
+
+    The table (and/or schemas) named in the arguments are invalidated before and after the call,
+    and the cache is bypassed during the call. A method that takes only a ``database_name``
+    (e.g. to drop a database) clears the whole cache.
+
+    :param func: A method modifying the catalog, e.g. creating or dropping a table.
+    :type func: typing.Callable
+    :return: The decorated method.
+    :rtype: typing.Callable
+    """
+
+    signature = inspect.signature(func)
+
+    def _invalidate(dbms, cache, arguments):
+        schema_names = []
+        for k in ('schema_name', 'schema_names', 'new_schema_name'):
+            if k in arguments:
+                schema_name_ = dbms._schema_name(schema_name=arguments[k])
+                schema_names += [schema_name_] if isinstance(schema_name_, str) else schema_name_
+
+        if 'table_name' in arguments:
+            for schema_name in schema_names or [dbms._schema_name()]:
+                cache.invalidate(dbms.database_name, schema_name, arguments['table_name'])
+        elif schema_names:
+            for schema_name in schema_names:
+                cache.invalidate(dbms.database_name, schema_name)
+        else:
+            cache.invalidate()
+
+    def _arguments(dbms, args, kwargs):
+        bound_args = signature.bind(dbms, *args, **kwargs)
+        bound_args.apply_defaults()
+
+        return bound_args.arguments
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            cache = getattr(self, 'metadata_cache', None)
+            if cache is None:
+                return await func(self, *args, **kwargs)
+
+            arguments = _arguments(self, args, kwargs)
+            _invalidate(self, cache, arguments)
+            cache.suspend()
+
+            try:
+                return await func(self, *args, **kwargs)
+
+            finally:
+                cache.resume()
+                _invalidate(self, cache, arguments)
+
+    else:
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, 'metadata_cache', None)
+            if cache is None:
+                return func(self, *args, **kwargs)
+
+            arguments = _arguments(self, args, kwargs)
+            _invalidate(self, cache, arguments)
+            cache.suspend()
+
+            try:
+                return func(self, *args, **kwargs)
+
+            finally:
+                cache.resume()
+                _invalidate(self, cache, arguments)
+
+    return wrapper
+
+
+class _AdaptiveChunkSize:
+    """
+    Sizes the chunks of data to be imported, adapting to the measured throughput.
+
+    The number of rows that fit in a memory budget is estimated from the bytes per row
+    (by ``DataFrame.memory_usage(deep=True)`` of a sample of rows). After each chunk is written,
+    the size is moved towards the number of rows that would be written in ``batch_latency``
+    seconds at the observed rate (rows/sec), at most doubling or halving at a time and
+    never exceeding the memory budget.
+    """
+
+    def __init__(self, memory_budget=0.25, batch_latency=2.0, initial_size=10000, min_size=100,
+                 max_size=None):
+        """
+        :param memory_budget: Maximum memory usage (in gigabyte) of a chunk.
+        :type memory_budget: int | float
+        :param batch_latency: Target number of seconds for writing a chunk.
+        :type batch_latency: int | float
+        :param initial_size: Number of rows of the first chunk (within the memory budget).
+        :type initial_size: int
+        :param min_size: Minimum number of rows of a chunk.
+        :type min_size: int
+        :param max_size: Maximum number of rows of a chunk, if any.
+        :type max_size: int | None
+        """
+
+        self.memory_budget = memory_budget
+        self.batch_latency = batch_latency
+        self.min_size = min_size
+        self.max_size = max_size
+
+        self.size = initial_size
+        self._max_rows = None
+
+    def _clip(self, size):
+        size = max(int(size), self.min_size)
+        for max_rows in (self._max_rows, self.max_size):
+            if max_rows is not None:
+                size = min(size, max_rows)
+
+        return max(1, size)
+
+    def estimate(self, data, n_samples=10000):
+        """
+        Estimates the number of rows of the data that fit in the memory budget.
+
+        :param data: Data to be imported.
+        :type data: pandas.DataFrame
+        :param n_samples: Number of rows by which the bytes per row are estimated.
+        :type n_samples: int
+        """
+
+        sample = data.iloc[:n_samples]
+        row_bytes = sample.memory_usage(index=True, deep=True).sum() / max(1, len(sample))
+
+        self._max_rows = max(1, int(self.memory_budget * 1024 ** 3 / max(1.0, row_bytes)))
+        self.size = self._clip(self.size)
+
+    def update(self, n_rows, elapsed):
+        """
+        Adjusts the chunk size by the time taken to write a chunk.
+
+        :param n_rows: Number of rows of the chunk.
+        :type n_rows: int
+        :param elapsed: Number of seconds taken to write the chunk.
+        :type elapsed: float
+        """
+
+        target = self.size * 2 if elapsed <= 0 else n_rows / elapsed * self.batch_latency
+        self.size = self._clip(min(max(target, self.size / 2), self.size * 2))
+
+    def split(self, frames):
+        """
+        Splits dataframes into chunks, adjusting the size by the time each chunk is held.
+
+        The time between yielding a chunk and resuming (i.e. taken by the caller to write it)
+        is measured for :meth:`update`.
+
+        :param frames: Dataframes to be imported.
+        :type frames: typing.Iterable[pandas.DataFrame]
+        :return: Chunks of the dataframes; an empty dataframe is yielded as is.
+        :rtype: typing.Generator[pandas.DataFrame, None, None]
+        """
+
+        for data in frames:
+            if data.empty:
+                yield data
+                continue
+
+            self.estimate(data)
+
+            start = 0
+            while start < len(data):
+                chunk = data.iloc[start:start + self.size]
+                start += len(chunk)
+
+                start_time = time.perf_counter()
+                yield chunk
+                self.update(len(chunk), time.perf_counter() - start_time)
+
+
+class _Span:
+    """
+    A timed phase of a database operation, e.g. a catalog check or a ``COPY`` transfer.
+
+    A span is passed to each instrumentation hook of the instance when it ends
+    (see :meth:`~pyhelpers.dbms._base._Base.add_instrumentation_hook`).
+    """
+
+    def __init__(self, name, parent=None, **attributes):
+        """
+        :param name: Name of the phase.
+        :type name: str
+        :param parent: The span within which this span is opened, if any.
+        :type parent: _Span | None
+        :param attributes: Attributes of the phase, e.g. ``table_name``, ``rows`` and ``bytes``.
+
+        :ivar float start_time: Time (in seconds since the epoch) at which the span started.
+        :ivar float | None elapsed: Number of seconds taken, once the span has ended.
+        :ivar BaseException | None error: Exception raised within the span, if any.
+        """
+
+        self.name = name
+        self.parent = parent
+        self.attributes = attributes
+
+        self.start_time = time.time()
+        self.elapsed = None
+        self.error = None
+
+    def __repr__(self):
+        attributes = ''.join(f', {k}={v!r}' for k, v in self.attributes.items())
+        return f'{self.__class__.__name__}({self.path!r}, elapsed={self.elapsed!r}{attributes})'
+
+    @property
+    def path(self):
+        """
+        Names of the enclosing spans and this span, joined by ``'/'``,
+        e.g. ``'import_data/write_chunk'``.
+        """
+
+        return self.name if self.parent is None else f'{self.parent.path}/{self.name}'
+
+    def add(self, **counts):
+        """
+        Adds to the counts (e.g. ``rows`` and ``bytes``) recorded by the span.
+
+        :param counts: Numbers keyed by the names of the attributes.
+        """
+
+        for k, v in counts.items():
+            self.attributes[k] = self.attributes.get(k, 0) + v
+
+    @property
+    def counts(self):
+        """
+        The counts of ``rows`` and ``bytes`` recorded by the span (without other attributes),
+        e.g. to be added to an enclosing span.
+        """
+
+        return {k: v for k, v in self.attributes.items() if k in ('rows', 'bytes')}
+
+
+def _current_span():
+    """
+    Gets the innermost open span of the current thread.
+
+    :return: The span, or ``None`` if no span is open (or there is no instrumentation hook).
+    :rtype: _Span | None
+    """
+
+    spans = getattr(_OPEN_SPANS, 'spans', None)
+    return spans[-1] if spans else None
+
+
+def _add_to_span(**counts):
+    """
+    Adds to the counts recorded by the innermost open span of the current thread, if any.
+
+    This lets functions without access to the instance (e.g. the callables passed to
+    `pandas.DataFrame.to_sql()`_ as ``method``) report the rows and bytes they have moved.
+
+    :param counts: Numbers keyed by the names of the attributes, e.g. ``bytes``.
+
+    .. _`pandas.DataFrame.to_sql()`:
+        https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.to_sql.html
+    """
+
+    span = _current_span()
+    if span is not None:
+        span.add(**counts)
+
+
+def _log_span(span):
+    """
+    An instrumentation hook that logs a span with the logger ``'pyhelpers.dbms'``.
+
+    :param span: A span that has ended.
+    :type span: _Span
+    """
+
+    attributes = ''.join(f', {k}={v}' for k, v in span.attributes.items())
+    status = '' if span.error is None else f' (failed: {span.error!r})'
+    logging.getLogger('pyhelpers.dbms').info(
+        f'{span.path}: {span.elapsed:.6f}s{attributes}{status}')
+
+
+def _spanned(name, get_attributes=None):
+    """
+    Times each call of a method as a span (see :meth:`~pyhelpers.dbms._base._Base._span`).
+
+    :param name: Name of the span.
+    :type name: str
+    :param get_attributes: Function taking the instance and the (bound) arguments of the method,
+        which returns the attributes of the span; defaults to ``None``.
+    :type get_attributes: typing.Callable | None
+    :return: Decorator of the method.
+    :rtype: typing.Callable
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not getattr(self, 'instrumentation_hooks', None):
+                return func(self, *args, **kwargs)
+
+            attributes = {}
+            if get_attributes is not None:
+                bound_args = signature.bind(self, *args, **kwargs)
+                bound_args.apply_defaults()
+                attributes = get_attributes(self, bound_args.arguments)
+
+            with self._span(name, **attributes):
+                return func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
 
 class _Base:
     """
@@ -30,12 +555,340 @@ class _Base:
         :ivar str address: Address of the server; defaults to ``''``.
         :ivar str engine: Engine; defaults to ``None``.
         :ivar set builtin_schema_names: Names of the built-in schemas; defaults to ``{}``.
+        :ivar dict pool_options: Connection pool options for creating the engine;
+            defaults to ``{}``.
+        :ivar _MetadataCache | None metadata_cache: Cache of catalog metadata
+            (see :meth:`enable_metadata_cache`); defaults to ``None`` (i.e. disabled).
+        :ivar list instrumentation_hooks: Callables to which the timed phases of operations
+            are passed (see :meth:`add_instrumentation_hook`); defaults to ``[]``.
         """
 
         self.database_name = ''
         self.address = ''
         self.engine = None
         self.builtin_schema_names = {}
+        self.pool_options = {}
+        self.metadata_cache = None
+        self.instrumentation_hooks = []
+
+    def _set_pool_options(self, pool_size=None, max_overflow=None, pool_pre_ping=None,
+                          pool_recycle=None):
+        """
+        Sets the connection pool options for creating (or reusing) engines.
+
+        Options that are ``None`` are left to the defaults of `SQLAlchemy`_.
+
+        :param pool_size: Number of connections to keep open in the pool.
+        :type pool_size: int | None
+        :param max_overflow: Number of connections allowed beyond ``pool_size``.
+        :type max_overflow: int | None
+        :param pool_pre_ping: Whether to test a connection for liveness when checking it out.
+        :type pool_pre_ping: bool | None
+        :param pool_recycle: Number of seconds after which a connection is recycled.
+        :type pool_recycle: int | None
+
+        .. _`SQLAlchemy`:
+            https://docs.sqlalchemy.org/en/latest/core/pooling.html
+        """
+
+        pool_options = {
+            'pool_size': pool_size,
+            'max_overflow': max_overflow,
+            'pool_pre_ping': pool_pre_ping,
+            'pool_recycle': pool_recycle,
+        }
+
+        self.pool_options = {k: v for k, v in pool_options.items() if v is not None}
+
+    def _create_engine(self, url, **kwargs):
+        """
+        Creates a SQLAlchemy engine, or reuses the one created for the same URL and options.
+
+        Engines are kept in a registry shared by all instances, so that repeated instances
+        (and methods that switch between databases) reuse a pool of warm connections
+        rather than opening new ones.
+
+        :param url: URL of the database.
+        :type url: str | sqlalchemy.engine.URL
+        :param kwargs: [Optional] Additional parameters for the function
+            `sqlalchemy.create_engine()`_, which override :attr:`pool_options`.
+        :return: A SQLAlchemy connectable engine.
+        :rtype: sqlalchemy.engine.Engine
+
+        .. _`sqlalchemy.create_engine()`:
+            https://docs.sqlalchemy.org/en/latest/core/engines.html#sqlalchemy.create_engine
+
+        **Examples**::
+
+            >>> from pyhelpers.dbms import PostgreSQL
+            >>> postgres = PostgreSQL()
+            Password (postgres@localhost:5432): ***
+            Connecting postgres:***@localhost:5432/postgres ... Successfully.
+            >>> postgres._create_engine(postgres.engine.url) is postgres.engine
+            True
+        """
+
+        url_ = sqlalchemy.engine.make_url(url)
+        options = {'isolation_level': 'AUTOCOMMIT', **self.pool_options, **kwargs}
+
+        key = (url_.render_as_string(hide_password=False), repr(sorted(options.items())))
+
+        with _ENGINE_REGISTRY_LOCK:
+            engine = _ENGINE_REGISTRY.get(key)
+            if engine is None:
+                engine = _ENGINE_REGISTRY[key] = sqlalchemy.create_engine(url=url_, **options)
+
+        return engine
+
+    @staticmethod
+    def dispose_engines():
+        """
+        Disposes of all the engines shared by the instances and clears the registry.
+
+        Connections that are checked in to the pools are closed;
+        instances created afterwards will create new engines.
+
+        **Examples**::
+
+            >>> from pyhelpers.dbms import PostgreSQL
+            >>> postgres = PostgreSQL()
+            Password (postgres@localhost:5432): ***
+            Connecting postgres:***@localhost:5432/postgres ... Successfully.
+            >>> postgres_ = PostgreSQL()
+            Password (postgres@localhost:5432): ***
+            Connecting postgres:***@localhost:5432/postgres ... Successfully.
+            >>> postgres_.engine is postgres.engine
+            True
+            >>> PostgreSQL.dispose_engines()
+        """
+
+        with _ENGINE_REGISTRY_LOCK:
+            engines = list(_ENGINE_REGISTRY.values())
+            _ENGINE_REGISTRY.clear()
+
+        for engine in engines:
+            engine.dispose()
+
+    def enable_metadata_cache(self, ttl=300, max_size=1024):
+        """
+        Enables caching the results of catalog lookups.
+
+        Once enabled, lookups such as ``.schema_exists()``, ``.table_exists()``,
+        ``.get_column_info()``, ``.get_column_names()`` and ``.get_primary_keys()`` are memoised
+        per database, schema and table. The cached items of a table (or schema) are invalidated
+        by the methods of the instance that modify it, e.g. ``.create_table()``,
+        ``.import_data()`` and ``.drop_table()``. Changes made by other means (e.g. by another
+        connection) are seen only after the cached items expire or
+        :meth:`clear_metadata_cache` is called.
+
+        :param ttl: Number of seconds for which a cached item remains valid;
+            if ``ttl=None``, cached items do not expire; defaults to ``300``.
+        :type ttl: int | float | None
+        :param max_size: Maximum number of cached items, beyond which the least recently used
+            items are evicted; defaults to ``1024``.
+        :type max_size: int
+
+        **Examples**::
+
+            >>> from pyhelpers.dbms import PostgreSQL
+            >>> testdb = PostgreSQL(database_name='testdb', verbose=True)
+            Password (postgres@localhost:5432): ***
+            Creating a database: "testdb" ... Done.
+            Connecting postgres:***@localhost:5432/testdb ... Successfully.
+            >>> testdb.enable_metadata_cache(ttl=60)
+            >>> testdb.table_exists('test_table')  # Query the catalog
+            False
+            >>> testdb.table_exists('test_table')  # Cached
+            False
+            >>> testdb.create_table('test_table', column_specs='col_name_1 INT')  # Invalidated
+            >>> testdb.table_exists('test_table')
+            True
+            >>> testdb.disable_metadata_cache()
+            >>> testdb.drop_database(verbose=True)  # Delete the database "testdb"
+            To drop the database "testdb" from postgres:***@localhost:5432
+            ? [No]|Yes: yes
+            Dropping "testdb" ... Done.
+        """
+
+        self.metadata_cache = _MetadataCache(ttl=ttl, max_size=max_size)
+
+    def disable_metadata_cache(self):
+        """
+        Disables (and discards) the cache of catalog metadata.
+
+        .. seealso::
+
+            - Examples for the method :meth:`~pyhelpers.dbms.PostgreSQL.enable_metadata_cache`.
+        """
+
+        self.metadata_cache = None
+
+    def clear_metadata_cache(self, table_name=None, schema_name=None):
+        """
+        Removes cached catalog metadata of a table, a schema or (by default) the whole database.
+
+        :param table_name: Name of the table; defaults to ``None``.
+        :type table_name: str | None
+        :param schema_name: Name of the schema; if ``schema_name=None`` (default),
+            it defaults to the default schema when ``table_name`` is specified.
+        :type schema_name: str | None
+
+        .. seealso::
+
+            - Examples for the method :meth:`~pyhelpers.dbms.PostgreSQL.enable_metadata_cache`.
+        """
+
+        if self.metadata_cache is not None:
+            if table_name is None and schema_name is None:
+                self.metadata_cache.invalidate(database_name=self.database_name)
+            else:
+                self.metadata_cache.invalidate(
+                    database_name=self.database_name,
+                    schema_name=self._schema_name(schema_name=schema_name),
+                    table_name=table_name)
+
+    def add_instrumentation_hook(self, hook='logging'):
+        """
+        Registers a callable to which the timed phases of database operations are passed.
+
+        Operations such as ``.import_data()``, ``.read_sql_query()`` and
+        :func:`~pyhelpers.dbms.utils.mssql_to_postgresql` are divided into spans
+        (see :class:`~pyhelpers.dbms._base._Span`) for their phases, e.g. ``'catalog_check'``,
+        ``'build_chunk'`` (parsing or constructing a dataframe), ``'write_chunk'``,
+        ``'copy_transfer'`` and ``'csv_parse'``. When a span ends, each hook is called with it;
+        the span has a ``name``, a ``path`` (including the names of the enclosing spans),
+        a ``start_time``, the ``elapsed`` seconds, any ``error`` raised, and ``attributes``
+        such as the ``rows`` and ``bytes`` moved. A hook could, for example, aggregate the
+        spans or forward them to a tracer (e.g. of OpenTelemetry). Exceptions raised by a hook
+        are logged and otherwise ignored.
+
+        Spans are not recorded while there is no hook.
+
+        :param hook: A callable taking a span, or ``'logging'`` (default) to log each span
+            at the ``INFO`` level with the logger ``'pyhelpers.dbms'``.
+        :type hook: typing.Callable | str
+
+        **Examples**::
+
+            >>> from pyhelpers.dbms import PostgreSQL
+            >>> from pyhelpers._cache import example_dataframe
+            >>> testdb = PostgreSQL(database_name='testdb', verbose=True)
+            Password (postgres@localhost:5432): ***
+            Creating a database: "testdb" ... Done.
+            Connecting postgres:***@localhost:5432/testdb ... Successfully.
+            >>> spans = []
+            >>> testdb.add_instrumentation_hook(spans.append)
+            >>> testdb.import_data(
+            ...     example_dataframe(), table_name='example_df', method='copy',
+            ...     confirmation_required=False)
+            >>> [x.path for x in spans]
+            ['import_data/catalog_check',
+             'import_data/build_chunk',
+             'import_data/write_chunk',
+             'import_data/build_chunk',
+             'import_data']
+            >>> spans[-1].attributes
+            {'table_name': '"public"."example_df"', 'rows': 4, 'bytes': 141}
+            >>> testdb.remove_instrumentation_hook()
+            >>> testdb.drop_database(verbose=True)  # Delete the database "testdb"
+            To drop the database "testdb" from postgres:***@localhost:5432
+            ? [No]|Yes: yes
+            Dropping "testdb" ... Done.
+        """
+
+        if hook == 'logging':
+            hook = _log_span
+        elif not callable(hook):
+            raise TypeError("The argument `hook` must be callable or 'logging'.")
+
+        self.instrumentation_hooks.append(hook)
+
+    def remove_instrumentation_hook(self, hook=None):
+        """
+        Unregisters an instrumentation hook, or (by default) all of them.
+
+        :param hook: A registered callable, or ``'logging'`` for the logging hook;
+            defaults to ``None``.
+        :type hook: typing.Callable | str | None
+
+        .. seealso::
+
+            - Examples for the method :meth:`~pyhelpers.dbms._base._Base.add_instrumentation_hook`.
+        """
+
+        if hook is None:
+            self.instrumentation_hooks.clear()
+        else:
+            self.instrumentation_hooks.remove(_log_span if hook == 'logging' else hook)
+
+    @contextlib.contextmanager
+    def _span(self, name, parent=None, **attributes):
+        """
+        Times a phase of an operation as a span, which is passed to the instrumentation hooks.
+
+        Spans opened within the block (in the same thread) are nested in this span.
+
+        :param name: Name of the phase.
+        :type name: str
+        :param parent: The enclosing span when the phase runs in another thread;
+            defaults to the innermost open span of the current thread.
+        :type parent: _Span | None
+        :param attributes: Attributes of the phase.
+        :return: The span, to which counts can be added (see :meth:`_Span.add`).
+        :rtype: typing.Generator[_Span, None, None]
+        """
+
+        hooks = getattr(self, 'instrumentation_hooks', None)
+        if not hooks:
+            yield _Span(name, **attributes)
+            return
+
+        spans = _OPEN_SPANS.__dict__.setdefault('spans', [])
+        if parent is None and spans:
+            parent = spans[-1]
+
+        span = _Span(name, parent=parent, **attributes)
+        spans.append(span)
+        start_time = time.perf_counter()
+
+        try:
+            yield span
+        except BaseException as e:
+            span.error = e
+            raise
+        finally:
+            span.elapsed = time.perf_counter() - start_time
+            spans.remove(span)
+
+            for hook in list(hooks):
+                try:
+                    hook(span)
+                except Exception as e:
+                    logging.getLogger('pyhelpers.dbms').warning(
+                        f"Instrumentation hook {hook!r} failed: {e!r}")
+
+    def _iter_spans(self, name, iterable, **attributes):
+        """
+        Iterates over dataframes, timing the production of each one as a span.
+
+        :param name: Name of the phase, e.g. ``'build_chunk'``.
+        :type name: str
+        :param iterable: Iterable of dataframes, e.g. parsed lazily from a file.
+        :type iterable: typing.Iterable[pandas.DataFrame]
+        :param attributes: Attributes of the spans.
+        :return: The dataframes.
+        :rtype: typing.Generator[pandas.DataFrame, None, None]
+        """
+
+        iterator = iter(iterable)
+        while True:
+            with self._span(name, **attributes) as span:
+                data = next(iterator, None)
+                if data is not None:
+                    span.add(rows=len(data))
+            if data is None:
+                return
+            yield data
 
     def _execute(self, query):
         """
@@ -141,7 +994,7 @@ class _Base:
             try:
                 with self.engine.connect() as connection:
                     connection.execute(sqlalchemy.text(f'CREATE DATABASE {db_name};'))
-                    self.engine.url = self.engine.url.set(database=self.database_name)
+                self.engine = self._create_engine(self.engine.url.set(database=self.database_name))
 
                 if verbose:
                     print("Done.")
@@ -721,10 +1574,16 @@ class _Base:
         """
         return None
 
+    @_invalidates_metadata
     @_lazy_check_dependencies(pd_io_parsers='pandas.io.parsers')
+    @_spanned('import_data', lambda self, arguments: {
+        'table_name': self._table_name(
+            table_name=arguments['table_name'],
+            schema_name=self._schema_name(schema_name=arguments['schema_name']))})
     def _import_data(self, data, table_name, schema_name=None, if_exists='fail',
                      force_replace=False, chunk_size=None, dtype=None, method='multi',
-                     index=False, confirmation_required=True, verbose=False, **kwargs):
+                     index=False, confirmation_required=True, verbose=False, memory_budget=0.25,
+                     batch_latency=2.0, **kwargs):
         """
         Imports tabular data into a database table.
 
@@ -734,14 +1593,16 @@ class _Base:
         :type table_name: str
         :param schema_name: Name of the schema; defaults to the default schema if ``None``.
         :type schema_name: str | None
-        :param if_exists: What to do if the table already exists: ``'replace'``, ``'append'`` or
+        :param if_exists: What to do if the table already exists: ``'replace'``, ``'append'``,
+            ``'upsert'`` (see :meth:`~pyhelpers.dbms._base._Base._upsert_data`) or
             ``'fail'`` (default).
         :type if_exists: str
         :param force_replace: Whether to force replacing an existing table; defaults to ``False``.
         :type force_replace: bool
         :param chunk_size: Number of rows in each batch to be written at a time;
-            defaults to ``None``.
-        :type chunk_size: int | None
+            if ``chunk_size='adaptive'``, the number is adjusted between batches
+            (see :class:`~pyhelpers.dbms._base._AdaptiveChunkSize`); defaults to ``None``.
+        :type chunk_size: int | str | _AdaptiveChunkSize | None
         :param dtype: Data types for columns; defaults to ``None``.
         :type dtype: dict | None
         :param method: Method for SQL insertion clause; defaults to ``'multi'``.
@@ -759,6 +1620,12 @@ class _Base:
         :type confirmation_required: bool
         :param verbose: Whether to print relevant information to the console; defaults to ``False``.
         :type verbose: bool | int
+        :param memory_budget: Maximum memory usage (in gigabyte) of a batch
+            when ``chunk_size='adaptive'``; defaults to ``0.25``.
+        :type memory_budget: int | float
+        :param batch_latency: Target number of seconds for writing a batch
+            when ``chunk_size='adaptive'``; defaults to ``2.0``.
+        :type batch_latency: int | float
         :param kwargs: [Optional] Additional parameters for the method `pandas.DataFrame.to_sql()`_.
 
         .. _`pandas.DataFrame.to_sql()`:
@@ -774,12 +1641,13 @@ class _Base:
                 print("Canceled.")
             return
 
-        # Schema existence check
-        if not self.schema_exists(schema_name_):
-            self.create_schema(schema_name=schema_name_, verbose=verbose)
+        with self._span('catalog_check'):
+            # Schema existence check
+            if not self.schema_exists(schema_name_):
+                self.create_schema(schema_name=schema_name_, verbose=verbose)
 
-        # Handle 'force_replace' logic independently of pandas
-        table_exists = self.table_exists(table_name=table_name, schema_name=schema_name_)
+            # Handle 'force_replace' logic independently of pandas
+            table_exists = self.table_exists(table_name=table_name, schema_name=schema_name_)
 
         if table_exists:
             if force_replace:
@@ -796,6 +1664,16 @@ class _Base:
                           "  Use `if_exists='replace'` or `force_replace=True` to update.")
                 return
 
+        # Upserting into a table that does not exist (or has been dropped) is to create it
+        upsert = if_exists == 'upsert' and table_exists and not force_replace
+        if if_exists == 'upsert' and not upsert:
+            if_exists = 'fail'
+
+        if chunk_size == 'adaptive':
+            chunk_size = _AdaptiveChunkSize(
+                memory_budget=memory_budget, batch_latency=batch_latency)
+        adaptive_chunk_size = chunk_size if isinstance(chunk_size, _AdaptiveChunkSize) else None
+
         # Prepare Pandas arguments
         to_sql_kwargs = {
             'name': table_name,
@@ -805,7 +1683,7 @@ class _Base:
             'index': index,
             'dtype': dtype,
             'method': method,
-            'chunksize': chunk_size
+            'chunksize': None if adaptive_chunk_size else chunk_size
         }
         # Allow user kwargs to supplement, but not overwrite core mapping
         import_kwargs = {**kwargs, **to_sql_kwargs}
@@ -820,22 +1698,32 @@ class _Base:
         try:
             # Check if data is an iterable of DataFrames or a single DataFrame
             if isinstance(data, (pd_io_parsers.TextFileReader, list, tuple)):  # noqa
-                for i, chunk in enumerate(data):
-                    # If appending a list, the first chunk follows 'if_exists', others MUST be 'append'
-                    if i > 0:
-                        import_kwargs['if_exists'] = 'append'
-                    if isinstance(chunk, pd.DataFrame):
-                        chunk.to_sql(**import_kwargs)
-                    else:  # Fallback for non-dataframe items in a list
-                        pd.DataFrame(chunk).to_sql(**import_kwargs)
-
+                # Fallback for non-dataframe items in a list
+                frames = (x if isinstance(x, pd.DataFrame) else pd.DataFrame(x) for x in data)
             elif isinstance(data, pd.DataFrame):
-                # noinspection PyUnresolvedReferences
-                data.to_sql(**import_kwargs)
-
+                frames = [data]
             else:
                 raise TypeError("The input `data` type is not accepted.")
 
+            frames = self._iter_spans('build_chunk', frames)
+            if adaptive_chunk_size:
+                frames = adaptive_chunk_size.split(frames)
+
+            if upsert:
+                self._upsert_data(
+                    data=frames, table_name=table_name, schema_name=schema_name_,
+                    import_kwargs=import_kwargs)
+
+            else:
+                for i, chunk in enumerate(frames):
+                    # The first chunk follows 'if_exists', others MUST be 'append'
+                    if i > 0:
+                        import_kwargs['if_exists'] = 'append'
+                    with self._span('write_chunk') as span:
+                        chunk.to_sql(**import_kwargs)
+                        span.add(rows=len(chunk))
+                    _add_to_span(**span.counts)
+
             if verbose:
                 print("Done.")
 
@@ -845,6 +1733,122 @@ class _Base:
         finally:
             gc.collect()  # Final cleanup
 
+    def _staging_table_query(self, table_name, staging_table_name, column_names):
+        """
+        Makes a statement that creates an empty staging table with the columns of a table.
+
+        :param table_name: Formatted name of the table.
+        :type table_name: str
+        :param staging_table_name: Formatted name of the staging table.
+        :type staging_table_name: str
+        :param column_names: Names of the columns of the table to be included.
+        :type column_names: list[str]
+        :return: The statement, or ``None`` if upserting is not supported by the dialect.
+        :rtype: str | None
+        """
+        return None
+
+    def _upsert_query(self, table_name, staging_table_name, column_names, primary_keys):
+        """
+        Makes a statement that upserts the rows of a staging table into a table.
+
+        :param table_name: Formatted name of the table.
+        :type table_name: str
+        :param staging_table_name: Formatted name of the staging table.
+        :type staging_table_name: str
+        :param column_names: Names of the columns of the staging table.
+        :type column_names: list[str]
+        :param primary_keys: Names of the primary key columns of the table.
+        :type primary_keys: list[str]
+        :return: The statement, or ``None`` if upserting is not supported by the dialect.
+        :rtype: str | None
+        """
+        return None
+
+    def _upsert_data(self, data, table_name, schema_name, import_kwargs):
+        """
+        Upserts tabular data into an existing table, keyed on its primary keys.
+
+        The data is loaded (with the same method as for the other modes of ``if_exists``) into a
+        staging table with the same column types as the table (see
+        :meth:`~pyhelpers.dbms._base._Base._staging_table_query`), from which the rows are then
+        inserted or updated with a single set-based statement (see
+        :meth:`~pyhelpers.dbms._base._Base._upsert_query`), so that the cost of refreshing a
+        table is proportional to the size of the data rather than the table.
+        Everything runs in one transaction, and the staging table is dropped afterwards.
+
+        :param data: Tabular data to be upserted, in which the primary keys must be unique.
+        :type data: pandas.DataFrame | pandas.io.parsers.TextFileReader | typing.Iterable
+        :param table_name: Name of the table, which must have a primary key.
+        :type table_name: str
+        :param schema_name: Name of the schema.
+        :type schema_name: str
+        :param import_kwargs: Parameters for the method `pandas.DataFrame.to_sql()`_.
+        :type import_kwargs: dict
+        :raises ValueError: If upserting is not supported by the dialect,
+            or if the table has no primary key.
+
+        .. _`pandas.DataFrame.to_sql()`:
+            https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.to_sql.html
+        """
+
+        if any(getattr(getattr(self, x), '__func__', None) is getattr(_Base, x)
+               for x in ('_staging_table_query', '_upsert_query')):
+            raise ValueError(
+                f"`if_exists='upsert'` is not supported for {type(self).__name__}; "
+                f"use 'replace' or 'append' instead.")
+
+        table_name_ = self._table_name(table_name=table_name, schema_name=schema_name)
+
+        primary_keys = self.get_primary_keys(table_name=table_name, schema_name=schema_name)
+        if not primary_keys:
+            raise ValueError(f"The table {table_name_} has no primary key to upsert on.")
+
+        staging_table_name = f'_upsert_{uuid.uuid4().hex[:8]}_{table_name}'[:63]
+        staging_table_name_ = self._table_name(
+            table_name=staging_table_name, schema_name=schema_name)
+
+        def _as_frame(x):
+            x = x if isinstance(x, pd.DataFrame) else pd.DataFrame(x)
+            if import_kwargs.get('index'):  # Write the index as columns, as pandas would
+                if import_kwargs.get('index_label') is not None:
+                    x = x.rename_axis(import_kwargs['index_label'])
+                x = x.reset_index()
+            return x
+
+        chunks = map(_as_frame, [data] if isinstance(data, pd.DataFrame) else data)
+        first_chunk = next(chunks, None)
+        if first_chunk is None:
+            return
+
+        column_names = [str(x) for x in first_chunk.columns]
+
+        with self.engine.begin() as connection:
+            to_sql_kwargs = {
+                **import_kwargs, 'name': staging_table_name, 'con': connection,
+                'if_exists': 'append', 'index': False, 'index_label': None}
+
+            # Create the staging table with the column types of the table, rather than those
+            # inferred by pandas from the data (e.g. 'TEXT' for a column of nulls)
+            connection.execute(sqlalchemy.text(self._staging_table_query(
+                table_name=table_name_, staging_table_name=staging_table_name_,
+                column_names=column_names)))
+
+            for chunk in itertools.chain([first_chunk], chunks):
+                with self._span('write_chunk', table_name=staging_table_name_) as span:
+                    chunk.to_sql(**to_sql_kwargs)
+                    span.add(rows=len(chunk))
+                _add_to_span(**span.counts)
+
+            sql_query = self._upsert_query(
+                table_name=table_name_, staging_table_name=staging_table_name_,
+                column_names=column_names, primary_keys=primary_keys)
+            with self._span('merge') as span:
+                span.add(rows=connection.execute(sqlalchemy.text(sql_query)).rowcount)
+
+            connection.execute(sqlalchemy.text(f'DROP TABLE {staging_table_name_};'))
+
+    @_cached_metadata
     def get_column_info(self, table_name, schema_name=None, as_dict=True):
         # noinspection PyUnresolvedReferences
         """
@@ -955,7 +1959,7 @@ class _Base:
         return column_names_
 
     def read_sql_query(self, sql_query, method='tempfile', max_size_spooled=1, delimiter=',',
-                       tempfile_kwargs=None, stringio_kwargs=None, **kwargs):
+                       tempfile_kwargs=None, stringio_kwargs=None, engine=None, **kwargs):
         """
         Executes a SQL query and read the result into a DataFrame.
 
@@ -971,6 +1975,8 @@ class _Base:
         :type tempfile_kwargs: dict
         :param stringio_kwargs: Additional keyword arguments for ``StringIO``.
         :type stringio_kwargs: dict
+        :param engine: Engine for parsing the query result, e.g. ``'arrow'``.
+        :type engine: str | None
         :param kwargs: [Optional] Additional arguments passed to the reading method.
         """
         return None
@@ -983,7 +1989,9 @@ class _Base:
         :rtype: set
         """
 
-        rsq_args = map(lambda x: inspect.getfullargspec(x).args, (self.read_sql_query, pd.read_csv))
+        rsq_args = map(
+            lambda x: inspect.getfullargspec(inspect.unwrap(x)).args,
+            (self.read_sql_query, pd.read_csv))
         rsq_args_spec = set(itertools.chain(*rsq_args))
 
         read_sql_args = set(inspect.getfullargspec(func=pd.read_sql).args)
@@ -2,13 +2,19 @@
 Communication with `Microsoft SQL Server <https://www.microsoft.com/en-gb/sql-server/>`_ databases.
 """
 
+import concurrent.futures
 import copy
+import csv
+import datetime
+import decimal
 import functools
 import getpass
+import glob
 import itertools
 import operator
 import os
 import re
+import tempfile
 import time
 import warnings
 
@@ -17,12 +23,262 @@ import sqlalchemy
 import sqlalchemy.dialects
 import sqlalchemy.exc
 
-from ._base import _Base
-from .utils import get_adaptive_index_dtypes
+from ._base import _AdaptiveChunkSize, _Base, _cached_metadata, _invalidates_metadata
+from .utils import _MigrationCheckpoint, get_adaptive_index_dtypes
 from .._cache import _check_dependencies, _confirmed, _lazy_check_dependencies, \
     _print_failure_message
 
 
+def _arrow_type(column_description):
+    """
+    Gets the Arrow type of a column described by a `pyodbc`_ cursor.
+
+    :param column_description: Item of ``cursor.description``, i.e. a tuple of
+        ``(name, type_code, display_size, internal_size, precision, scale, null_ok)``.
+    :type column_description: tuple
+    :return: Arrow type of the column, or ``None`` if it is to be inferred from the values.
+    :rtype: pyarrow.DataType | None
+
+    .. _`pyodbc`: https://github.com/mkleehammer/pyodbc/wiki/Cursor#description
+    """
+
+    pa = _check_dependencies('pyarrow')
+
+    _, type_code, _, _, precision, scale, _ = column_description
+
+    python_types = {
+        bool: pa.bool_(),
+        int: pa.int64(),
+        float: pa.float64(),
+        str: pa.string(),
+        bytes: pa.binary(),
+        bytearray: pa.binary(),
+        datetime.datetime: pa.timestamp('us'),
+        datetime.date: pa.date32(),
+        datetime.time: pa.time64('us'),
+    }
+
+    if type_code is decimal.Decimal and precision and 0 < precision <= 38:
+        return pa.decimal128(precision, scale or 0)
+
+    return python_types.get(type_code)
+
+
+def _iter_arrow_batches(cursor, batch_size=10000, schema=None):
+    """
+    Fetches the result set of an executed `pyodbc`_ cursor as ``pyarrow.RecordBatch`` objects.
+
+    Rows are fetched ``batch_size`` at a time with ``cursor.fetchmany()`` and transposed into
+    Arrow arrays, so that only one batch of rows is held as Python objects at a time.
+    All the batches have the same schema as the first one.
+
+    :param cursor: A cursor on which a query has been executed.
+    :type cursor: pyodbc.Cursor
+    :param batch_size: Number of rows fetched at a time; defaults to ``10000``.
+    :type batch_size: int
+    :param schema: Schema of the result set, e.g. as returned for the same query without rows,
+        whose types (other than ``null``) override those given by the cursor;
+        defaults to ``None``.
+    :type schema: pyarrow.Schema | None
+    :return: Batches of the result set, or the (empty) schema of the result set if it has no rows.
+    :rtype: typing.Generator[pyarrow.RecordBatch, None, pyarrow.Schema]
+
+    .. _`pyodbc`: https://github.com/mkleehammer/pyodbc/wiki/Cursor
+    """
+
+    pa = _check_dependencies('pyarrow')
+
+    names = [col[0] for col in cursor.description]
+    types = [_arrow_type(col) for col in cursor.description]
+    # Values of other types (e.g. uuid.UUID for 'uniqueidentifier') are converted to strings
+    as_str = [col[1] not in (None, decimal.Decimal) and t is None
+              for col, t in zip(cursor.description, types)]
+    types = [pa.string() if s else t for s, t in zip(as_str, types)]
+    if schema is not None:
+        types = [t if pa.types.is_null(t_) else t_ for t, t_ in zip(types, schema.types)]
+
+    n_batches = 0
+    while rows := cursor.fetchmany(batch_size):
+        arrays = []
+        for j, values in enumerate(zip(*rows)):
+            if as_str[j]:
+                values = [None if x is None else str(x) for x in values]
+            arrays.append(pa.array(values, type=types[j]))
+
+        batch = pa.RecordBatch.from_arrays(arrays, names=names)
+        if n_batches == 0:  # Keep any inferred types for the rest of the batches
+            types = batch.schema.types
+        n_batches += 1
+        yield batch
+
+    return pa.schema([(k, t or pa.null()) for k, t in zip(names, types)])
+
+
+def _fetch_arrow(cursor, batch_size=10000):
+    """
+    Fetches the result set of an executed `pyodbc`_ cursor into a ``pyarrow.Table``.
+
+    :param cursor: A cursor on which a query has been executed.
+    :type cursor: pyodbc.Cursor
+    :param batch_size: Number of rows fetched at a time; defaults to ``10000``.
+    :type batch_size: int
+    :return: The result set.
+    :rtype: pyarrow.Table
+
+    .. _`pyodbc`: https://github.com/mkleehammer/pyodbc/wiki/Cursor
+    """
+
+    pa = _check_dependencies('pyarrow')
+
+    batches = _iter_arrow_batches(cursor, batch_size=batch_size)
+    try:
+        first_batch = next(batches)
+    except StopIteration as e:  # No rows
+        return e.value.empty_table()
+
+    return pa.Table.from_batches([first_batch, *batches])
+
+
+class _ExportManifest(_MigrationCheckpoint):
+    """
+    A JSON manifest of a table exported as a partitioned Parquet dataset.
+
+    Besides information about the table (e.g. its key column and column names), it records the
+    range of the key column, the status (``'pending'``, ``'in_progress'`` or ``'done'``) and the
+    number of rows of each part file, so that an interrupted export can be resumed.
+    """
+
+    ENTRIES = 'partitions'
+    TYPED_VALUES = ('lower_bound', 'upper_bound')
+
+    def set_info(self, **kwargs):
+        """
+        Records information about the exported table and saves the manifest.
+
+        :param kwargs: Items to be recorded, e.g. ``table_name`` and ``column_names``.
+        """
+
+        with self._lock:
+            self.info.update(kwargs)
+            self._save()
+
+    def partition_names(self):
+        """
+        Gets the names of the recorded partitions.
+
+        :return: Names of the partitions, in order.
+        :rtype: list
+        """
+
+        with self._lock:
+            return sorted(self._tables)
+
+
+def _input_sizes(rows, max_length=4000, max_binary_length=8000):
+    """
+    Gets the sizes of string parameters for inserting rows with `pyodbc`_ ``fast_executemany``.
+
+    With ``fast_executemany``, pyodbc allocates the arrays of parameters according to the sizes
+    of the target columns, which are unbounded for ``NVARCHAR(MAX)``; sizing string (and binary)
+    parameters by the longest values in the rows keeps the arrays small.
+
+    :param rows: Rows of values to be inserted.
+    :type rows: list[tuple]
+    :param max_length: Maximum size of a bounded ``NVARCHAR`` parameter; defaults to ``4000``.
+        Longer strings are sent as ``NVARCHAR(MAX)``, i.e. with a size of ``0``. The sizes of
+        strings are counted in UTF-16 code units, as characters outside the Basic Multilingual
+        Plane (e.g. emoji) take two.
+    :type max_length: int
+    :param max_binary_length: Maximum size of a bounded ``VARBINARY`` parameter;
+        defaults to ``8000``. Longer bytes are sent as ``VARBINARY(MAX)``.
+    :type max_binary_length: int
+    :return: Sizes of the parameters for ``cursor.setinputsizes()``,
+        where ``None`` means the size is left to pyodbc.
+    :rtype: list[tuple[int, int, int] | None]
+
+    .. _`pyodbc`: https://github.com/mkleehammer/pyodbc/wiki/Features-beyond-the-DB-API
+
+    **Examples**::
+
+        >>> from pyhelpers.dbms.mssql import _input_sizes
+        >>> _input_sizes([(1, 'ab', None), (2, 'abc', None)])
+        [None, (-9, 3, 0), None]
+        >>> _input_sizes([('a' * 5000,)])
+        [(-9, 0, 0)]
+        >>> _input_sizes([('\U0001F600',)])
+        [(-9, 2, 0)]
+    """
+
+    sql_wvarchar = -9  # i.e. pyodbc.SQL_WVARCHAR
+    sql_varbinary = -3  # i.e. pyodbc.SQL_VARBINARY
+
+    input_sizes = []
+
+    for values in zip(*rows):
+        if all(isinstance(x, str) or x is None for x in values) and \
+                any(isinstance(x, str) for x in values):
+            length = max(len(x.encode('utf-16-le')) // 2 for x in values if x is not None) or 1
+            input_sizes.append((sql_wvarchar, length if length <= max_length else 0, 0))
+        elif all(isinstance(x, bytes) or x is None for x in values) and \
+                any(isinstance(x, bytes) for x in values):
+            length = max(len(x) for x in values if x is not None) or 1
+            input_sizes.append((sql_varbinary, length if length <= max_binary_length else 0, 0))
+        else:
+            input_sizes.append(None)
+
+    return input_sizes
+
+
+class _Geometry(sqlalchemy.types.UserDefinedType):
+    """
+    The ``GEOMETRY`` data type of Microsoft SQL Server, for creating tables with `pandas`_.
+
+    .. _`pandas`: https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.to_sql.html
+    """
+
+    cache_ok = True
+
+    def get_col_spec(self, **kwargs):
+        return 'GEOMETRY'
+
+
+def _geometry_to_wkb(values):
+    """
+    Encodes geometries as well-known binary (WKB) all at once with `shapely`_.
+
+    :param values: Geometries, which may be `shapely`_ objects, well-known text (WKT) strings
+        or WKB bytes; missing values are kept as ``None``.
+    :type values: pandas.Series
+    :return: WKB of the geometries.
+    :rtype: pandas.Series
+
+    .. _`shapely`: https://shapely.readthedocs.io/en/stable/reference/shapely.to_wkb.html
+
+    **Examples**::
+
+        >>> from pyhelpers.dbms.mssql import _geometry_to_wkb
+        >>> import pandas as pd
+        >>> wkb = _geometry_to_wkb(pd.Series(['POINT (1 2)', None]))
+        >>> wkb[0].hex()
+        '0101000000000000000000f03f0000000000000040'
+        >>> wkb[1] is None
+        True
+    """
+
+    shapely = _check_dependencies('shapely')
+
+    geoms = values.astype(object).where(values.notna(), None)
+
+    inferred_type = pd.api.types.infer_dtype(geoms, skipna=True)
+    if inferred_type == 'bytes':
+        return geoms
+    geoms = geoms.to_numpy()
+    if inferred_type == 'string':
+        geoms = shapely.from_wkt(geoms)
+
+    return pd.Series(shapely.to_wkb(geoms), index=values.index, name=values.name, dtype=object)
+
+
 class MSSQL(_Base):
     """
     A class for basic communication with `Microsoft SQL Server`_ databases.
@@ -68,7 +324,8 @@ class MSSQL(_Base):
     }
 
     def __init__(self, host=None, port=None, username=None, password=None, database_name=None,
-                 confirm_db_creation=False, verbose=False, raise_error=False):
+                 confirm_db_creation=False, pool_size=None, max_overflow=None, pool_pre_ping=None,
+                 pool_recycle=None, verbose=False, raise_error=False):
         """
         :param host: Name or IP address of the SQL Server, e.g. ``'localhost'`` or ``'127.0.0.1'``;
             defaults to ``'localhost'`` if not specified.
@@ -89,6 +346,18 @@ class MSSQL(_Base):
             before creating a new database (if the specified database does not exist);
             defaults to ``False``.
         :type confirm_db_creation: bool
+        :param pool_size: Number of connections to keep open in the connection pool;
+            defaults to ``None`` (i.e. the default of SQLAlchemy).
+        :type pool_size: int | None
+        :param max_overflow: Number of connections allowed in excess of ``pool_size``;
+            defaults to ``None`` (i.e. the default of SQLAlchemy).
+        :type max_overflow: int | None
+        :param pool_pre_ping: Whether to test connections for liveness upon each checkout;
+            defaults to ``None`` (i.e. the default of SQLAlchemy).
+        :type pool_pre_ping: bool | None
+        :param pool_recycle: Number of seconds after which a pooled connection is recycled;
+            defaults to ``None`` (i.e. the default of SQLAlchemy).
+        :type pool_recycle: int | None
         :param verbose: Whether to print connection and operation details to the console;
             defaults to ``False``.
         :type verbose: bool | int
@@ -105,6 +374,8 @@ class MSSQL(_Base):
         :ivar str address: String representation of the database connection address.
         :ivar sqlalchemy.engine.Engine engine: SQLAlchemy engine connected to the SQL Server;
             see also [`DBMS-MS-3`_].
+            Instances connecting to the same database with the same pool options share the engine
+            (and its pool of connections).
 
         .. _`DBMS-MS-3`:
             https://docs.sqlalchemy.org/en/latest/core/connections.html#sqlalchemy.engine.Engine
@@ -131,6 +402,10 @@ class MSSQL(_Base):
 
         pyodbc = _check_dependencies('pyodbc')
 
+        self._set_pool_options(
+            pool_size=pool_size, max_overflow=max_overflow, pool_pre_ping=pool_pre_ping,
+            pool_recycle=pool_recycle)
+
         self.host = self.DEFAULT_HOST if host is None else str(host)
         self.port = self.DEFAULT_PORT if port is None else int(port)
 
@@ -172,7 +447,7 @@ class MSSQL(_Base):
         url = sqlalchemy.engine.URL.create(**self.credentials, password=pwd, query=url_query)
 
         # Note: Using AUTOCOMMIT here is specific to DB management tasks
-        self.engine = sqlalchemy.create_engine(url=url, isolation_level='AUTOCOMMIT')
+        self.engine = self._create_engine(url)
 
         # Connect to database
         target_db = database_name or self.DEFAULT_DATABASE
@@ -180,7 +455,7 @@ class MSSQL(_Base):
 
         if target_db != self.DEFAULT_DATABASE:
             if target_db in self.get_database_names():  # Switch URL to the target database
-                self.engine.url = self.engine.url.set(database=target_db)
+                self.engine = self._create_engine(self.engine.url.set(database=target_db))
             else:
                 # The database doesn't exist
                 self.database_name = target_db  # Set for _create_db
@@ -201,8 +476,7 @@ class MSSQL(_Base):
 
         try:
             if reconnect_needed:
-                self.engine = sqlalchemy.create_engine(
-                    url=self.engine.url, isolation_level='AUTOCOMMIT')
+                self.engine = self._create_engine(self.engine.url)
 
             with self.engine.connect():
                 pass  # Successful connection
@@ -271,7 +545,8 @@ class MSSQL(_Base):
         This method generates and returns a *SQLAlchemy* engine configured to connect to a
         SQL Server database using the provided or default database name, authentication method and
         password. The returned engine can be used to execute SQL queries and interact with the
-        database.
+        database. Engines created with the same connection string are reused across calls
+        (and instances), together with their pools of connections.
 
         :param database_name: Name of the database to connect to;
             defaults to the currently-connected database if ``database_name=None``.
@@ -316,7 +591,7 @@ class MSSQL(_Base):
             drivername=f'{self.DEFAULT_DIALECT}+{self.DEFAULT_DRIVER}',
             query={'odbc_connect': conn_string})
 
-        engine = sqlalchemy.create_engine(url=url, isolation_level='AUTOCOMMIT')
+        engine = self._create_engine(url)
 
         return engine
 
@@ -586,7 +861,7 @@ class MSSQL(_Base):
                 if not self.database_exists(database_name=db_name):
                     self.create_database(database_name=db_name)
 
-                self.engine = sqlalchemy.create_engine(url=url, isolation_level='AUTOCOMMIT')
+                self.engine = self._create_engine(url)
 
                 if verbose:
                     print("Successfully.")
@@ -669,6 +944,7 @@ class MSSQL(_Base):
             if verbose:
                 print(f"Being connected with {self.address}.")
 
+    @_invalidates_metadata
     def drop_database(self, database_name=None, confirmation_required=True, verbose=False,
                       raise_error=False):
         """
@@ -712,6 +988,7 @@ class MSSQL(_Base):
 
     # == Schema ====================================================================================
 
+    @_cached_metadata
     def schema_exists(self, schema_name):
         """
         Check whether a schema exists.
@@ -746,6 +1023,7 @@ class MSSQL(_Base):
 
         return result
 
+    @_invalidates_metadata
     def create_schema(self, schema_name, verbose=False, raise_error=False):
         """
         Create a schema.
@@ -898,6 +1176,7 @@ class MSSQL(_Base):
 
         return schema_info
 
+    @_invalidates_metadata
     def drop_schema(self, schema_names, confirmation_required=True, verbose=False, **kwargs):
         """
         Delete/drop one or multiple schemas.
@@ -1037,6 +1316,7 @@ class MSSQL(_Base):
 
         return table_name_
 
+    @_invalidates_metadata
     def create_table(self, table_name, column_specs, schema_name=None, verbose=False,
                      raise_error=False):
         # noinspection PyUnresolvedReferences
@@ -1098,6 +1378,7 @@ class MSSQL(_Base):
             table_name=table_name, column_specs=column_specs, schema_name=schema_name,
             verbose=verbose, raise_error=raise_error)
 
+    @_cached_metadata
     def table_exists(self, table_name, schema_name=None):
         """
         Check whether a table exists.
@@ -1235,6 +1516,7 @@ class MSSQL(_Base):
 
         return column_info
 
+    @_cached_metadata
     def get_column_names(self, table_name, schema_name=None):
         """
         Retrieve column names of a table.
@@ -1302,6 +1584,7 @@ class MSSQL(_Base):
 
         return column_names_
 
+    @_cached_metadata
     def _has_dtypes(self, table_name, dtypes, schema_name=None):
         """
         Check whether a table contains columns of specified data types.
@@ -1406,29 +1689,13 @@ class MSSQL(_Base):
                'total_errors'])]
         """
 
-        schema_name_ = self._schema_name(schema_name=schema_name)
-
         dtypes_ = [dtypes] if isinstance(dtypes, str) else copy.copy(dtypes)
 
-        with self.engine.connect() as connection:
-            for data_type in dtypes_:
-                sql_query_geom_col = \
-                    f"SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS " \
-                    f"WHERE TABLE_NAME='{table_name}' " \
-                    f"AND TABLE_SCHEMA='{schema_name_}' " \
-                    f"AND DATA_TYPE='{data_type}'"
-                query = sqlalchemy.text(sql_query_geom_col)
-                result = connection.execute(query)
-
-                col_names = result.fetchall()
-
-                if len(col_names) > 0:
-                    has_the_dtypes = True
-                    col_names = list(itertools.chain.from_iterable(col_names))
-                else:
-                    has_the_dtypes = False
+        for data_type in dtypes_:
+            has_the_dtypes, col_names = self._has_dtypes(
+                table_name=table_name, dtypes=data_type, schema_name=schema_name)
 
-                yield data_type, has_the_dtypes, col_names
+            yield data_type, has_the_dtypes, col_names
 
     def _column_names_in_query(self, table_name, column_names=None, schema_name=None,
                                exclude=None):
@@ -1489,6 +1756,7 @@ class MSSQL(_Base):
 
         return column_names_in_query, column_name_list
 
+    @_cached_metadata
     def get_primary_keys(self, table_name=None, schema_name=None, table_type='TABLE'):
         """
         Retrieve the primary keys of table(s) from the currently-connected database.
@@ -1546,6 +1814,7 @@ class MSSQL(_Base):
 
         return tbl_pk_dict
 
+    @_invalidates_metadata
     def add_primary_key(self, column_name, table_name, schema_name=None):
         """
         Add a primary key constraint to a table.
@@ -1613,6 +1882,7 @@ class MSSQL(_Base):
                 pk_query = f'ALTER TABLE {table_name_} ADD PRIMARY KEY ([{column_name}]);'
                 connection.execute(sqlalchemy.text(pk_query))
 
+    @_invalidates_metadata
     def varchar_to_geometry_dtype(self, table_name, geom_column_name=None, srid=None,
                                   schema_name=None, verbose=True, raise_error=False):
         """
@@ -1678,10 +1948,276 @@ class MSSQL(_Base):
                 e, prefix="Spatial conversion failed. Table reverted.", verbose=verbose,
                 raise_error=raise_error)
 
+    @staticmethod
+    def mssql_insert_fast_executemany(sql_table, sql_db_engine, column_names, data_iter,
+                                      batch_size=10000, geom_column_names=None, srid=None):
+        """
+        Callable function using `pyodbc`_ ``fast_executemany`` for executing data insertion.
+
+        Rows are sent ``batch_size`` at a time as arrays of parameters bound to a single
+        ``INSERT`` statement, rather than as statements with literal values, so that the
+        insertion is not limited by the cap of 2,100 parameters per statement.
+        String parameters are sized by the longest values in each batch.
+
+        Values of the columns in ``geom_column_names`` are expected to be geometries encoded as
+        well-known binary (WKB), which are converted into ``GEOMETRY`` by the server with
+        ``geometry::STGeomFromWKB()`` as they are inserted.
+
+        :param sql_table: Object that represents the table to insert into.
+        :type sql_table: pandas.io.sql.SQLTable
+        :param sql_db_engine: Object that represents the database engine or connection.
+        :type sql_db_engine: sqlalchemy.engine.Connection | sqlalchemy.engine.Engine
+        :param column_names: List of column names to insert data into.
+        :type column_names: list[str]
+        :param data_iter: Iterable that iterates over the values to be inserted.
+        :type data_iter: typing.Iterable
+        :param batch_size: Number of rows sent at a time; defaults to ``10000``.
+        :type batch_size: int
+        :param geom_column_names: Name(s) of the geometry column(s) whose values are WKB;
+            defaults to ``None``.
+        :type geom_column_names: list[str] | None
+        :param srid: Spatial Reference Identifier (SRID) of the geometries; defaults to ``None``
+            (i.e. ``0``).
+        :type srid: int | None
+        :return: Number of rows inserted.
+        :rtype: int
+
+        .. _`pyodbc`: https://github.com/mkleehammer/pyodbc/wiki/Features-beyond-the-DB-API
+
+        .. seealso::
+
+            - Examples for the method :meth:`~pyhelpers.dbms.MSSQL.import_data`.
+        """
+
+        sql_column_names = ', '.join(f'[{k}]' for k in column_names)
+        sql_table_name = f'[{sql_table.schema}].[{sql_table.name}]'
+        geom_placeholder = f'geometry::STGeomFromWKB(?, {int(srid or 0)})'
+        placeholders = ', '.join(
+            geom_placeholder if k in (geom_column_names or []) else '?' for k in column_names)
+
+        sql_query = f'INSERT INTO {sql_table_name} ({sql_column_names}) VALUES ({placeholders})'
+
+        cursor = sql_db_engine.connection.cursor()
+        cursor.fast_executemany = True
+
+        row_count = 0
+        try:
+            data_iter = iter(data_iter)
+            while rows := list(itertools.islice(data_iter, batch_size)):
+                cursor.setinputsizes(_input_sizes(rows))
+                cursor.executemany(sql_query, rows)
+                row_count += len(rows)
+        finally:
+            cursor.close()
+
+        return row_count
+
+    @staticmethod
+    def _bulk_insert_query(path_to_file, table_name, first_row=1, batch_size=None,
+                           format_file=None, tablock=True):
+        """
+        Makes a ``BULK INSERT`` statement for loading a CSV (or BCP-format) data file.
+
+        :param path_to_file: Path to the data file (as seen by the server).
+        :type path_to_file: str | os.PathLike
+        :param table_name: Formatted name of the table, e.g. ``'[dbo].[table]'``.
+        :type table_name: str
+        :param first_row: Number of the first row to load (e.g. ``2`` to skip a header);
+            defaults to ``1``.
+        :type first_row: int
+        :param batch_size: Number of rows committed at a time; defaults to ``None``.
+        :type batch_size: int | None
+        :param format_file: Path to a BCP format file describing the data file;
+            if ``format_file=None`` (default), the data file is parsed as (RFC 4180) CSV.
+        :type format_file: str | os.PathLike | None
+        :param tablock: Whether to take a table-level lock, which allows minimal logging;
+            defaults to ``True``.
+        :type tablock: bool
+        :return: The ``BULK INSERT`` statement.
+        :rtype: str
+
+        **Examples**::
+
+            >>> from pyhelpers.dbms import MSSQL
+            >>> MSSQL._bulk_insert_query('/data/df.csv', '[dbo].[df]', batch_size=1000)
+            "BULK INSERT [dbo].[df] FROM '/data/df.csv' WITH (FORMAT = 'CSV', FIELDQUOTE = '\"', ...
+        """
+
+        def _quote(x):
+            return "'{}'".format(str(x).replace("'", "''"))
+
+        if format_file is None:
+            options = [
+                "FORMAT = 'CSV'", "FIELDQUOTE = '\"'", "FIELDTERMINATOR = ','",
+                "ROWTERMINATOR = '0x0a'", "CODEPAGE = '65001'"]
+        else:
+            options = [f"FORMATFILE = {_quote(format_file)}"]
+
+        options += [f'FIRSTROW = {int(first_row)}', 'KEEPNULLS']
+        if tablock:
+            options.append('TABLOCK')
+        if batch_size:
+            options.append(f'BATCHSIZE = {int(batch_size)}')
+
+        sql_query = f"BULK INSERT {table_name} FROM {_quote(path_to_file)} " \
+                    f"WITH ({', '.join(options)});"
+
+        return sql_query
+
+    @staticmethod
+    def mssql_insert_bulk(sql_table, sql_db_engine, column_names, data_iter, bulk_dir=None,
+                          batch_size=None):
+        """
+        Callable function using ``BULK INSERT`` from a temporary CSV file for data insertion.
+
+        The rows are written to a CSV file in ``bulk_dir``, which is then loaded by the server
+        with ``BULK INSERT`` and deleted. The columns of the data must be in the same order as
+        those of the table.
+
+        :param sql_table: Object that represents the table to insert into.
+        :type sql_table: pandas.io.sql.SQLTable
+        :param sql_db_engine: Object that represents the database engine or connection.
+        :type sql_db_engine: sqlalchemy.engine.Connection | sqlalchemy.engine.Engine
+        :param column_names: List of column names to insert data into.
+        :type column_names: list[str]
+        :param data_iter: Iterable that iterates over the values to be inserted.
+        :type data_iter: typing.Iterable
+        :param bulk_dir: Directory of the temporary file, which must be readable by the
+            SQL Server under the same path (e.g. a shared network folder, or a local folder when
+            the server runs on the same machine); defaults to the system's temporary directory.
+        :type bulk_dir: str | os.PathLike | None
+        :param batch_size: Number of rows committed at a time by the server;
+            defaults to ``None`` (i.e. all rows in one batch).
+        :type batch_size: int | None
+        :return: Number of rows inserted.
+        :rtype: int
+
+        .. seealso::
+
+            - Examples for the method :meth:`~pyhelpers.dbms.MSSQL.import_data`.
+        """
+
+        sql_table_name = f'[{sql_table.schema}].[{sql_table.name}]'
+
+        cursor = sql_db_engine.connection.cursor()
+
+        try:
+            cursor.execute(
+                "SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS "
+                "WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ? ORDER BY ORDINAL_POSITION;",
+                sql_table.schema, sql_table.name)
+            table_column_names = [x[0] for x in cursor.fetchall()]
+            if table_column_names != list(column_names):
+                raise ValueError(
+                    f"The columns of the data do not match those of the table {sql_table_name}, "
+                    f"which are required to be in the same order by `BULK INSERT`.")
+
+            with tempfile.NamedTemporaryFile(
+                    mode='w', suffix='.csv', dir=bulk_dir, delete=False, newline='',
+                    encoding='utf-8') as f:
+                # Quote all non-null values, so that empty strings are distinguished from nulls
+                csv_writer = csv.writer(f, quoting=csv.QUOTE_NOTNULL, lineterminator='\n')
+                csv_writer.writerows(data_iter)
+
+            try:
+                sql_query = MSSQL._bulk_insert_query(
+                    path_to_file=os.path.abspath(f.name), table_name=sql_table_name,
+                    batch_size=batch_size)
+                cursor.execute(sql_query)
+                row_count = cursor.rowcount
+            finally:
+                os.remove(f.name)
+
+        finally:
+            cursor.close()
+
+        return row_count
+
+    @_invalidates_metadata
+    def bulk_insert(self, path_to_file, table_name, schema_name=None, first_row=1,
+                    batch_size=None, format_file=None, tablock=True, verbose=False,
+                    raise_error=False):
+        """
+        Loads a data file into an existing table with ``BULK INSERT``.
+
+        See also [`DBMS-MS-BI-1
+        <https://learn.microsoft.com/en-us/sql/t-sql/statements/bulk-insert-transact-sql>`_].
+
+        :param path_to_file: Path to the data file, which must be readable by the SQL Server
+            under this path.
+        :type path_to_file: str | os.PathLike
+        :param table_name: Name of the table.
+        :type table_name: str
+        :param schema_name: Name of the schema where the table is located;
+            defaults to :attr:`~pyhelpers.dbms.MSSQL.DEFAULT_SCHEMA` (i.e. ``'dbo'``)
+            if ``schema_name=None``.
+        :type schema_name: str | None
+        :param first_row: Number of the first row to load (e.g. ``2`` to skip a header);
+            defaults to ``1``.
+        :type first_row: int
+        :param batch_size: Number of rows committed at a time;
+            defaults to ``None`` (i.e. all rows in one batch).
+        :type batch_size: int | None
+        :param format_file: Path to a BCP format file (e.g. generated by ``bcp ... format``)
+            describing the data file; if ``format_file=None`` (default), the data file is parsed
+            as a UTF-8 CSV file (which requires SQL Server 2017 or later).
+        :type format_file: str | os.PathLike | None
+        :param tablock: Whether to take a table-level lock, which allows minimal logging;
+            defaults to ``True``.
+        :type tablock: bool
+        :param verbose: Whether to print relevant information to the console; defaults to ``False``.
+        :type verbose: bool | int
+        :param raise_error: Whether to raise the provided exception;
+            if ``raise_error=False`` (default), the error will be suppressed.
+        :type raise_error: bool
+        :return: Number of rows loaded.
+        :rtype: int | None
+
+        **Examples**::
+
+            >>> from pyhelpers.dbms import MSSQL
+            >>> from pyhelpers._cache import example_dataframe
+            >>> mssql = MSSQL(database_name='testdb')
+            Creating a database: [testdb] ... Done.
+            Connecting <server_name>@localhost:1433/testdb ... Successfully.
+            >>> example_df = example_dataframe()
+            >>> mssql.import_data(example_df.iloc[:0], 'example_df', index=True,
+            ...                   confirmation_required=False)
+            >>> example_df.to_csv('/data/example_df.csv')  # Saved where the server can read it
+            >>> mssql.bulk_insert('/data/example_df.csv', 'example_df', first_row=2, verbose=True)
+            Loading "/data/example_df.csv" into [dbo].[example_df] ... Done.
+            4
+            >>> mssql.drop_database(verbose=True)  # Delete the database [testdb]
+            To drop the database [testdb] from <server_name>@localhost:1433
+            ? [No]|Yes: yes
+            Dropping [testdb] ... Done.
+        """
+
+        table_name_ = self._table_name(table_name=table_name, schema_name=schema_name)
+
+        if verbose:
+            print(f"Loading \"{path_to_file}\" into {table_name_}", end=" ... ")
+
+        try:
+            sql_query = self._bulk_insert_query(
+                path_to_file=path_to_file, table_name=table_name_, first_row=first_row,
+                batch_size=batch_size, format_file=format_file, tablock=tablock)
+
+            with self.engine.connect() as connection:
+                row_count = connection.exec_driver_sql(sql_query).rowcount
+
+            if verbose:
+                print("Done.")
+
+            return row_count
+
+        except Exception as e:
+            _print_failure_message(e=e, prefix="Failed.", verbose=verbose, raise_error=raise_error)
+
     def import_data(self, data, table_name, schema_name=None, if_exists='fail',
                     force_replace=False, chunk_size=None, dtype=None, method='multi',
-                    index=False, geom_column_name=None, srid=None, confirmation_required=True,
-                    verbose=False, **kwargs):
+                    index=False, geom_column_name=None, srid=None, bulk_dir=None,
+                    confirmation_required=True, verbose=False, **kwargs):
         """
         Import tabular data into the database.
 
@@ -1701,29 +2237,53 @@ class MSSQL(_Base):
 
             - ``'replace'``: Drop the table before inserting new data.
             - ``'append'``: Insert new data to the existing table.
+            - ``'upsert'``: Load the data into a staging table (of the same column types as the
+              table) and then ``MERGE`` it into the existing table on its primary key(s),
+              which must be unique in the data.
             - ``'fail'``: Raise a ValueError if the table already exists (default).
 
         :type if_exists: str
         :param force_replace: Whether to force replace the existing table; defaults to ``False``.
         :type force_replace: bool
-        :param chunk_size: Number of rows to insert at a time; defaults to ``None`` (all at once).
-        :type chunk_size: int | None
+        :param chunk_size: Number of rows to insert at a time; defaults to ``None`` (all at once,
+            except that with ``method='multi'``, the rows are split into chunks within the cap of
+            2,100 parameters per statement). If ``chunk_size='adaptive'``, the number is estimated
+            from the memory usage per row and adjusted between chunks by the observed rows/sec,
+            targeting a memory budget (``memory_budget``, in gigabyte; defaults to ``0.25``) and
+            the seconds per chunk (``batch_latency``; defaults to ``2.0``) given in ``kwargs``.
+        :type chunk_size: int | str | None
         :param dtype: Dictionary specifying column data types; defaults to ``None``.
         :type dtype: dict | None
         :param method: Method for SQL insertion clause:
 
             - ``None``: Uses standard SQL ``INSERT`` clause (one per row).
             - ``'multi'``: Passes multiple values in a single ``INSERT`` clause (default).
+            - ``'fast_executemany'``: Uses
+              :meth:`~pyhelpers.dbms.MSSQL.mssql_insert_fast_executemany`, which sends arrays of
+              parameters with pyodbc ``fast_executemany`` (recommended for large data).
+            - ``'bulk_insert'``: Uses :meth:`~pyhelpers.dbms.MSSQL.mssql_insert_bulk`, which
+              loads the data with ``BULK INSERT`` from a temporary CSV file in ``bulk_dir``.
+            - Callable with signature ``(pd_table, conn, keys, data_iter)``.
 
         :type method: str | None | typing.Callable
         :param index: Whether to include the DataFrame index as a column in the database table.
         :type index: bool
-        :param geom_column_name: Name of the geometry column if importing spatial data;
-            defaults to ``None``.
+        :param geom_column_name: Name of the geometry column if importing spatial data,
+            whose values may be `shapely`_ geometries, well-known text (WKT) or well-known binary
+            (WKB); defaults to ``None``. When ``data`` is a dataframe and ``method`` is ``None``,
+            ``'multi'`` or ``'fast_executemany'``, the geometries are encoded as WKB and inserted
+            directly into a ``GEOMETRY`` column in batches (see
+            :meth:`~pyhelpers.dbms.MSSQL.mssql_insert_fast_executemany`); otherwise, they are
+            imported as text and then converted with
+            :meth:`~pyhelpers.dbms.MSSQL.varchar_to_geometry_dtype`.
         :type geom_column_name: str | None
         :param srid: Spatial Reference Identifier (SRID) associated with the coordinate system,
             tolerance and resolution; defaults to ``None``.
         :type srid: int | None
+        :param bulk_dir: Directory of the temporary file when ``method='bulk_insert'``,
+            which must be readable by the SQL Server under the same path;
+            defaults to ``None`` (i.e. the system's temporary directory).
+        :type bulk_dir: str | os.PathLike | None
         :param confirmation_required: Whether to prompt a confirmation message before proceeding;
             defaults to ``True``.
         :type confirmation_required: bool
@@ -1732,6 +2292,7 @@ class MSSQL(_Base):
         :type verbose: bool | int
         :param kwargs: [Optional] Additional parameters for the method `pandas.DataFrame.to_sql()`_.
 
+        .. _`shapely`: https://shapely.readthedocs.io/en/stable/
         .. _`pandas.DataFrame.to_sql()`:
             https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.to_sql.html
 
@@ -1797,6 +2358,32 @@ class MSSQL(_Base):
             str_index_col_dtype = get_adaptive_index_dtypes(data=data, index=index, verbose=verbose)
             col_dtype = col_dtype | str_index_col_dtype
 
+            # Insert geometries as WKB into a GEOMETRY column, rather than converting afterwards
+            geom_as_wkb = bool(geom_column_name) and isinstance(data, pd.DataFrame) and \
+                method in {None, 'multi', 'fast_executemany'}
+
+            if geom_as_wkb:
+                data = data.assign(**{geom_column_name: _geometry_to_wkb(data[geom_column_name])})
+                col_dtype = col_dtype | {geom_column_name: _Geometry()}
+                method = functools.partial(
+                    self.mssql_insert_fast_executemany, geom_column_names=[geom_column_name],
+                    srid=srid)
+            elif method == 'multi' and chunk_size in {None, 'adaptive'} and \
+                    isinstance(data, pd.DataFrame):
+                # A statement can take at most 2,100 parameters and 1,000 rows of values
+                n_params = data.shape[1] + (data.index.nlevels if index else 0)
+                max_chunk_size = max(1, min(1000, 2099 // max(1, n_params)))
+                if chunk_size is None:
+                    chunk_size = max_chunk_size
+                else:  # Adapt the chunk size within the cap
+                    adaptive_kwargs = {
+                        k: kwargs.pop(k) for k in ('memory_budget', 'batch_latency') if k in kwargs}
+                    chunk_size = _AdaptiveChunkSize(max_size=max_chunk_size, **adaptive_kwargs)
+            elif method == 'fast_executemany':
+                method = self.mssql_insert_fast_executemany
+            elif method == 'bulk_insert':
+                method = functools.partial(self.mssql_insert_bulk, bulk_dir=bulk_dir)
+
             self._import_data(
                 data=data, table_name=table_name, schema_name=schema_name, if_exists=if_exists,
                 force_replace=force_replace, chunk_size=chunk_size, dtype=col_dtype, method=method,
@@ -1805,7 +2392,7 @@ class MSSQL(_Base):
             )
 
         # Spatial conversion (Server-side)
-        if geom_column_name:
+        if geom_column_name and not geom_as_wkb:
             if verbose:
                 msg = f"Converting '{geom_column_name}' to Geometry (SRID {srid or 0})"
                 print(msg, end=" ... ", flush=True)
@@ -1818,13 +2405,80 @@ class MSSQL(_Base):
                 print("Done.")
 
     @staticmethod
-    def _dtype_read_fmt(dtype):
+    def _staging_table_query(table_name, staging_table_name, column_names):
+        """
+        Makes a ``SELECT ... INTO`` statement that creates an empty staging table with the columns
+        of a table.
+
+        :param table_name: Formatted name of the table.
+        :type table_name: str
+        :param staging_table_name: Formatted name of the staging table.
+        :type staging_table_name: str
+        :param column_names: Names of the columns of the table to be included.
+        :type column_names: list[str]
+        :return: The statement.
+        :rtype: str
+
+        **Examples**::
+
+            >>> from pyhelpers.dbms import MSSQL
+            >>> MSSQL._staging_table_query('[dbo].[t]', '[dbo].[s]', ['id', 'x'])
+            'SELECT TOP 0 [id], [x] INTO [dbo].[s] FROM [dbo].[t];'
+        """
+
+        col_names = ', '.join(f'[{x}]' for x in column_names)
+
+        sql_query = f'SELECT TOP 0 {col_names} INTO {staging_table_name} FROM {table_name};'
+
+        return sql_query
+
+    @staticmethod
+    def _upsert_query(table_name, staging_table_name, column_names, primary_keys):
+        """
+        Makes a ``MERGE`` statement that upserts the rows of a staging table.
+
+        :param table_name: Formatted name of the table.
+        :type table_name: str
+        :param staging_table_name: Formatted name of the staging table.
+        :type staging_table_name: str
+        :param column_names: Names of the columns of the staging table.
+        :type column_names: list[str]
+        :param primary_keys: Names of the primary key columns of the table.
+        :type primary_keys: list[str]
+        :return: The statement.
+        :rtype: str
+
+        **Examples**::
+
+            >>> from pyhelpers.dbms import MSSQL
+            >>> MSSQL._upsert_query('[dbo].[t]', '[dbo].[s]', ['id', 'x'], ['id'])
+            'MERGE INTO [dbo].[t] WITH (HOLDLOCK) AS t USING [dbo].[s] AS s ON t.[id] = s.[id] ...
+        """
+
+        on_keys = ' AND '.join(f't.[{x}] = s.[{x}]' for x in primary_keys)
+        col_names = ', '.join(f'[{x}]' for x in column_names)
+        values = ', '.join(f's.[{x}]' for x in column_names)
+
+        sql_query = f'MERGE INTO {table_name} WITH (HOLDLOCK) AS t ' \
+                    f'USING {staging_table_name} AS s ON {on_keys} '
+        if updates := ', '.join(
+                f't.[{x}] = s.[{x}]' for x in column_names if x not in primary_keys):
+            sql_query += f'WHEN MATCHED THEN UPDATE SET {updates} '
+        sql_query += f'WHEN NOT MATCHED BY TARGET THEN INSERT ({col_names}) VALUES ({values});'
+
+        return sql_query
+
+    @staticmethod
+    def _dtype_read_fmt(dtype, as_wkb=False):
         """
         Generate SQL format string based on data type.
 
         :param dtype: Data type identifier, e.g. ``'hierarchyid'``, ``'varbinary'``,
             ``'geometry'`` or others.
         :type dtype: str
+        :param as_wkb: Whether to read geometry as well-known binary (WKB), rather than
+            well-known text (WKT); defaults to ``False``.
+        :type as_wkb: bool
         :return: SQL format string for reading data of the specified type.
         :rtype: str
         """
@@ -1834,13 +2488,38 @@ class MSSQL(_Base):
         elif dtype == 'varbinary':
             fmt = 'CONVERT(VARCHAR(max), [{x}], 2) AS [{x}]'
         elif dtype == 'geometry':
-            fmt = '[{x}].STAsText() AS [{x}]'
+            fmt = '[{x}].STAsBinary() AS [{x}]' if as_wkb else '[{x}].STAsText() AS [{x}]'
         else:
             fmt = '[{x}]'
 
         return fmt
 
-    def _read_column_names(self, table_name, schema_name, column_names):
+    def _iter_sql_query(self, sql_query, chunk_size, **kwargs):
+        """
+        Executes a SQL query and yields the result in chunks of rows.
+
+        The connection is held open while the chunks are consumed. As `pyodbc`_ cursors are
+        forward-only, rows are fetched from the server as the chunks are consumed, so that only
+        one chunk is held in memory at a time.
+
+        :param sql_query: SQL query to be executed.
+        :type sql_query: str
+        :param chunk_size: Number of rows in each chunk.
+        :type chunk_size: int
+        :param kwargs: [Optional] Additional parameters for the function `pandas.read_sql()`_.
+        :return: Chunks of the result.
+        :rtype: typing.Generator[pandas.DataFrame, None, None]
+
+        .. _`pyodbc`: https://github.com/mkleehammer/pyodbc/wiki/Cursor
+        .. _`pandas.read_sql()`: https://pandas.pydata.org/docs/reference/api/pandas.read_sql.html
+        """
+
+        with self.engine.connect() as connection:
+            query = sqlalchemy.text(sql_query)
+            # noinspection PyTypeChecker
+            yield from pd.read_sql(sql=query, con=connection, chunksize=int(chunk_size), **kwargs)
+
+    def _read_column_names(self, table_name, schema_name, column_names, as_wkb=False):
         """
         Generate formatted column names for a SQL query statement.
 
@@ -1850,6 +2529,8 @@ class MSSQL(_Base):
         :type schema_name: str | None
         :param column_names: Name(s) of the column(s) to be included in the SQL query.
         :type column_names: str | list | tuple
+        :param as_wkb: Whether to read geometry as well-known binary (WKB); defaults to ``False``.
+        :type as_wkb: bool
         :return: Original column names and formatted column names for SQL query.
         :rtype: tuple[list, str]
         """
@@ -1864,14 +2545,14 @@ class MSSQL(_Base):
         col_idx = [column_info_col_names.index(x) for x in (y.lower() for y in col_names)]
         dtypes = [column_info['DATA_TYPE'][i] for i in col_idx]
 
-        fmts = [self._dtype_read_fmt(dtype) for dtype in dtypes]
+        fmts = [self._dtype_read_fmt(dtype, as_wkb=as_wkb) for dtype in dtypes]
         col_names_ = ', '.join(fmt.format(x=x) for fmt, x in zip(fmts, col_names))
 
         return col_names, col_names_
 
     @_lazy_check_dependencies('shapely')
     def read_columns(self, table_name, column_names, dtype=None, schema_name=None, chunk_size=None,
-                     **kwargs):
+                     iterator=False, **kwargs):
         """
         Read data of specific columns of a table.
 
@@ -1880,7 +2561,8 @@ class MSSQL(_Base):
         :param column_names: Column name(s) of the specified table.
         :type column_names: list | tuple
         :param dtype: data type; options are ``{'hierarchyid', 'varbinary', 'geometry'}``;
-            defaults to ``None``.
+            defaults to ``None``. When ``dtype='geometry'``, the columns are read as well-known
+            binary (WKB) and decoded into `shapely`_ geometries.
         :type dtype: str | None
         :param schema_name: Name of a schema,
             defaults to :attr:`~pyhelpers.dbms.MSSQL.DEFAULT_SCHEMA` when ``schema_name=None``.
@@ -1888,11 +2570,15 @@ class MSSQL(_Base):
         :param chunk_size: Number of rows to include in each chunk (if specified);
             defaults to ``None``
         :type chunk_size: int | None
+        :param iterator: Whether to return a generator of chunks of ``chunk_size`` rows
+            (``100000`` if not specified) rather than the whole data; defaults to ``False``.
+        :type iterator: bool
         :param kwargs: [Optional] Additional parameters for the function `pandas.read_sql()`_.
         :return: Data of specific columns of the queried table.
-        :rtype: pandas.DataFrame
+        :rtype: pandas.DataFrame | typing.Generator[pandas.DataFrame, None, None]
 
         .. _`pandas.read_sql()`: https://pandas.pydata.org/docs/reference/api/pandas.read_sql.html
+        .. _`shapely`: https://shapely.readthedocs.io/en/stable/reference/shapely.from_wkb.html
 
         **Examples**::
 
@@ -1918,26 +2604,82 @@ class MSSQL(_Base):
         """
 
         col_names, col_names_ = self._read_column_names(
-            table_name=table_name, schema_name=schema_name, column_names=column_names)
+            table_name=table_name, schema_name=schema_name, column_names=column_names,
+            as_wkb=dtype == 'geometry')
         table_name_ = self._table_name(table_name=table_name, schema_name=schema_name)
 
+        sql_query = f'SELECT {col_names_} FROM {table_name_};'
+
+        def _parse(data_):
+            if dtype == 'geometry':  # Decode the well-known binary (WKB) of each column at once
+                for col_name in col_names:
+                    data_[col_name] = shapely.from_wkb(data_[col_name].to_numpy())  # noqa
+            return data_
+
+        if iterator:
+            return (_parse(chunk) for chunk in self._iter_sql_query(
+                sql_query, chunk_size=chunk_size or 100000, **kwargs))
+
         with self.engine.connect() as connection:
-            query = sqlalchemy.text(f'SELECT {col_names_} FROM {table_name_};')
+            query = sqlalchemy.text(sql_query)
             # noinspection PyTypeChecker
             data = pd.read_sql(sql=query, con=connection, chunksize=chunk_size, **kwargs)
 
-        if chunk_size:
-            data = pd.concat(data, ignore_index=True)
+            if chunk_size:
+                data = pd.concat(data, ignore_index=True)
 
-        if dtype == 'geometry':
-            data[col_names] = data[col_names].map(shapely.wkt.loads)  # noqa
+        return _parse(data)
 
-        return data
+    def _read_table_query(self, table_name, schema_name=None, column_names=None, conditions=None):
+        """
+        Generate a SQL query statement for reading data from a table.
+
+        Columns of the data types ``'hierarchyid'``, ``'varbinary'`` and ``'geometry'`` are
+        converted to text in the query (see :meth:`~pyhelpers.dbms.MSSQL._dtype_read_fmt`).
+
+        :param table_name: Name of the table.
+        :type table_name: str
+        :param schema_name: Name of the schema where the table resides; defaults to ``None``.
+        :type schema_name: str | None
+        :param column_names: Names of columns to retrieve data from;
+            defaults to all columns when ``column_names=None``.
+        :type column_names: list | tuple | None
+        :param conditions: Conditions to apply in the SQL query statement; defaults to ``None``.
+        :type conditions: str | None
+        :return: Names of the columns to be retrieved (in order) and the SQL query statement.
+        :rtype: tuple[list, str]
+        """
+
+        if column_names is None:
+            column_names_ = self.get_column_names(table_name=table_name, schema_name=schema_name)
+        else:
+            column_names_ = list(column_names)
+
+        check_dtypes = self.has_dtypes(
+            table_name, dtypes=['hierarchyid', 'varbinary', 'geometry'], schema_name=schema_name)
+
+        column_fmts = {}
+        for dtype, if_exists, col_names in check_dtypes:
+            if if_exists:
+                fmt = self._dtype_read_fmt(dtype)
+                column_fmts.update({x: fmt.format(x=x) for x in col_names})
+
+        # Keep the columns in order, so that rows can be used as they are fetched
+        column_names_in_query = ', '.join(column_fmts.get(x, f'[{x}]') for x in column_names_)
+
+        # Specify a SQL query statement
+        table_name_ = self._table_name(table_name=table_name, schema_name=schema_name)
+        sql_query = f'SELECT {column_names_in_query} FROM {table_name_};'
+
+        if conditions:
+            sql_query = sql_query.replace(';', ' ') + conditions + ';'
+
+        return column_names_, sql_query
 
     @_lazy_check_dependencies('pyhelpers')
     def read_table(self, table_name, schema_name=None, column_names=None, conditions=None,
                    chunk_size=None, save_as=None, data_dir=None, save_args=None, verbose=False,
-                   **kwargs):
+                   engine=None, iterator=False, **kwargs):
         """
         Read data from a specified table.
 
@@ -1964,9 +2706,17 @@ class MSSQL(_Base):
         :type save_args: dict | None
         :param verbose: Whether to print relevant information in the console; defaults to ``False``.
         :type verbose: bool | int
+        :param engine: Format of the data to be returned; when ``engine='arrow'``, rows are fetched
+            in batches (of ``chunk_size`` rows, if specified) into a ``pyarrow.Table``, and
+            ``kwargs`` are ignored; defaults to ``None`` (i.e. reading via `pandas.read_sql()`_).
+        :type engine: str | None
+        :param iterator: Whether to return a generator of chunks of the table data
+            (see :meth:`~pyhelpers.dbms.MSSQL.iter_table`) rather than the whole data;
+            defaults to ``False``.
+        :type iterator: bool
         :param kwargs: [Optional] Additional parameters for the function `pandas.read_sql()`_.
         :return: Data of the queried table from the currently-connected database.
-        :rtype: pandas.DataFrame
+        :rtype: pandas.DataFrame | pyarrow.Table | typing.Generator[pandas.DataFrame, None, None]
 
         .. _`pandas.read_sql()`: https://pandas.pydata.org/docs/reference/api/pandas.read_sql.html
 
@@ -2019,6 +2769,10 @@ class MSSQL(_Base):
             Birmingham  -1.902691  52.479699
             Manchester  -2.245115  53.479489
             Leeds       -1.543794  53.797418
+            >>> # Retrieve the data as a pyarrow.Table
+            >>> example_tbl = testdb.read_table(test_table_name, engine='arrow')
+            >>> example_tbl.column_names
+            ['City', 'Longitude', 'Latitude']
             >>> # Drop/Delete the testing database [testdb]
             >>> testdb.drop_database(verbose=True)
             To drop the database [testdb] from <server_name>@localhost:1433
@@ -2030,41 +2784,39 @@ class MSSQL(_Base):
             - Examples for the method :meth:`~pyhelpers.dbms.MSSQL.import_data`.
         """
 
-        if column_names is None:
-            column_names_ = self.get_column_names(table_name=table_name, schema_name=schema_name)
-        else:
-            column_names_ = list(column_names)
+        if iterator:
+            return self.iter_table(
+                table_name=table_name, schema_name=schema_name, column_names=column_names,
+                conditions=conditions, chunk_size=chunk_size or 100000, save_as=save_as,
+                data_dir=data_dir, save_args=save_args, verbose=verbose, **kwargs)
 
-        check_dtypes = self.has_dtypes(table_name, dtypes=['hierarchyid', 'varbinary', 'geometry'])
+        column_names_, sql_query = self._read_table_query(
+            table_name=table_name, schema_name=schema_name, column_names=column_names,
+            conditions=conditions)
 
-        solo_column_names = []
-        column_names_in_query = column_names_.copy()
-        for dtype, if_exists, col_names in check_dtypes:
-            if if_exists:
-                fmt = self._dtype_read_fmt(dtype)
-                col_names_ = ', '.join(fmt.format(x=x) for x in col_names)
-                solo_column_names.append(col_names_)
-                column_names_in_query = list(set(column_names_in_query) - set(col_names))
-
-        column_names_in_query = ', '.join(
-            [f'[{x}]' for x in column_names_in_query] + solo_column_names)
-
-        # Specify a SQL query statement
-        table_name_ = self._table_name(table_name=table_name, schema_name=schema_name)
-        sql_query = f'SELECT {column_names_in_query} FROM {table_name_};'
+        if engine == 'arrow':
+            connection = self.engine.raw_connection()
+            try:
+                cursor = connection.cursor()
+                cursor.execute(sql_query)
+                data = _fetch_arrow(cursor, batch_size=chunk_size or 10000)
+                cursor.close()
+            finally:
+                connection.close()
 
-        if conditions:
-            sql_query = sql_query.replace(';', ' ') + conditions + ';'
+            # Sort the order of columns
+            data = data.select(column_names_)
 
-        with self.engine.connect() as connection:
-            query = sqlalchemy.text(sql_query)
-            # noinspection PyTypeChecker
-            data = pd.read_sql(sql=query, con=connection, chunksize=chunk_size, **kwargs)
+        else:
+            with self.engine.connect() as connection:
+                query = sqlalchemy.text(sql_query)
+                # noinspection PyTypeChecker
+                data = pd.read_sql(sql=query, con=connection, chunksize=chunk_size, **kwargs)
 
-        data = pd.concat(data, axis=0, ignore_index=True) if chunk_size else pd.DataFrame(data)
+            data = pd.concat(data, axis=0, ignore_index=True) if chunk_size else pd.DataFrame(data)
 
-        # Sort the order of columns
-        data = data[[x for x in column_names_ if x not in data.index.names]]
+            # Sort the order of columns
+            data = data[[x for x in column_names_ if x not in data.index.names]]
 
         if save_as:
             data_dir_ = pyhelpers.dirs.resolve_dir_path(data_dir)  # noqa
@@ -2076,6 +2828,376 @@ class MSSQL(_Base):
 
         return data
 
+    @_lazy_check_dependencies('pyhelpers')
+    def iter_table(self, table_name, schema_name=None, column_names=None, conditions=None,
+                   chunk_size=100000, save_as=None, data_dir=None, save_args=None, verbose=False,
+                   **kwargs):
+        """
+        Read data from a specified table in chunks, yielding one chunk at a time.
+
+        The query is executed once and the rows are fetched from the server as the chunks are
+        consumed, so that memory usage is bounded by ``chunk_size`` regardless of the size of
+        the table. The connection is held open until the generator is exhausted or closed.
+
+        :param table_name: Name of the table to read data from in the currently-connected database.
+        :type table_name: str
+        :param schema_name: Name of the schema where the table resides;
+            defaults to :attr:`~pyhelpers.dbms.MSSQL.DEFAULT_SCHEMA` when ``schema_name=None``.
+        :type schema_name: str | None
+        :param column_names: Names of columns to retrieve data from;
+            defaults to all columns when ``column_names=None``.
+        :type column_names: list | tuple | None
+        :param conditions: Conditions to apply in the SQL query statement; defaults to ``None``.
+        :type conditions: str | None
+        :param chunk_size: Number of rows in each chunk; defaults to ``100000``.
+        :type chunk_size: int
+        :param save_as: File extension (if specified) for saving each chunk locally, as
+            ``<data_dir>/<table_name>/part-<i><save_as>`` (e.g. a Parquet dataset when
+            ``save_as='.parquet'``), replacing any part files saved there before;
+            defaults to ``None``.
+        :type save_as: str | None
+        :param data_dir: Directory path where the table data should be saved; defaults to ``None``.
+        :type data_dir: str | None
+        :param save_args: Optional parameters for the function :func:`pyhelpers.store.save_data`;
+            defaults to ``None``.
+        :type save_args: dict | None
+        :param verbose: Whether to print relevant information in the console; defaults to ``False``.
+        :type verbose: bool | int
+        :param kwargs: [Optional] Additional parameters for the function `pandas.read_sql()`_.
+        :return: Chunks of the data of the queried table.
+        :rtype: typing.Generator[pandas.DataFrame, None, None]
+
+        .. _`pandas.read_sql()`: https://pandas.pydata.org/docs/reference/api/pandas.read_sql.html
+
+        **Examples**::
+
+            >>> from pyhelpers.dbms import MSSQL
+            >>> from pyhelpers._cache import example_dataframe
+            >>> mssql = MSSQL(database_name='testdb')
+            Creating a database: [testdb] ... Done.
+            Connecting <server_name>@localhost:1433/testdb ... Successfully.
+            >>> mssql.import_data(example_dataframe(), table_name='example_df', index=True,
+            ...                   confirmation_required=False)
+            >>> for chunk in mssql.iter_table('example_df', chunk_size=3):
+            ...     print(chunk.shape)
+            (3, 3)
+            (1, 3)
+            >>> # Export the table to a Parquet dataset, one chunk at a time
+            >>> for _ in mssql.iter_table('example_df', chunk_size=3, save_as='.parquet',
+            ...                           data_dir='tests\\data'):
+            ...     pass
+            >>> import pandas as pd
+            >>> pd.read_parquet('tests\\data\\example_df').shape
+            (4, 3)
+            >>> mssql.drop_database(verbose=True)  # Delete the database [testdb]
+            To drop the database [testdb] from <server_name>@localhost:1433
+            ? [No]|Yes: yes
+            Dropping [testdb] ... Done.
+        """
+
+        column_names_, sql_query = self._read_table_query(
+            table_name=table_name, schema_name=schema_name, column_names=column_names,
+            conditions=conditions)
+
+        if save_as:
+            dataset_dir = os.path.join(pyhelpers.dirs.resolve_dir_path(data_dir), table_name)  # noqa
+            os.makedirs(dataset_dir, exist_ok=True)
+            # Remove the parts of an earlier export, which may outnumber the new ones
+            for path_to_file in glob.glob(os.path.join(dataset_dir, 'part-*')):
+                os.remove(path_to_file)
+
+        for i, chunk in enumerate(self._iter_sql_query(sql_query, chunk_size, **kwargs)):
+            # Sort the order of columns
+            chunk = chunk[[x for x in column_names_ if x not in chunk.index.names]]
+
+            if save_as:
+                path_to_file = os.path.join(dataset_dir, f'part-{i:05d}{save_as}')  # noqa
+
+                save_args_ = {} if save_args is None else save_args.copy()
+                save_args_.update({'data': chunk, 'path_to_file': path_to_file, 'verbose': verbose})
+                pyhelpers.store.save_data(**save_args_)  # noqa
+
+            yield chunk
+
+    def _partition_bounds(self, table_name, key_column, n_partitions, schema_name=None):
+        """
+        Gets the bounds of ranges of a key column, which split a table into partitions of
+        (nearly) equal numbers of rows.
+
+        :param table_name: Name of the table.
+        :type table_name: str
+        :param key_column: Name of the (unique) key column.
+        :type key_column: str
+        :param n_partitions: Number of partitions.
+        :type n_partitions: int
+        :param schema_name: Name of the schema where the table resides; defaults to ``None``.
+        :type schema_name: str | None
+        :return: Upper bounds (inclusive) of the ranges, except for the last one.
+        :rtype: list
+        """
+
+        table_name_ = self._table_name(table_name=table_name, schema_name=schema_name)
+
+        sql_query = (
+            f'SELECT MAX([{key_column}]) FROM ('
+            f'SELECT [{key_column}], NTILE({int(n_partitions)}) OVER (ORDER BY [{key_column}]) '
+            f'AS [tile] FROM {table_name_}) AS [tiles] GROUP BY [tile] ORDER BY [tile];')
+
+        with self.engine.connect() as connection:
+            bounds = connection.execute(sqlalchemy.text(sql_query)).scalars().all()
+
+        return bounds[:-1]
+
+    def _export_schema(self, info):
+        """
+        Gets the Arrow schema of a table being exported, as described by the database.
+
+        :param info: Information about the export, as recorded in the manifest.
+        :type info: dict
+        :return: Schema of the table, shared by all the part files.
+        :rtype: pyarrow.Schema
+        """
+
+        _, sql_query = self._read_table_query(
+            table_name=info['table_name'], schema_name=info['schema_name'],
+            column_names=info['column_names'], conditions='WHERE 1 = 0')
+
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(sql_query)
+            schema = _fetch_arrow(cursor).schema
+            cursor.close()
+        finally:
+            connection.close()
+
+        return schema
+
+    @_lazy_check_dependencies(pq='pyarrow.parquet')
+    def _export_partition(self, manifest, partition_name, dataset_dir, chunk_size, schema=None,
+                          **kwargs):
+        """
+        Exports a partition of a table, as recorded in a manifest, to a Parquet file.
+
+        The rows are written batch by batch to a hidden temporary file, which replaces the part
+        file only when all rows have been written. Given the ``schema`` of the table (shared by
+        all partitions), the part files have the same types whether or not they have any rows.
+
+        :return: Number of rows exported.
+        :rtype: int
+        """
+
+        info, state = manifest.info, manifest.get(partition_name)
+        key_column = info['key_column']
+
+        conditions, params = [], []
+        if state.get('lower_bound') is not None:
+            conditions.append(f'[{key_column}] > ?')
+            params.append(state['lower_bound'])
+        if state.get('upper_bound') is not None:
+            conditions.append(f'[{key_column}] <= ?')
+            params.append(state['upper_bound'])
+
+        conditions = ('WHERE ' + ' AND '.join(conditions) + ' ') if conditions else ''
+        if key_column:
+            conditions += f'ORDER BY [{key_column}]'
+
+        _, sql_query = self._read_table_query(
+            table_name=info['table_name'], schema_name=info['schema_name'],
+            column_names=info['column_names'], conditions=conditions or None)
+
+        path_to_file = os.path.join(dataset_dir, state['file'])
+        temp_path = os.path.join(dataset_dir, f".{state['file']}.tmp")
+
+        manifest.update(partition_name, status='in_progress')
+
+        row_count, writer = 0, None
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(sql_query, params) if params else cursor.execute(sql_query)
+
+            batches = _iter_arrow_batches(cursor, batch_size=chunk_size, schema=schema)
+            try:
+                while True:
+                    try:
+                        batch = next(batches)
+                    except StopIteration as e:
+                        if writer is None:  # No rows
+                            pq.write_table(e.value.empty_table(), temp_path, **kwargs)  # noqa
+                        break
+
+                    if writer is None:
+                        writer = pq.ParquetWriter(temp_path, batch.schema, **kwargs)  # noqa
+                    writer.write_batch(batch)
+                    row_count += batch.num_rows
+
+            finally:
+                if writer is not None:
+                    writer.close()
+
+            cursor.close()
+
+        finally:
+            connection.close()
+
+        os.replace(temp_path, path_to_file)
+        manifest.update(partition_name, status='done', row_count=row_count)
+
+        return row_count
+
+    @_lazy_check_dependencies('pyhelpers')
+    def export_table(self, table_name, schema_name=None, column_names=None, data_dir=None,
+                     partition_size=1000000, n_workers=None, chunk_size=10000, overwrite=False,
+                     verbose=False, raise_error=False, **kwargs):
+        """
+        Export a table to a Parquet dataset, reading its partitions over concurrent connections.
+
+        The table is split into ranges of its primary key (when it is a single column), each
+        holding about ``partition_size`` rows. Each partition is read on a separate pooled
+        connection in a thread pool and streamed, ``chunk_size`` rows at a time, into a part
+        file ``<data_dir>/<table_name>/part-<i>.parquet``. The ranges and the progress of the
+        partitions are recorded in ``_manifest.json`` in the same directory; when the export
+        is run again, the partitions that have been completed are skipped.
+
+        :param table_name: Name of the table.
+        :type table_name: str
+        :param schema_name: Name of the schema where the table resides;
+            defaults to :attr:`~pyhelpers.dbms.MSSQL.DEFAULT_SCHEMA` when ``schema_name=None``.
+        :type schema_name: str | None
+        :param column_names: Names of columns to export; defaults to all columns when
+            ``column_names=None``. It is ignored when resuming an export.
+        :type column_names: list | tuple | None
+        :param data_dir: Directory where the dataset directory is created; defaults to ``None``.
+        :type data_dir: str | None
+        :param partition_size: Approximate number of rows of each partition;
+            defaults to ``1000000``. A table without a single-column primary key is exported
+            as one partition.
+        :type partition_size: int
+        :param n_workers: Number of concurrent connections; when ``n_workers=None`` (default),
+            it is the smaller of ``4`` and the number of CPUs. It should not exceed the size
+            (plus overflow) of the connection pool.
+        :type n_workers: int | None
+        :param chunk_size: Number of rows fetched and written at a time; defaults to ``10000``.
+        :type chunk_size: int
+        :param overwrite: Whether to discard an existing manifest and the part files
+            (including any temporary ones) rather than resuming the export; defaults to ``False``.
+        :type overwrite: bool
+        :param verbose: Whether to print relevant information in the console; defaults to ``False``.
+        :type verbose: bool | int
+        :param raise_error: Whether to raise the provided exception;
+            if ``raise_error=False`` (default), the error will be suppressed.
+        :type raise_error: bool
+        :param kwargs: [Optional] Additional parameters for `pyarrow.parquet.ParquetWriter`_,
+            e.g. ``compression='zstd'``.
+        :return: Pathname of the directory of the dataset.
+        :rtype: str
+
+        .. _`pyarrow.parquet.ParquetWriter`:
+            https://arrow.apache.org/docs/python/generated/pyarrow.parquet.ParquetWriter.html
+
+        **Examples**::
+
+            >>> from pyhelpers.dbms import MSSQL
+            >>> import pandas as pd
+            >>> mssql = MSSQL(database_name='testdb')
+            Creating a database: [testdb] ... Done.
+            Connecting <server_name>@localhost:1433/testdb ... Successfully.
+            >>> dat = pd.DataFrame({'id': range(100000), 'val': 0.5})
+            >>> mssql.import_data(dat, 'test_table', confirmation_required=False)
+            >>> mssql.add_primary_key('id', 'test_table')
+            >>> dataset_dir = mssql.export_table('test_table', data_dir='tests\\data',
+            ...                                  partition_size=25000, verbose=True)
+            Exporting [dbo].[test_table] to "tests\\data\\test_table\\" (4 partitions) ... Done.
+            >>> pd.read_parquet(dataset_dir).shape
+            (100000, 2)
+            >>> mssql.drop_database(verbose=True)  # Delete the database [testdb]
+            To drop the database [testdb] from <server_name>@localhost:1433
+            ? [No]|Yes: yes
+            Dropping [testdb] ... Done.
+        """
+
+        dataset_dir = os.path.join(pyhelpers.dirs.resolve_dir_path(data_dir), table_name)  # noqa
+        os.makedirs(dataset_dir, exist_ok=True)
+
+        path_to_manifest = os.path.join(dataset_dir, '_manifest.json')
+        if overwrite:
+            # Including the temporary files left by an interrupted export
+            for pattern in ('part-*.parquet', '.part-*.tmp'):
+                for path_to_file in glob.glob(os.path.join(dataset_dir, pattern)):
+                    os.remove(path_to_file)
+            if os.path.isfile(path_to_manifest):
+                os.remove(path_to_manifest)
+
+        manifest = _ExportManifest(path_to_manifest)
+        table_name_ = self._table_name(table_name=table_name, schema_name=schema_name)
+
+        if not manifest.info:  # A new export
+            primary_keys = self.get_primary_keys(table_name=table_name, schema_name=schema_name)
+            key_column = primary_keys[0] if primary_keys and len(primary_keys) == 1 else None
+
+            if key_column:
+                row_count = self.get_row_count(table_name=table_name, schema_name=schema_name)
+                n_partitions = max(1, -(-(row_count or 0) // int(partition_size)))
+            else:
+                n_partitions = 1
+
+            bounds = self._partition_bounds(
+                table_name=table_name, key_column=key_column, n_partitions=n_partitions,
+                schema_name=schema_name) if n_partitions > 1 else []
+
+            if column_names is None:
+                column_names = self.get_column_names(table_name=table_name, schema_name=schema_name)
+
+            manifest.set_info(
+                table_name=table_name, schema_name=self._schema_name(schema_name),
+                key_column=key_column, column_names=list(column_names))
+
+            for i, (lower, upper) in enumerate(zip([None] + bounds, bounds + [None])):
+                manifest.update(
+                    f'part-{i:05d}', file=f'part-{i:05d}.parquet', status='pending',
+                    lower_bound=lower, upper_bound=upper)
+
+        partition_names = manifest.partition_names()
+        pending = [
+            x for x in partition_names if manifest.get(x)['status'] != 'done'
+            or not os.path.isfile(os.path.join(dataset_dir, manifest.get(x)['file']))]
+
+        if verbose:
+            rel_path = os.path.relpath(dataset_dir)
+            n = f"{len(pending)}/{len(partition_names)}" if len(pending) < len(partition_names) \
+                else len(partition_names)
+            print(f"Exporting {table_name_} to \"{rel_path}{os.path.sep}\" ({n} partitions)",
+                  end=" ... ")
+
+        if n_workers is None:
+            n_workers = min(4, os.cpu_count() or 1)
+
+        try:
+            schema = self._export_schema(manifest.info) if pending else None
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=n_workers) as executor:
+                futures = [
+                    executor.submit(
+                        self._export_partition, manifest=manifest, partition_name=x,
+                        dataset_dir=dataset_dir, chunk_size=chunk_size, schema=schema, **kwargs)
+                    for x in pending]
+                try:
+                    for future in concurrent.futures.as_completed(futures):
+                        future.result()
+                finally:
+                    for future in futures:
+                        future.cancel()
+
+            if verbose:
+                print("Done.")
+
+        except Exception as e:
+            _print_failure_message(e=e, prefix="Failed.", verbose=verbose, raise_error=raise_error)
+
+        return dataset_dir
+
+    @_invalidates_metadata
     def drop_table(self, table_name, schema_name=None, confirmation_required=True, verbose=False,
                    raise_error=False):
         """
@@ -2,15 +2,25 @@
 Database tools/utilities.
 """
 
+import concurrent.futures
 import copy
+import datetime
+import decimal
 import gc
 import inspect
+import json
+import os
+import pathlib
+import queue
 import re
 import sys
+import threading
+import time
 
 import pandas as pd
-import sqlalchemy.dialects
+import sqlalchemy.dialects.postgresql
 
+from ._base import _current_span
 from .._cache import _check_dependencies, _confirmed, _print_failure_message
 
 
@@ -400,8 +410,9 @@ def _get_col_type(mssql, mssql_table_name, source_data):
     for dtype, if_exists, col_names in check_dtypes_rslt:
         if if_exists:
             if dtype == 'hierarchyid':
-                source_data_.loc[:, col_names] = source_data_[col_names].applymap(
-                    lambda x: str(x).replace('\\', '\\\\'))
+                for col_name in col_names:
+                    source_data_[col_name] = source_data_[col_name].str.replace(
+                        '\\', '\\\\', regex=False)
 
             bytea_list = [sqlalchemy.dialects.postgresql.BYTEA] * len(col_names)
             col_type.update(dict(zip(col_names, bytea_list)))
@@ -436,6 +447,13 @@ def _mssql_postgres_import_data(mssql, postgres, source_data, postgres_schema_na
             chunk_size=chunk_size, dtype=dtype, confirmation_required=False,
             verbose=False)
 
+    _add_primary_keys(mssql, postgres, mssql_table_name, postgres_schema_name)
+
+    del source_data
+    gc.collect()
+
+
+def _add_primary_keys(mssql, postgres, mssql_table_name, postgres_schema_name):
     # Get primary keys from MSSQL
     primary_keys = mssql.get_primary_keys(mssql_table_name, table_type='TABLE')
 
@@ -445,16 +463,359 @@ def _mssql_postgres_import_data(mssql, postgres, source_data, postgres_schema_na
     if not postgres_pkey:
         postgres.add_primary_keys(primary_keys, mssql_table_name, postgres_schema_name)
 
-    del source_data
-    gc.collect()
+
+class _MigrationCheckpoint:
+    """
+    A JSON manifest of the progress of copying tables, for resuming an interrupted migration.
+
+    For each table, it records the status (``'in_progress'`` or ``'done'``), the number of rows
+    copied, and the high-water mark (i.e. the largest value copied so far) of its key column.
+    The file is rewritten (atomically) whenever a batch of rows has been committed.
+    """
+
+    #: Key of the recorded items in the manifest.
+    ENTRIES = 'tables'
+    #: Names of the recorded values that are stored with their types.
+    TYPED_VALUES = ('watermark',)
+
+    def __init__(self, path_to_file):
+        """
+        :param path_to_file: Path to the manifest file, which is created if it does not exist.
+        :type path_to_file: str | os.PathLike
+        """
+
+        self.path_to_file = pathlib.Path(path_to_file)
+        self._lock = threading.Lock()
+
+        if self.path_to_file.is_file():
+            with open(self.path_to_file, mode='r', encoding='utf-8') as f:
+                self.info = json.load(f)
+        else:
+            self.info = {}
+        self._tables = self.info.pop(self.ENTRIES, {})
+
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, (bytes, bytearray)):  # e.g. 'rowversion'
+            return {'type': 'bytes', 'value': bytes(value).hex()}
+        elif isinstance(value, datetime.datetime):
+            return {'type': 'datetime', 'value': value.isoformat()}
+        elif isinstance(value, datetime.date):
+            return {'type': 'date', 'value': value.isoformat()}
+        elif isinstance(value, decimal.Decimal):
+            return {'type': 'decimal', 'value': str(value)}
+        else:
+            return {'type': type(value).__name__, 'value': value}
+
+    @staticmethod
+    def _decode(value):
+        decoders = {
+            'bytes': bytes.fromhex,
+            'datetime': datetime.datetime.fromisoformat,
+            'date': datetime.date.fromisoformat,
+            'decimal': decimal.Decimal,
+        }
+        return decoders.get(value['type'], lambda x: x)(value['value'])
+
+    def get(self, table_name):
+        """
+        Gets the recorded progress of a table.
+
+        :param table_name: Name of the table.
+        :type table_name: str
+        :return: Progress of the table, with the watermark decoded, or ``None`` if not recorded.
+        :rtype: dict | None
+        """
+
+        with self._lock:
+            state = copy.deepcopy(self._tables.get(table_name))
+
+        for k in self.TYPED_VALUES:
+            if state and state.get(k) is not None:
+                state[k] = self._decode(state[k])
+
+        return state
+
+    def update(self, table_name, **kwargs):
+        """
+        Updates the progress of a table and saves the manifest.
+
+        :param table_name: Name of the table.
+        :type table_name: str
+        :param kwargs: Items to be recorded, e.g. ``status``, ``key_column``, ``watermark``
+            and ``row_count``.
+        """
+
+        for k in self.TYPED_VALUES:
+            if kwargs.get(k) is not None:
+                kwargs[k] = self._encode(kwargs[k])
+
+        with self._lock:
+            state = self._tables.setdefault(table_name, {})
+            state.update(kwargs, updated=datetime.datetime.now().isoformat(timespec='seconds'))
+            self._save()
+
+    def _save(self):
+        self.path_to_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path_to_file.with_suffix(self.path_to_file.suffix + '.tmp')
+        with open(temp_path, mode='w', encoding='utf-8') as f:
+            json.dump({**self.info, self.ENTRIES: self._tables}, f, indent=4)
+        os.replace(temp_path, self.path_to_file)
+
+
+def _mssql_postgres_copy_table(mssql, postgres, mssql_table_name, mssql_schema_name,
+                               postgres_schema_name, batch_size=10000, queue_size=8,
+                               checkpoint=None, key_column=None, resume_from=None):
+    """
+    Copies a table from MSSQL to PostgreSQL through a producer/consumer pipeline.
+
+    A producer thread fetches rows from MSSQL with ``cursor.fetchmany(batch_size)`` and puts the
+    batches into a queue of at most ``queue_size`` batches, while the calling thread streams them
+    into PostgreSQL via ``COPY``. Unless resuming, the first batch is imported with
+    :meth:`~pyhelpers.dbms.PostgreSQL.import_data` to (re)create the table.
+
+    With a ``checkpoint`` and a ``key_column``, rows are fetched in the order of the key and
+    each batch is committed separately, after which its last key is recorded as the watermark;
+    ``resume_from`` (a watermark) restricts the copy to the rows with greater keys,
+    which are appended to the existing table. As a batch may have been committed without its
+    watermark being recorded (e.g. if the process was killed in between), any rows in the
+    existing table with keys greater than ``resume_from`` are deleted before resuming.
+
+    :return: Number of rows copied.
+    :rtype: int
+    """
+
+    conditions, params = None, ()
+    if checkpoint is not None and key_column is not None:
+        conditions = f'ORDER BY [{key_column}]'
+        if resume_from is not None:
+            conditions = f'WHERE [{key_column}] > ? ' + conditions
+            params = (resume_from,)
+
+    column_names, sql_query = mssql._read_table_query(
+        table_name=mssql_table_name, schema_name=mssql_schema_name, conditions=conditions)
+
+    batches = queue.Queue(maxsize=queue_size)
+    stopped = threading.Event()
+    parent_span = _current_span()
+
+    def _put(item):
+        while not stopped.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce():
+        try:
+            with postgres._span('fetch', parent=parent_span) as span:
+                connection = mssql.engine.raw_connection()
+                try:
+                    cursor = connection.cursor()
+                    cursor.execute(sql_query, params) if params else cursor.execute(sql_query)
+                    while rows := cursor.fetchmany(batch_size):
+                        span.add(rows=len(rows))
+                        if not _put(rows):
+                            break
+                    cursor.close()
+                finally:
+                    connection.close()
+        except Exception as e:
+            _put(e)
+        else:
+            _put(None)
+
+    def _iter_batches():
+        while (item := batches.get()) is not None:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    # The same conversion as in _get_col_type() for the rows streamed via COPY
+    _, hierarchyid_cols = mssql._has_dtypes(
+        mssql_table_name, dtypes='hierarchyid', schema_name=mssql_schema_name)
+    hierarchyid_idx = [column_names.index(x) for x in hierarchyid_cols if x in column_names]
+
+    def _convert(rows):
+        for row in rows:
+            if hierarchyid_idx:
+                row = list(row)
+                for j in hierarchyid_idx:
+                    if row[j] is not None:
+                        row[j] = row[j].replace('\\', '\\\\')
+            yield row
+
+    key_idx = column_names.index(key_column) if conditions else None
+
+    if checkpoint is None or resume_from is None:
+        base_count = 0
+    else:
+        base_count = (checkpoint.get(mssql_table_name) or {}).get('row_count', 0)
+
+    def _record(row_count, status='in_progress'):
+        if checkpoint is not None:
+            checkpoint.update(
+                mssql_table_name, status=status, key_column=key_column, watermark=resume_from,
+                row_count=base_count + row_count)
+
+    if resume_from is not None:
+        # Remove the rows of any batch that was committed after the watermark was last recorded
+        postgresql_tbl = postgres._table_name(
+            table_name=mssql_table_name, schema_name=postgres_schema_name)
+        with postgres.engine.begin() as connection:
+            connection.execute(
+                sqlalchemy.text(f'DELETE FROM {postgresql_tbl} WHERE "{key_column}" > :watermark;'),
+                {'watermark': resume_from})
+
+    producer = threading.Thread(target=_produce)
+    producer.start()
+
+    row_count = 0
+    try:
+        batch_iter = _iter_batches()
+
+        if resume_from is None:
+            first_batch = next(batch_iter, [])
+            source_data = pd.DataFrame.from_records(
+                [tuple(row) for row in first_batch], columns=column_names)
+            source_data_, col_type = _get_col_type(mssql, mssql_table_name, source_data)
+
+            postgres.import_data(
+                source_data_, table_name=mssql_table_name, schema_name=postgres_schema_name,
+                if_exists='replace', method='copy_stream', dtype=col_type,
+                confirmation_required=False, verbose=False)
+            row_count = len(source_data_)
+
+            if key_idx is not None and first_batch:
+                resume_from = first_batch[-1][key_idx]
+            _record(row_count)
+
+        if key_idx is None:
+            rows_ = (row for rows in batch_iter for row in _convert(rows))
+            row_count += postgres._copy_rows(
+                rows_, table_name=mssql_table_name, column_names=column_names,
+                schema_name=postgres_schema_name, batch_size=batch_size)
+
+        else:  # Commit and record the progress batch by batch
+            for rows in batch_iter:
+                row_count += postgres._copy_rows(
+                    _convert(rows), table_name=mssql_table_name, column_names=column_names,
+                    schema_name=postgres_schema_name, batch_size=batch_size)
+                resume_from = rows[-1][key_idx]
+                _record(row_count)
+
+    finally:
+        stopped.set()
+        producer.join()
+
+    _add_primary_keys(mssql, postgres, mssql_table_name, postgres_schema_name)
+
+    _record(row_count, status='done')
+
+    return row_count
+
+
+def _mssql_to_postgresql_pipelined(mssql, postgres, mssql_table_names, mssql_schema_name,
+                                   postgres_schema_name, chunk_size=None, update=False,
+                                   n_workers=1, queue_size=8, checkpoint=None, incremental=False,
+                                   watermark_columns=None, verbose=True):
+    """
+    Copies tables from MSSQL to PostgreSQL concurrently, each through a streaming pipeline.
+
+    :return: Error messages of the tables that failed to be copied.
+    :rtype: dict
+    """
+
+    table_total = len(mssql_table_names)
+    batch_size = chunk_size or 10000
+
+    if checkpoint is not None and not isinstance(checkpoint, _MigrationCheckpoint):
+        checkpoint = _MigrationCheckpoint(checkpoint)
+
+    tasks = {}
+    for i, mssql_table_name in enumerate(mssql_table_names, start=1):
+        postgres_table_exists = postgres.table_exists(
+            table_name=mssql_table_name, schema_name=postgres_schema_name)
+
+        postgresql_tbl = postgres._table_name(
+            table_name=mssql_table_name, schema_name=postgres_schema_name)
+
+        key_column, resume_from, msg, state = None, None, None, {}
+        if checkpoint is not None:
+            key_column = (watermark_columns or {}).get(mssql_table_name)
+            if key_column is None:
+                primary_keys = mssql.get_primary_keys(mssql_table_name, table_type='TABLE')
+                key_column = primary_keys[0] if primary_keys and len(primary_keys) == 1 else None
+
+            state = checkpoint.get(mssql_table_name) or {}
+            if (postgres_table_exists and key_column is not None and
+                    state.get('key_column') == key_column and
+                    state.get('watermark') is not None):
+                if state.get('status') == 'in_progress':
+                    resume_from, msg = state['watermark'], f"Resuming {postgresql_tbl}"
+                elif state.get('status') == 'done' and incremental:
+                    resume_from, msg = state['watermark'], f"Updating {postgresql_tbl} (delta)"
+
+        redo = update or incremental or state.get('status') == 'in_progress'
+        if msg is None and (not postgres_table_exists or redo):
+            if postgres_table_exists:
+                msg = f"Updating {postgresql_tbl}"
+            else:
+                mssql_tbl = mssql._table_name(
+                    table_name=mssql_table_name, schema_name=mssql_schema_name)
+                msg = f"Copying {mssql_tbl} to {postgresql_tbl}"
+
+        if msg is not None:
+            tasks[mssql_table_name] = (f"\t({i}/{table_total}) {msg}", key_column, resume_from)
+        elif verbose:
+            print(f"\t({i}/{table_total}) {postgresql_tbl} already exists.")
+
+    def _copy_table(mssql_table_name):
+        _, key_column_, resume_from_ = tasks[mssql_table_name]
+        start_time = time.perf_counter()
+        with postgres._span('mssql_to_postgresql', table_name=mssql_table_name) as span:
+            row_count = _mssql_postgres_copy_table(
+                mssql=mssql, postgres=postgres, mssql_table_name=mssql_table_name,
+                mssql_schema_name=mssql_schema_name, postgres_schema_name=postgres_schema_name,
+                batch_size=batch_size, queue_size=queue_size, checkpoint=checkpoint,
+                key_column=key_column_, resume_from=resume_from_)
+            span.add(rows=row_count)
+        return row_count, time.perf_counter() - start_time
+
+    error_log = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=n_workers) as executor:
+        futures = {executor.submit(_copy_table, x): x for x in tasks}
+
+        for future in concurrent.futures.as_completed(futures):
+            mssql_table_name = futures[future]
+            try:
+                row_count, elapsed_time = future.result()
+                if verbose:
+                    rate = row_count / elapsed_time if elapsed_time > 0 else float('inf')
+                    print(f"{tasks[mssql_table_name][0]} ... Done. "
+                          f"({row_count:,} rows, {rate:,.0f} rows/s)")
+
+            except Exception as e:
+                if verbose:
+                    print(f"{tasks[mssql_table_name][0]} ... Failed.")
+                error_log.update({mssql_table_name: f"{e}"})
+
+    return error_log
 
 
 def mssql_to_postgresql(mssql, postgres, mssql_schema=None, postgres_schema=None, chunk_size=None,
                         excluded_tables=None, file_tables=False, memory_threshold=2., update=False,
-                        confirmation_required=True, verbose=True):
+                        n_workers=None, queue_size=8, checkpoint=None, incremental=False,
+                        watermark_columns=None, confirmation_required=True, verbose=True):
     """
     Copies tables of a database from a Microsoft SQL server to a PostgreSQL server.
 
+    The phases of copying each table (e.g. reading from MSSQL and ``COPY`` into PostgreSQL) are
+    timed as spans passed to the instrumentation hooks of ``postgres``
+    (see :meth:`~pyhelpers.dbms.PostgreSQL.add_instrumentation_hook`).
+
     :param mssql: Name of the Microsoft SQL (source) database.
     :type mssql: pyhelpers.dbms.MSSQL
     :param postgres: Name of the PostgreSQL (destination) database.
@@ -464,7 +825,8 @@ def mssql_to_postgresql(mssql, postgres, mssql_schema=None, postgres_schema=None
     :param postgres_schema: Name of the schema to store the migrated data in the PostgreSQL server.
     :type postgres_schema: str | None
     :param chunk_size: Number of rows in each batch to be read/written at a time;
-        defaults to ``None``.
+        if ``chunk_size=None`` (default), the batches written into PostgreSQL are sized
+        adaptively (see the method :meth:`~pyhelpers.dbms.PostgreSQL.import_data`).
     :type chunk_size: int | None
     :param excluded_tables: Names of tables excluded from data migration.
     :type excluded_tables: list | None
@@ -475,6 +837,30 @@ def mssql_to_postgresql(mssql, postgres, mssql_schema=None, postgres_schema=None
     :type memory_threshold: float | int
     :param update: Whether to redo the transfer between database servers; defaults to ``False``.
     :type update: bool
+    :param n_workers: Number of tables copied concurrently; when specified, each table is streamed
+        from MSSQL (fetched in batches of ``chunk_size`` rows, or ``10000`` by default)
+        through a bounded queue into PostgreSQL ``COPY``, rather than read as a whole
+        (and ``memory_threshold`` is not used); defaults to ``None``.
+    :type n_workers: int | None
+    :param queue_size: Maximum number of batches held in the queue of each table when
+        ``n_workers`` is specified, which bounds the memory usage; defaults to ``8``.
+    :type queue_size: int
+    :param checkpoint: Path to a JSON manifest that records the progress of each table
+        (which implies ``n_workers=1`` if ``n_workers=None``); defaults to ``None``.
+        For a table with a key column (see ``watermark_columns``), rows are copied in the order
+        of the key and the manifest records the last key committed, so that a rerun resumes
+        an unfinished table from where it stopped, instead of starting over.
+    :type checkpoint: str | os.PathLike | None
+    :param incremental: Whether to copy, for each table that has been completed according to
+        ``checkpoint``, only the rows whose keys exceed the recorded watermark
+        (the rows are appended); defaults to ``False``.
+    :type incremental: bool
+    :param watermark_columns: Key column for each table, e.g. ``{'table_name': 'id'}``,
+        which must be ever-increasing for new rows; a column of the type ``rowversion`` suits
+        tables that are only inserted into, since updated rows would be appended again.
+        For the other tables, the primary key is used if it is a single column;
+        defaults to ``None``.
+    :type watermark_columns: dict | None
     :param confirmation_required: Whether to request confirmation before proceeding;
         defaults to ``True``.
     :type confirmation_required: bool
@@ -535,6 +921,20 @@ def mssql_to_postgresql(mssql, postgres, mssql_schema=None, postgres_schema=None
         Completed.
         >>> postgres_testdb.get_table_names()
         {'public': ['example_df']}
+        >>> # Copy the tables again, streaming up to four tables at a time
+        >>> mssql_to_postgresql(mssql_testdb, postgres_testdb, update=True, n_workers=4)
+        To copy tables from [testdb] (MSSQL) to "testdb" (PostgreSQL)
+        ? [No]|Yes: yes
+        Processing tables ...
+            (1/1) Updating "public"."example_df" ... Done. (4 rows, 151 rows/s)
+        Completed.
+        >>> # Record the progress in a manifest, so that an interrupted run can be resumed
+        >>> # (and, with incremental=True, later runs only copy new rows)
+        >>> mssql_to_postgresql(mssql_testdb, postgres_testdb, update=True,
+        ...                     checkpoint='migration.json', confirmation_required=False)
+        Copying tables from [testdb] (MSSQL) to "testdb" (PostgreSQL) ...
+            (1/1) Updating "public"."example_df" ... Done. (4 rows, 138 rows/s)
+        Completed.
 
     .. figure:: ../_images/dbms-mssql_to_postgresql-demo-2.*
         :name: dbms-mssql_to_postgresql-demo-2
@@ -584,6 +984,22 @@ def mssql_to_postgresql(mssql, postgres, mssql_schema=None, postgres_schema=None
 
     mssql_table_names = [x for x in mssql_table_names if x not in excl_tbl_names]
 
+    if n_workers is not None or checkpoint is not None:
+        error_log = _mssql_to_postgresql_pipelined(
+            mssql=mssql, postgres=postgres, mssql_table_names=mssql_table_names,
+            mssql_schema_name=mssql_schema_name, postgres_schema_name=postgres_schema_name,
+            chunk_size=chunk_size, update=update, n_workers=n_workers or 1, queue_size=queue_size,
+            checkpoint=checkpoint, incremental=incremental, watermark_columns=watermark_columns,
+            verbose=verbose)
+
+        if bool(error_log):
+            return error_log
+        else:
+            if verbose:
+                print("Completed.")
+
+        return None
+
     table_counter, table_total = 1, len(mssql_table_names)
     error_log = {}
     for mssql_table_name in mssql_table_names:
@@ -605,17 +1021,26 @@ def mssql_to_postgresql(mssql, postgres, mssql_schema=None, postgres_schema=None
                         msg = f"Copying {mssql_tbl} to {postgresql_tbl}"
                     print(f'\t{counter_msg} ' + msg, end=" ... ")
 
-                chunk_size_ = _get_chunk_size(mssql, mssql_table_name, chunk_size=chunk_size)
-
-                source_data = mssql.read_table(
-                    table_name=mssql_table_name, chunk_size=chunk_size_)
-
-                source_data_, col_type = _get_col_type(mssql, mssql_table_name, source_data)
-
-                _mssql_postgres_import_data(
-                    mssql=mssql, postgres=postgres, source_data=source_data_,
-                    postgres_schema_name=postgres_schema_name, mssql_table_name=mssql_table_name,
-                    memory_threshold=memory_threshold, chunk_size=chunk_size_, dtype=col_type)
+                with postgres._span('mssql_to_postgresql', table_name=mssql_table_name) as span:
+                    with postgres._span('catalog_check'):
+                        chunk_size_ = _get_chunk_size(
+                            mssql, mssql_table_name, chunk_size=chunk_size)
+
+                    with postgres._span('read_table') as span_:
+                        source_data = mssql.read_table(
+                            table_name=mssql_table_name, chunk_size=chunk_size_)
+                        span_.add(rows=len(source_data))
+
+                    with postgres._span('convert'):
+                        source_data_, col_type = _get_col_type(
+                            mssql, mssql_table_name, source_data)
+
+                    _mssql_postgres_import_data(
+                        mssql=mssql, postgres=postgres, source_data=source_data_,
+                        postgres_schema_name=postgres_schema_name,
+                        mssql_table_name=mssql_table_name, memory_threshold=memory_threshold,
+                        chunk_size=chunk_size or 'adaptive', dtype=col_type)
+                    span.add(rows=len(source_data_))
 
                 if verbose:
                     print("Done.")
@@ -4,6 +4,7 @@ Performing operations on file-like objects.
 These operations include saving and loading data, as well as other relevant tasks.
 """
 
+from .caching import *
 from .converters import *
 from .loaders import *
 from .savers import *
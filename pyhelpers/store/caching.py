@@ -0,0 +1,291 @@
+"""
+Caching the results of functions to files on disk.
+"""
+
+import contextlib
+import functools
+import glob
+import hashlib
+import inspect
+import logging
+import os
+import pathlib
+import pickle  # nosec
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .loaders import load_data
+from .savers import save_data
+from ..ops.computation import parse_size
+
+_CACHE_FORMATS = {
+    'pickle': ".pkl",
+    'parquet': ".parquet",
+    'feather': ".feather",
+    'joblib': ".joblib",
+}
+
+
+def _update_hash(hasher, obj):
+    """
+    Feed an object into a hash object, hashing dataframes and arrays by their underlying data.
+
+    :param hasher: Hash object, e.g. one returned by `hashlib.blake2b()`_.
+    :type hasher: typing.Any
+    :param obj: Object to be hashed.
+    :type obj: typing.Any
+    :raises TypeError: If ``obj`` can neither be hashed by its data nor be pickled.
+
+    .. _`hashlib.blake2b()`: https://docs.python.org/3/library/hashlib.html#hashlib.blake2b
+    """
+
+    hasher.update(f"<{type(obj).__module__}.{type(obj).__qualname__}>".encode())
+
+    if obj is None or isinstance(obj, (bool, int, float, complex, str)):
+        hasher.update(repr(obj).encode())
+
+    elif isinstance(obj, bytes):
+        hasher.update(obj)
+
+    elif isinstance(obj, np.ndarray) and not obj.dtype.hasobject:
+        hasher.update(f"{obj.dtype.str}{obj.shape}".encode())
+        hasher.update(np.ascontiguousarray(obj).data)
+
+    elif isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        if isinstance(obj, pd.DataFrame):
+            _update_hash(hasher, obj.columns)
+            hasher.update(repr(obj.dtypes.to_list()).encode())
+        else:
+            hasher.update(f"{obj.name!r}{obj.dtype}".encode())
+        try:
+            hasher.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().data)
+        except TypeError:  # e.g. Cells holding lists or dicts
+            _update_hash(hasher, pickle.dumps(obj, protocol=5))
+
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(f"{len(obj)}".encode())
+        for x in obj:
+            _update_hash(hasher, x)
+
+    elif isinstance(obj, dict):
+        hasher.update(f"{len(obj)}".encode())
+        for k, v in sorted(obj.items(), key=lambda kv: repr(kv[0])):
+            _update_hash(hasher, k)
+            _update_hash(hasher, v)
+
+    elif isinstance(obj, (set, frozenset)):
+        _update_hash(hasher, sorted(obj, key=repr))
+
+    else:
+        try:
+            hasher.update(pickle.dumps(obj, protocol=5))
+        except Exception as e:
+            raise TypeError(
+                f"Unable to hash an argument of type '{type(obj).__name__}' for caching.") from e
+
+
+def _evict_lru_files(cache_dir, max_size, keep=None):
+    """
+    Delete the least recently used files in a directory until their total size is within a limit.
+
+    :param cache_dir: Pathname of the cache directory.
+    :type cache_dir: str | os.PathLike
+    :param max_size: Maximum total size (in bytes) of the files in the directory.
+    :type max_size: int
+    :param keep: Pathname of a file that must not be deleted; defaults to ``None``.
+    :type keep: str | os.PathLike | None
+    :return: Pathnames of the deleted files.
+    :rtype: list
+    """
+
+    entries = []
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            # Skip files that are still being written by another call
+            if entry.is_file() and ".tmp-" not in entry.name:
+                with contextlib.suppress(FileNotFoundError):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total_size = sum(size for _, size, _ in entries)
+    keep = os.path.abspath(keep) if keep else None
+
+    evicted = []
+    for _, size, path in sorted(entries):
+        if total_size <= max_size:
+            break
+        if keep and os.path.abspath(path) == keep:
+            continue
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+            evicted.append(path)
+        total_size -= size
+
+    return evicted
+
+
+def cached_to_disk(func=None, cache_dir=None, fmt='pickle', max_size='1 GiB', ignore=None,
+                   verbose=False):
+    """
+    Decorator that caches the results of a function to files on disk.
+
+    A call is identified by a hash of the function (its name and bytecode) and of its bound
+    arguments, with dataframes and arrays hashed by their underlying data. On a cache hit, the
+    result is reloaded by :func:`~pyhelpers.store.load_data` instead of being computed; otherwise,
+    it is computed and saved by :func:`~pyhelpers.store.save_data`. Once the total size of the
+    cache directory exceeds ``max_size``, the least recently used files are deleted.
+
+    :param func: Function to be decorated; when the decorator is used with arguments,
+        e.g. ``@cached_to_disk(fmt='parquet')``, this is ``None`` (default).
+    :type func: typing.Callable | None
+    :param cache_dir: Directory where the results are saved;
+        when ``cache_dir=None`` (default), it is ``".pyhelpers_cache"`` in the current working
+        directory. The directory should be dedicated to the cache.
+    :type cache_dir: str | os.PathLike | None
+    :param fmt: Format of the cache files; options include ``'pickle'`` (default),
+        ``'parquet'``, ``'feather'`` and ``'joblib'``, or a file extension such as
+        ``".pkl.zst"``. Results that cannot be saved losslessly as ``'parquet'`` or ``'feather'``
+        (e.g. other than dataframes) are pickled instead.
+    :type fmt: str
+    :param max_size: Maximum total size of the cache directory, in bytes or in a human-readable
+        form (see :func:`~pyhelpers.ops.parse_size`); defaults to ``'1 GiB'``.
+        When ``max_size=None``, no files are evicted.
+    :type max_size: int | str | None
+    :param ignore: Names of the arguments that do not affect the result (e.g. ``'verbose'``)
+        and are excluded from the hash; defaults to ``None``.
+    :type ignore: str | list | tuple | None
+    :param verbose: Whether to print relevant information to the console; defaults to ``False``.
+    :type verbose: bool | int
+    :return: The decorated function, which has a ``cache_clear()`` method deleting the cached
+        results of the function and a ``cache_dir`` attribute giving the cache directory.
+    :rtype: typing.Callable
+
+    **Examples**::
+
+        >>> from pyhelpers.store import cached_to_disk
+        >>> from pyhelpers._cache import example_dataframe
+        >>> import tempfile
+        >>> cache_dir = tempfile.mkdtemp()
+        >>> @cached_to_disk(cache_dir=cache_dir, fmt='parquet', max_size='100 MiB')
+        ... def add_distance(df):
+        ...     print("Computing ...")
+        ...     return df.assign(Distance=(df['Longitude'] ** 2 + df['Latitude'] ** 2) ** 0.5)
+        >>> dat = example_dataframe(osgb36=False)
+        >>> add_distance(dat)
+        Computing ...
+                    Longitude   Latitude   Distance
+        City
+        London      -0.127647  51.507322  51.507480
+        Birmingham  -1.902691  52.479699  52.514180
+        Manchester  -2.245115  53.479489  53.526594
+        Leeds       -1.543794  53.797418  53.819565
+        >>> add_distance(dat)  # Loaded from the cache
+                    Longitude   Latitude   Distance
+        City
+        London      -0.127647  51.507322  51.507480
+        Birmingham  -1.902691  52.479699  52.514180
+        Manchester  -2.245115  53.479489  53.526594
+        Leeds       -1.543794  53.797418  53.819565
+        >>> add_distance.cache_clear()
+
+    .. note::
+
+        - The cache is keyed on the function's bytecode, so editing the function invalidates
+          its cached results; changes in functions it calls are not detected.
+        - With a file extension as ``fmt``, the results must round-trip through
+          :func:`~pyhelpers.store.save_data` and :func:`~pyhelpers.store.load_data`.
+        - Cache files are loaded with :func:`~pyhelpers.store.load_pickle` or the like, so the
+          cache directory must only be writable by trusted users.
+    """
+
+    if func is None:
+        return functools.partial(
+            cached_to_disk, cache_dir=cache_dir, fmt=fmt, max_size=max_size, ignore=ignore,
+            verbose=verbose)
+
+    file_ext = _CACHE_FORMATS.get(fmt, fmt)
+    if not file_ext.startswith("."):
+        raise ValueError(f"`fmt` must be one of {set(_CACHE_FORMATS)} or a file extension.")
+
+    if isinstance(max_size, str):
+        max_size = parse_size(max_size)
+    ignore = {ignore} if isinstance(ignore, str) else set(ignore or [])
+
+    cache_dir = pathlib.Path(cache_dir or pathlib.Path.cwd() / ".pyhelpers_cache")
+    sig = inspect.signature(func)
+    func_name = re.sub(r'[^\w.-]', '_', f"{func.__module__}.{func.__qualname__}")
+    func_code = getattr(func, '__code__', None)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound_args = sig.bind(*args, **kwargs)
+        bound_args.apply_defaults()
+        arguments = {k: v for k, v in bound_args.arguments.items() if k not in ignore}
+
+        hasher = hashlib.blake2b(digest_size=16)
+        _update_hash(hasher, func_name)
+        if func_code is not None:
+            _update_hash(hasher, (func_code.co_code, repr(func_code.co_consts)))
+        _update_hash(hasher, arguments)
+        cache_stem = f"{func_name}-{hasher.hexdigest()}"
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Look for a cached result saved in the chosen format or pickled as a fallback
+        for ext in dict.fromkeys([file_ext, ".pkl"]):
+            path_to_file = cache_dir / f"{cache_stem}{ext}"
+            if path_to_file.is_file():
+                try:
+                    result = load_data(path_to_file, verbose=verbose, raise_error=True)
+                except Exception as e:
+                    logging.getLogger(__name__).warning(
+                        'Failed to load the cached result "%s": %s', path_to_file, e)
+                    continue
+                with contextlib.suppress(FileNotFoundError):
+                    os.utime(path_to_file)  # Mark it as recently used
+                return result
+
+        result = func(*args, **kwargs)
+
+        ext, save_kwargs = file_ext, {}
+        if fmt in {'parquet', 'feather'}:
+            if not isinstance(result, pd.DataFrame):
+                ext = ".pkl"
+            elif fmt == 'feather':
+                # Feather files do not keep an index
+                if result.index.equals(pd.RangeIndex(len(result))) and result.index.name is None:
+                    save_kwargs = {'index': False}
+                else:
+                    ext = ".pkl"
+        path_to_file = cache_dir / f"{cache_stem}{ext}"
+        temp_file = cache_dir / f"{cache_stem}.tmp-{os.getpid()}-{threading.get_ident()}{ext}"
+
+        try:
+            save_data(result, temp_file, verbose=verbose, raise_error=True, **save_kwargs)
+            os.replace(temp_file, path_to_file)
+        except Exception as e:
+            logging.getLogger(__name__).warning(
+                'Failed to cache the result of %s(): %s', func.__qualname__, e)
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temp_file)
+        else:
+            if max_size is not None:
+                _evict_lru_files(cache_dir, max_size=max_size, keep=path_to_file)
+
+        return result
+
+    def cache_clear():
+        """Delete the cached results of the function."""
+
+        if cache_dir.is_dir():
+            for path_to_file in cache_dir.glob(f"{glob.escape(func_name)}-*"):
+                with contextlib.suppress(FileNotFoundError):
+                    path_to_file.unlink()
+
+    wrapper.cache_clear = cache_clear
+    wrapper.cache_dir = cache_dir
+
+    return wrapper
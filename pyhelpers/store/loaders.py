@@ -3,23 +3,30 @@ Utilities for loading data of various formats.
 """
 
 import bz2
+import concurrent.futures
+import contextlib
 import csv
 import functools
+import glob
 import gzip
 import inspect
 import io
+import itertools
 import logging
 import lzma
+import os
 import pathlib
 import pickle  # nosec
+import time
 import warnings
 
 import numpy as np
 import pandas as pd
 import pyproj
 
-from .utils import _check_loading_path, _is_parquet_geospatial, _resolve_json_engine, _set_index, \
-    suppress_gpkg_warnings
+from .utils import _check_loading_path, _is_parquet_geospatial, _load_pickle, _open_pickle_file, \
+    _resolve_json_engine, _set_index, suppress_gpkg_warnings
+from ..dirs import get_file_paths
 from .._cache import _lazy_check_dependencies, _print_failure_message
 
 
@@ -51,6 +58,9 @@ def load_pickle(path_to_file, verbose=False, prt_kwargs=None, raise_error=False,
         - Ensure that ``path_to_file`` comes from a trusted source to avoid deserialization
           vulnerabilities.
         - Example data can be referred to the function :func:`~pyhelpers.store.svr.save_pickle`.
+        - Files compressed with ``.zst`` and ``.lz4`` require the packages
+          `zstandard <https://pypi.org/project/zstandard/>`_ and
+          `lz4 <https://pypi.org/project/lz4/>`_ respectively.
 
     **Examples**::
 
@@ -73,25 +83,13 @@ def load_pickle(path_to_file, verbose=False, prt_kwargs=None, raise_error=False,
     _check_loading_path(path=path_to_file, verbose=verbose, **(prt_kwargs or {}))
 
     try:
-        # Determine the opener based on extension
-        path_str = str(path_to_file).lower()
-
-        if path_str.endswith((".pkl.gz", ".pkl.gzip", ".pickle.gz", ".pickle.gzip")):
-            opener = gzip.open
-        elif path_str.endswith((".pkl.xz", ".pkl.lzma", ".pickle.xz", ".pickle.lzma")):
-            opener = lzma.open
-        elif path_str.endswith((".pkl.bz2", ".pickle.bz2")):
-            opener = bz2.open
-        else:
-            opener = open
-
         # Try standard pickle first. Fall back to pandas.read_pickle.
-        try:
-            with opener(path_to_file, mode='rb') as f:
-                data = pickle.load(f, **kwargs)  # nosec
-        except (ModuleNotFoundError, AttributeError, ImportError, pickle.UnpicklingError):
-            # Fallback to Pandas for complex objects or dependency issues
-            data = pd.read_pickle(path_to_file, **kwargs)  # nosec
+        with _open_pickle_file(path_to_file, mode='rb') as f:
+            try:
+                data = _load_pickle(f, **kwargs)
+            except (ModuleNotFoundError, AttributeError, ImportError, pickle.UnpicklingError):
+                # Fallback to Pandas for complex objects or dependency issues
+                data = pd.read_pickle(path_to_file, **kwargs)  # nosec
 
         if verbose:
             print("Done.")
@@ -102,8 +100,138 @@ def load_pickle(path_to_file, verbose=False, prt_kwargs=None, raise_error=False,
         _print_failure_message(e=e, prefix="Failed.", verbose=verbose, raise_error=raise_error)
 
 
+def _get_opener(path_to_file):
+    """
+    Get the function for opening a file, which is decompressed by its extension if need be.
+
+    :param path_to_file: Pathname of the file.
+    :type path_to_file: str | os.PathLike
+    :return: One of `gzip.open()`_, `bz2.open()`_, `lzma.open()`_ and `open()`_.
+    :rtype: typing.Callable
+
+    .. _`gzip.open()`: https://docs.python.org/3/library/gzip.html#gzip.open
+    .. _`bz2.open()`: https://docs.python.org/3/library/bz2.html#bz2.open
+    .. _`lzma.open()`: https://docs.python.org/3/library/lzma.html#lzma.open
+    .. _`open()`: https://docs.python.org/3/library/functions.html#open
+    """
+
+    openers = {'gzip': gzip.open, 'xz': lzma.open, 'bz2': bz2.open}
+
+    return openers.get(_get_compression(path_to_file), open)
+
+
+def _get_compression(path_to_file):
+    """
+    Get the compression of a file by its extension, as named by `pandas.read_csv()`_.
+
+    Unlike the inference by `pandas.read_csv()`_, this also recognises the extensions
+    ``".gzip"`` and ``".lzma"``.
+
+    :param path_to_file: Pathname of the file.
+    :type path_to_file: str | os.PathLike
+    :return: One of ``'gzip'``, ``'xz'`` and ``'bz2'``, or ``None`` if the file is not compressed.
+    :rtype: str | None
+
+    .. _`pandas.read_csv()`: https://pandas.pydata.org/docs/reference/api/pandas.read_csv.html
+    """
+
+    path_str = str(path_to_file).lower()
+
+    if path_str.endswith((".gz", ".gzip")):
+        return 'gzip'
+    if path_str.endswith((".xz", ".lzma")):
+        return 'xz'
+    if path_str.endswith(".bz2"):
+        return 'bz2'
+    return None
+
+
+def _iter_csv_rows(path_to_file, delimiter=',', header=0, index_col=None, encoding='utf-8',
+                   chunksize=100000, **kwargs):
+    """
+    Parse a `CSV`_ file via `csv.reader()`_ into dataframes of at most ``chunksize`` rows.
+
+    At least one (possibly empty) dataframe is yielded. All values are read as strings.
+
+    .. _`CSV`: https://en.wikipedia.org/wiki/Comma-separated_values
+    .. _`csv.reader()`: https://docs.python.org/3/library/csv.html#csv.reader
+    """
+
+    if isinstance(path_to_file, io.StringIO):
+        path_to_file.seek(0)  # Reset the buffer cursor before rereading
+        csv_file = contextlib.nullcontext(path_to_file)
+    else:
+        opener = _get_opener(path_to_file)
+        csv_file = opener(path_to_file, mode='rt', encoding=encoding, newline='')
+
+    with csv_file as f:
+        csv_rows = csv.reader(f, delimiter=delimiter, **kwargs)
+
+        if header is None:
+            col_names = None
+        else:
+            col_names = next(itertools.islice(csv_rows, header, None), [])
+
+        start = 0
+        while True:
+            rows = list(itertools.islice(csv_rows, chunksize))
+            if start > 0 and not rows:
+                return
+
+            index = pd.RangeIndex(start, start + len(rows))
+            data = pd.DataFrame(data=rows, columns=col_names, index=index)
+            if len(data.columns) > 0:
+                data = _set_index(data, index_col=index_col)
+            yield data
+
+            if len(rows) < chunksize:
+                return
+            start += len(rows)
+
+
+def _iter_csv_chunks(path_to_file, delimiter, header, index_col, encoding, chunksize,
+                     compression='infer', **kwargs):
+    """
+    Parse a `CSV`_ file into dataframes of at most ``chunksize`` rows.
+
+    `pandas.read_csv()`_ is used unless it fails to parse the first chunk, in which case the file
+    is parsed via `csv.reader()`_ instead (see :func:`~pyhelpers.store.load_csv`).
+    The first chunk is parsed before the generator is returned, so that such errors are
+    raised by this function.
+
+    :return: A generator of dataframes.
+    :rtype: typing.Generator[pandas.DataFrame, None, None]
+
+    .. _`CSV`: https://en.wikipedia.org/wiki/Comma-separated_values
+    .. _`csv.reader()`: https://docs.python.org/3/library/csv.html#csv.reader
+    .. _`pandas.read_csv()`: https://pandas.pydata.org/docs/reference/api/pandas.read_csv.html
+    """
+
+    try:
+        chunks = pd.read_csv(
+            path_to_file, delimiter=delimiter, header=header, index_col=index_col,
+            encoding=encoding, chunksize=chunksize, compression=compression, **kwargs)
+        first_chunk = next(chunks, None)
+
+    except Exception:  # noqa
+        chunks = _iter_csv_rows(
+            path_to_file, delimiter=delimiter, header=header, index_col=index_col,
+            encoding=encoding, chunksize=chunksize, **kwargs)
+        first_chunk = next(chunks)
+
+    def _chunks():
+        try:
+            if first_chunk is not None:
+                yield first_chunk
+            yield from chunks
+        finally:
+            chunks.close()
+
+    return _chunks()
+
+
 def load_csv(path_to_file, delimiter=',', header=0, index_col=None, verbose=False, prt_kwargs=None,
-             raise_error=False, encoding='utf-8', **kwargs):
+             raise_error=False, encoding='utf-8', chunksize=None, iterator=False, **kwargs):
     """
     Load data from a `CSV`_ file.
 
@@ -113,6 +241,11 @@ def load_csv(path_to_file, delimiter=',', header=0, index_col=None, verbose=Fals
     both natively. Which backend is used determines which of ``kwargs`` are accepted, since
     `csv.reader()`_ and `pandas.read_csv()`_ recognize different keyword arguments.
 
+    Files compressed with gzip, bzip2 or xz (e.g. ``".csv.gz"``, ``".csv.bz2"`` or
+    ``".csv.xz"``) are decompressed on the fly by either backend. With ``chunksize`` or
+    ``iterator=True``, the file is streamed as dataframes of a bounded number of rows,
+    so that a file larger than memory can be processed chunk by chunk.
+
     :param path_to_file: Pathname of the `CSV`_ file, or an in-memory file-like object
         (e.g. ``io.StringIO``).
     :type path_to_file: str | os.PathLike | io.StringIO
@@ -135,10 +268,18 @@ def load_csv(path_to_file, delimiter=',', header=0, index_col=None, verbose=Fals
     :type raise_error: bool
     :param encoding: Character encoding used to read ``path_to_file``; defaults to ``'utf-8'``.
     :type encoding: str
+    :param chunksize: Number of rows of each dataframe if the data is to be read in chunks;
+        defaults to ``None``.
+    :type chunksize: int | None
+    :param iterator: Whether to return an iterator of dataframes (of ``chunksize`` rows,
+        or ``100000`` rows if ``chunksize=None``); defaults to ``False``.
+    :type iterator: bool
     :param kwargs: [Optional] Additional parameters for `csv.reader()`_ or `pandas.read_csv()`_,
         depending on which backend is used (see above).
-    :return: Data retrieved from the specified path ``path_to_file``.
-    :rtype: pandas.DataFrame | None
+    :return: Data retrieved from the specified path ``path_to_file``, or an iterator of
+        dataframes (with ``index_col`` applied to each) if ``chunksize`` or ``iterator=True``
+        is specified; errors raised after the first dataframe are not suppressed.
+    :rtype: pandas.DataFrame | typing.Iterator[pandas.DataFrame] | None
 
     .. _`CSV`: https://en.wikipedia.org/wiki/Comma-separated_values
     .. _`csv.reader()`: https://docs.python.org/3/library/csv.html#csv.reader
@@ -183,18 +324,50 @@ def load_csv(path_to_file, delimiter=',', header=0, index_col=None, verbose=Fals
         0  Birmingham  406689   286822
         1  Manchester  383819   398052
         2       Leeds  582044   152953
+
+        >>> csv_pathname = cd("tests", "data", "dat.csv")
+        >>> for csv_chunk in load_csv(csv_pathname, index_col=0, chunksize=2):
+        ...     print(csv_chunk)
+                    Longitude   Latitude
+        City
+        London      -0.127647  51.507322
+        Birmingham  -1.902691  52.479699
+                    Longitude   Latitude
+        City
+        Manchester  -2.245115  53.479489
+        Leeds       -1.543794  53.797418
     """
 
+    compression = kwargs.pop('compression', 'infer')
+
     if isinstance(path_to_file, io.StringIO):
         if verbose:
             print("Loading from in-memory buffer", end=" ... ")
     else:
         _check_loading_path(path_to_file, verbose=verbose, **(prt_kwargs or {}))
+        if compression == 'infer':  # pandas does not infer it from e.g. ".gzip" or ".lzma"
+            compression = _get_compression(path_to_file) or 'infer'
+
+    if chunksize is not None or iterator:
+        try:
+            data = _iter_csv_chunks(
+                path_to_file, delimiter=delimiter, header=header, index_col=index_col,
+                encoding=encoding, chunksize=chunksize or 100000, compression=compression,
+                **kwargs)
+
+            if verbose:
+                print("Done.")
+
+            return data
+
+        except Exception as e:
+            _print_failure_message(e, "Failed.", verbose=verbose, raise_error=raise_error)
+            return None
 
     try:
         data = pd.read_csv(
             path_to_file, delimiter=delimiter, header=header, index_col=index_col,
-            encoding=encoding, **kwargs)
+            encoding=encoding, compression=compression, **kwargs)
 
         if verbose:
             print("Done.")
@@ -203,26 +376,11 @@ def load_csv(path_to_file, delimiter=',', header=0, index_col=None, verbose=Fals
 
     except Exception:  # noqa
         try:  # Fallback attempt: Manual Python iteration
-            # Handle StringIO correctly if pandas failed
-            if isinstance(path_to_file, io.StringIO):
-                path_to_file.seek(0)  # Reset the buffer cursor before rereading
-                csv_data_ = csv.reader(path_to_file, delimiter=delimiter, **kwargs)
-                csv_rows = list(csv_data_)
-            else:
-                with open(path_to_file, mode='r', encoding=encoding) as csv_file:
-                    csv_data_ = csv.reader(csv_file, delimiter=delimiter, **kwargs)
-                    csv_rows = list(csv_data_)
-
-            if header is not None:
-                # noinspection PyUnboundLocalVariable
-                col_names = csv_rows[header]
-                dat = csv_rows[header + 1:]
-                data = pd.DataFrame(data=dat, columns=list(col_names))
-            else:
-                # noinspection PyUnboundLocalVariable
-                data = pd.DataFrame(csv_rows, columns=header)
-
-            data = _set_index(data, index_col=index_col)
+            # Parse the rows in chunks, rather than holding them all as lists of strings
+            chunks = list(_iter_csv_rows(
+                path_to_file, delimiter=delimiter, header=header, index_col=index_col,
+                encoding=encoding, **kwargs))
+            data = pd.concat(chunks) if len(chunks) > 1 else chunks[0]
 
             if verbose:
                 print("Done.")
@@ -513,11 +671,15 @@ def load_joblib(path_to_file, verbose=False, prt_kwargs=None, raise_error=False,
         _print_failure_message(e=e, prefix="Failed.", verbose=verbose, raise_error=raise_error)
 
 
+@_lazy_check_dependencies(pa_feather='pyarrow.feather')
 def load_feather(path_to_file, index_col=None, verbose=False, prt_kwargs=None, raise_error=False,
-                 **kwargs):
+                 columns=None, memory_map=False, as_table=False, **kwargs):
     """
     Load a dataframe from a `Feather`_ file.
 
+    Only the specified ``columns`` are read; with ``memory_map=True``, the file is memory-mapped
+    rather than read into memory, so that only the buffers of those columns are touched.
+
     :param path_to_file: Path where the feather file is saved.
     :type path_to_file: str | os.PathLike
     :param index_col: Index number or name of the column(s) to use as the row labels of the dataframe;
@@ -531,19 +693,33 @@ def load_feather(path_to_file, index_col=None, verbose=False, prt_kwargs=None, r
     :param raise_error: Whether to raise the provided exception;
         if ``raise_error=False`` (default), the error will be suppressed.
     :type raise_error: bool
-    :param kwargs: [Optional] Additional parameters for the function `pandas.read_feather()`_:
+    :param columns: Names of the columns to read (including any to be used as ``index_col``);
+        if ``columns=None`` (default), all columns are read.
+    :type columns: list[str] | None
+    :param memory_map: Whether to memory-map the file; defaults to ``False``.
+    :type memory_map: bool
+    :param as_table: Whether to return the `pyarrow.Table`_ as read, without converting it to
+        a dataframe (in which case ``index_col`` is ignored); defaults to ``False``.
+    :type as_table: bool
+    :param kwargs: [Optional] Additional parameters for the function `pandas.read_feather()`_
+        (or `pyarrow.feather.read_table()`_ if ``memory_map=True`` or ``as_table=True``):
 
-        - ``columns``: Sequence of column names to read. If ``None``, all columns are read.
         - ``use_threads``: Whether to parallelize reading using multiple threads;
           defaults to ``True``.
+        - ``dtype_backend``: ``'pyarrow'`` for a dataframe backed by the Arrow arrays
+          (as ``pandas.ArrowDtype`` columns) rather than NumPy arrays.
 
     :return: Data retrieved from the specified path ``path_to_file``.
-    :rtype: pandas.DataFrame
+    :rtype: pandas.DataFrame | pyarrow.Table
 
     .. _`Feather`:
         https://arrow.apache.org/docs/python/feather.html
     .. _`pandas.read_feather()`:
         https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.read_feather.html
+    .. _`pyarrow.Table`:
+        https://arrow.apache.org/docs/python/generated/pyarrow.Table.html
+    .. _`pyarrow.feather.read_table()`:
+        https://arrow.apache.org/docs/python/generated/pyarrow.feather.read_table.html
 
     .. note::
 
@@ -565,12 +741,31 @@ def load_feather(path_to_file, index_col=None, verbose=False, prt_kwargs=None, r
         Birmingham  -1.902691  52.479699
         Manchester  -2.245115  53.479489
         Leeds       -1.543794  53.797418
+
+        >>> feather_tbl = load_feather(
+        ...     feather_path, columns=['City', 'Latitude'], memory_map=True, as_table=True)
+        >>> feather_tbl.column_names
+        ['City', 'Latitude']
     """
 
     _check_loading_path(path=path_to_file, verbose=verbose, **(prt_kwargs or {}))
 
     try:
-        data = pd.read_feather(path_to_file, **kwargs)
+        if memory_map or as_table:
+            dtype_backend = kwargs.pop('dtype_backend', None)
+            data = pa_feather.read_table(  # noqa
+                path_to_file, columns=columns, memory_map=memory_map, **kwargs)
+
+            if as_table:
+                if verbose:
+                    print("Done.")
+                return data
+
+            data = data.to_pandas(
+                types_mapper=pd.ArrowDtype if dtype_backend == 'pyarrow' else None)
+
+        else:
+            data = pd.read_feather(path_to_file, columns=columns, **kwargs)
 
         data = _set_index(data, index_col=index_col)
 
@@ -634,7 +829,7 @@ def _load_parquet_fallback(path_to_file, pq_module, kwargs):
 
 @_lazy_check_dependencies(pa='pyarrow', pq='pyarrow.parquet', gpd='geopandas')
 def load_parquet(path_to_file, engine=None, verbose=False, prt_kwargs=None, raise_error=False,
-                 **kwargs):
+                 columns=None, filters=None, memory_map=False, as_table=False, **kwargs):
     """
     Load data from a `Parquet`_ file.
 
@@ -642,6 +837,10 @@ def load_parquet(path_to_file, engine=None, verbose=False, prt_kwargs=None, rais
     It uses ``pandas.read_parquet`` or ``geopandas.read_parquet``. If the specified engine is
     invalid or unavailable, it falls back to ``pyarrow.parquet.read_table``.
 
+    Only the column chunks of the specified ``columns`` are read, and the row groups whose
+    statistics rule out the ``filters`` are skipped (i.e. the projection and predicates
+    are pushed down to the reader).
+
     :param path_to_file: Path where the Parquet file is saved.
     :type path_to_file: str | os.PathLike
     :param engine: Parquet library to use; options are ``None`` (default), ``'auto'``,
@@ -655,8 +854,22 @@ def load_parquet(path_to_file, engine=None, verbose=False, prt_kwargs=None, rais
     :param raise_error: Whether to raise exceptions; if ``False`` (default),
         errors are captured and printed via a failure message if ``verbose=True``.
     :type raise_error: bool
+    :param columns: Names of the columns to read; if ``columns=None`` (default),
+        all columns are read.
+    :type columns: list[str] | None
+    :param filters: Predicates on the rows to read, e.g. ``[('Latitude', '>', 52)]``
+        (see `pyarrow.parquet.read_table()`_); defaults to ``None``.
+    :type filters: list[tuple] | list[list[tuple]] | None
+    :param memory_map: Whether to memory-map the file (with PyArrow); defaults to ``False``.
+    :type memory_map: bool
+    :param as_table: Whether to return the ``pyarrow.Table`` as read by
+        `pyarrow.parquet.read_table()`_, without converting it to a dataframe;
+        defaults to ``False``.
+    :type as_table: bool
     :param kwargs: [Optional] Additional parameters for `pandas.read_parquet()`_,
-        `geopandas.read_parquet()`_ or `pyarrow.parquet.read_table()`_.
+        `geopandas.read_parquet()`_ or `pyarrow.parquet.read_table()`_; for example,
+        ``dtype_backend='pyarrow'`` (for `pandas.read_parquet()`_) returns a dataframe
+        backed by the Arrow arrays rather than NumPy arrays.
     :return: Data retrieved from the specified path.
     :rtype: pandas.DataFrame | geopandas.GeoDataFrame | pyarrow.Table
 
@@ -703,6 +916,13 @@ def load_parquet(path_to_file, engine=None, verbose=False, prt_kwargs=None, rais
         Loading "tests/data/dat.parquet" ... Done.
         UserWarning: Primary loader failed (engine must be one of 'pyarrow', 'fastparquet')...
 
+        >>> # Read one column of the rows that match the filters into a pyarrow.Table
+        >>> parquet_tbl = load_parquet(
+        ...     parquet_pathname, columns=['Latitude'], filters=[('Latitude', '>', 52)],
+        ...     as_table=True)
+        >>> parquet_tbl.column('Latitude').to_pylist()
+        [52.4796992, 53.4794892, 53.7974185]
+
     .. seealso::
 
         - Example data can be referred to in the function :func:`~pyhelpers.store.save_parquet`.
@@ -710,7 +930,20 @@ def load_parquet(path_to_file, engine=None, verbose=False, prt_kwargs=None, rais
 
     _check_loading_path(path=path_to_file, verbose=verbose, **(prt_kwargs or {}))
 
+    read_kwargs = {'columns': columns, 'filters': filters}
+    if memory_map:  # Only supported by PyArrow
+        read_kwargs.update({'memory_map': memory_map})
+    kwargs = {**{k: v for k, v in read_kwargs.items() if v is not None}, **kwargs}
+
     try:
+        if as_table:
+            data = pq.read_table(path_to_file, **kwargs)  # noqa
+
+            if verbose:
+                print("Done.")
+
+            return data
+
         is_geospatial = _is_parquet_geospatial(path_to_file, pq)  # noqa
 
         try:
@@ -1058,9 +1291,12 @@ def get_load_func(file_ext):
     """
 
     _mapping = {
-        (".pickle", ".pickle.bz2", ".pickle.gz", ".pickle.gzip", ".pickle.lzma", ".pickle.xz",
-         ".pkl", ".pkl.bz2", ".pkl.gz", ".pkl.gzip", ".pkl.lzma", ".pkl.xz"): load_pickle,
-        (".csv", ".txt"): load_csv,
+        (".pickle", ".pickle.bz2", ".pickle.gz", ".pickle.gzip", ".pickle.lz4", ".pickle.lzma",
+         ".pickle.xz", ".pickle.zst", ".pickle.zstd",
+         ".pkl", ".pkl.bz2", ".pkl.gz", ".pkl.gzip", ".pkl.lz4", ".pkl.lzma", ".pkl.xz", ".pkl.zst",
+         ".pkl.zstd"): load_pickle,
+        (".csv", ".csv.bz2", ".csv.gz", ".csv.gzip", ".csv.lzma", ".csv.xz",
+         ".txt", ".txt.bz2", ".txt.gz", ".txt.gzip", ".txt.lzma", ".txt.xz"): load_csv,
         (".xlsx", ".xls", ".ods"): load_spreadsheets,
         (".json",): load_json,
         (".fea", ".feather"): load_feather,
@@ -1190,3 +1426,181 @@ def load_data(path_to_file, verbose=False, show_warning=True, prt_kwargs=None, r
             file_ext)
 
     return None
+
+
+def _load_file(path_to_file, kwargs):
+    """
+    Load data from a file, for :func:`~pyhelpers.store.load_many`.
+
+    :return: The data (or ``None`` on failure), the number of seconds taken, and the error if any.
+    :rtype: tuple[typing.Any, float, Exception | None]
+    """
+
+    start_time = time.perf_counter()
+
+    try:
+        file_ext = "".join(pathlib.Path(path_to_file).suffixes).lower()
+        load_func = get_load_func(file_ext)
+        if load_func is None:
+            raise ValueError(f'The file format/extension "{file_ext}" is not recognized.')
+
+        data = load_func(path_to_file, verbose=False, raise_error=True, **kwargs)
+        error = None
+
+    except Exception as e:
+        data, error = None, e
+
+    return data, time.perf_counter() - start_time, error
+
+
+def _get_file_paths(paths, incl_subdir=False):
+    """
+    Get the paths of files given by a glob pattern, a directory, or a list of them.
+
+    Files in a directory are included if their extensions are recognized by
+    :func:`~pyhelpers.store.get_load_func`.
+    """
+
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+
+    file_paths = []
+    for path in paths:
+        path = os.fspath(path)
+        if os.path.isdir(path):
+            file_paths += sorted(
+                x for x in get_file_paths(path, incl_subdir=incl_subdir)
+                if get_load_func("".join(pathlib.Path(x).suffixes).lower()))
+        elif glob.has_magic(path):
+            file_paths += sorted(glob.glob(path, recursive=True))
+        else:
+            file_paths.append(path)
+
+    return file_paths
+
+
+def load_many(paths, n_workers=None, backend='thread', concat=False, incl_subdir=False,
+              ret_info=False, verbose=False, raise_error=False, **kwargs):
+    """
+    Load data from multiple files concurrently.
+
+    Each file is loaded by :func:`~pyhelpers.store.load_data`, i.e. by the loader that
+    :func:`~pyhelpers.store.get_load_func` finds for its extension. Files are loaded by a pool of
+    threads, which suits formats whose readers release the GIL (e.g. `Parquet`_ and `Feather`_)
+    or I/O-bound loading, or by a pool of processes, which suits formats parsed in Python
+    (e.g. `Pickle`_ or `CSV`_ via `csv.reader()`_), at the cost of transferring the data
+    between processes.
+
+    :param paths: Pathname(s) of the files, a glob pattern (e.g. ``"data/*.parquet"``, or
+        ``"data/**/*.parquet"`` to include subdirectories), a directory, or a list of them.
+    :type paths: str | os.PathLike | typing.Iterable[str | os.PathLike]
+    :param n_workers: Maximum number of files loaded at a time; defaults to the default of
+        `concurrent.futures.ThreadPoolExecutor`_ or `concurrent.futures.ProcessPoolExecutor`_.
+    :type n_workers: int | None
+    :param backend: Kind of the pool of workers, ``'thread'`` (default) or ``'process'``.
+    :type backend: str
+    :param concat: Whether to concatenate the loaded dataframes into one; columns are aligned
+        by name, and those missing from a file are filled with missing values;
+        defaults to ``False``.
+    :type concat: bool
+    :param incl_subdir: Whether to include the files in the subdirectories of a directory;
+        defaults to ``False``.
+    :type incl_subdir: bool
+    :param ret_info: Whether to also return the information on loading each file;
+        defaults to ``False``.
+    :type ret_info: bool
+    :param verbose: Whether to print relevant information to the console as each file is loaded;
+        defaults to ``False``.
+    :type verbose: bool | int
+    :param raise_error: Whether to raise the first error (if any) after all files are loaded;
+        if ``raise_error=False`` (default), the files that fail to load are left out
+        (see ``ret_info``).
+    :type raise_error: bool
+    :param kwargs: [Optional] Additional parameters for the loader of each file,
+        e.g. ``columns`` for :func:`~pyhelpers.store.load_parquet`.
+    :return: Data loaded from the files keyed by their pathnames (in the order of the files),
+        or the concatenated dataframe if ``concat=True``; and, if ``ret_info=True``, a dataframe
+        of the ``elapsed_time`` (in seconds) and the ``error`` (if any) of each file.
+    :rtype: dict | pandas.DataFrame | tuple
+
+    .. _`Parquet`: https://arrow.apache.org/docs/python/parquet.html
+    .. _`Feather`: https://arrow.apache.org/docs/python/feather.html
+    .. _`Pickle`: https://docs.python.org/3/library/pickle.html
+    .. _`CSV`: https://en.wikipedia.org/wiki/Comma-separated_values
+    .. _`csv.reader()`: https://docs.python.org/3/library/csv.html#csv.reader
+    .. _`concurrent.futures.ThreadPoolExecutor`:
+        https://docs.python.org/3/library/concurrent.futures.html#threadpoolexecutor
+    .. _`concurrent.futures.ProcessPoolExecutor`:
+        https://docs.python.org/3/library/concurrent.futures.html#processpoolexecutor
+
+    **Examples**::
+
+        >>> from pyhelpers.store import load_many
+        >>> from pyhelpers.dirs import cd
+
+        >>> data_dir = cd("tests", "data")
+        >>> dat = load_many(cd(data_dir, "dat.pickle.*"), verbose=True)
+        Loading "tests/data/dat.pickle.bz2" ... Done.
+        Loading "tests/data/dat.pickle.gz" ... Done.
+        Loading "tests/data/dat.pickle.xz" ... Done.
+        >>> list(dat)
+        ['tests/data/dat.pickle.bz2', 'tests/data/dat.pickle.gz', 'tests/data/dat.pickle.xz']
+
+        >>> dat, info = load_many(cd(data_dir, "*.parquet"), concat=True, ret_info=True)
+        >>> dat
+                    Longitude   Latitude
+        City
+        London      -0.127647  51.507322
+        Birmingham  -1.902691  52.479699
+        Manchester  -2.245115  53.479489
+        Leeds       -1.543794  53.797418
+        London      -0.127647  51.507322
+        Birmingham  -1.902691  52.479699
+        Manchester  -2.245115  53.479489
+        Leeds       -1.543794  53.797418
+        >>> info
+                                     elapsed_time error
+        tests/data/dat.gold.parquet      0.006616  None
+        tests/data/dat.parquet           0.005436  None
+    """
+
+    if backend == 'thread':
+        executor_cls = concurrent.futures.ThreadPoolExecutor
+    elif backend == 'process':
+        executor_cls = concurrent.futures.ProcessPoolExecutor
+    else:
+        raise ValueError("The argument `backend` must be either 'thread' or 'process'.")
+
+    file_paths = _get_file_paths(paths, incl_subdir=incl_subdir)
+
+    results = {}
+    with executor_cls(max_workers=n_workers) as executor:
+        futures = {executor.submit(_load_file, x, kwargs): x for x in file_paths}
+
+        for future in concurrent.futures.as_completed(futures):
+            path_to_file = futures[future]
+            results[path_to_file] = data, elapsed_time, error = future.result()
+
+            if verbose:
+                _check_loading_path(path_to_file, verbose=verbose)
+                if error is None:
+                    print("Done.")
+                else:
+                    _print_failure_message(error, prefix="Failed.", verbose=verbose)
+
+    info = pd.DataFrame(
+        [results[x][1:] for x in file_paths], index=file_paths,
+        columns=['elapsed_time', 'error'])
+
+    errors = [results[x][2] for x in file_paths if results[x][2] is not None]
+    if errors and raise_error:
+        raise errors[0]
+
+    data = {x: results[x][0] for x in file_paths if results[x][2] is None}
+
+    if concat:
+        if not all(isinstance(x, pd.DataFrame) for x in data.values()):
+            raise TypeError("Only dataframes can be concatenated.")
+        data = pd.concat(list(data.values()), join='outer', sort=False) if data else pd.DataFrame()
+
+    return (data, info) if ret_info else data
@@ -2,25 +2,23 @@
 Utilities for saving data in various formats.
 """
 
-import bz2
 import copy
 import functools
-import gzip
 import logging
-import lzma
 import pathlib
-import pickle  # nosec
 import subprocess  # nosec
 
 import pandas as pd
 
-from .utils import _autofit_column_width, _check_saving_path, _resolve_json_engine
+from .utils import _autofit_column_width, _check_saving_path, _dump_pickle, _open_pickle_file, \
+    _resolve_json_engine
 from .._cache import _find_file_path, _lazy_check_dependencies, _print_failure_message
 from ..ops.general import is_visual_object
 from ..ops.web import is_url
 
 
-def save_pickle(data, path_to_file, verbose=False, print_kwargs=None, raise_error=False, **kwargs):
+def save_pickle(data, path_to_file, verbose=False, print_kwargs=None, raise_error=False,
+                compresslevel=None, n_threads=None, out_of_band=False, **kwargs):
     """
     Save data to a `pickle <https://docs.python.org/3/library/pickle.html>`_ file.
 
@@ -36,10 +34,22 @@ def save_pickle(data, path_to_file, verbose=False, print_kwargs=None, raise_erro
     :param raise_error: Whether to raise the provided exception;
         if ``raise_error=False`` (default), the error will be suppressed.
     :type raise_error: bool
-    :param kwargs: [Optional] Additional parameters for `pickle.dump()`_.
+    :param compresslevel: Compression level for a compressed file, e.g. ``1`` (fastest) to ``22``
+        for ``.zst``; when ``compresslevel=None`` (default), the default level of the codec is used.
+    :type compresslevel: int | None
+    :param n_threads: Number of threads for compressing a ``.zst`` file;
+        when ``n_threads=None`` (default), all logical CPUs are used.
+    :type n_threads: int | None
+    :param out_of_band: Whether to write the data buffers (e.g. of NumPy arrays) out of band
+        (see `PEP 574`_); defaults to ``False``. Such a file must be read with
+        :func:`~pyhelpers.store.load_pickle`.
+    :type out_of_band: bool
+    :param kwargs: [Optional] Additional parameters for `pickle.dump()`_;
+        ``protocol`` defaults to ``5``.
 
     .. _`Pickle`: https://docs.python.org/3/library/pickle.html
     .. _`pickle.dump()`: https://docs.python.org/3/library/pickle.html#pickle.dump
+    .. _`PEP 574`: https://peps.python.org/pep-0574/
 
     **Examples**::
 
@@ -61,12 +71,16 @@ def save_pickle(data, path_to_file, verbose=False, print_kwargs=None, raise_erro
         Leeds       -1.543794  53.797418
         >>> save_pickle(pickle_dat, pickle_pathname, verbose=True)
         Updating "dat.pickle" in "./tests/data/" ... Done.
+        >>> pickle_pathname = cd("tests", "data", "dat.pkl.zst")
+        >>> save_pickle(pickle_dat, pickle_pathname, compresslevel=1, verbose=True)
+        Saving "dat.pkl.zst" to "./tests/data/" ... Done.
 
     .. tip::
 
         - The file path is validated before saving. Ensure the directory exists and is writable.
-        - Supported compression formats: ``.gz`` (gzip), ``.xz`` (LZMA compression) and
-          ``.bz2`` (bzip2).
+        - Supported compression formats: ``.gz`` (gzip), ``.xz`` (LZMA compression),
+          ``.bz2`` (bzip2), ``.zst`` (Zstandard, multi-threaded) and ``.lz4`` (LZ4).
+          The last two require the packages `zstandard`_ and `lz4`_ respectively.
         - Other extensions are saved as uncompressed files.
         - Compression format is determined by the file extension. Ensure the extension matches
           the desired format.
@@ -74,24 +88,18 @@ def save_pickle(data, path_to_file, verbose=False, print_kwargs=None, raise_erro
     .. seealso::
 
         - Examples for the function :func:`~pyhelpers.store.load_pickle`.
+
+    .. _`zstandard`: https://pypi.org/project/zstandard/
+    .. _`lz4`: https://pypi.org/project/lz4/
     """
 
-    file_path, _, ext = _check_saving_path(
+    file_path, _, _ = _check_saving_path(
         path_to_file, verbose=verbose, return_info=True, **(print_kwargs or {}))
 
     try:
-        if ext.endswith((".pkl.gz", ".pickle.gz")):
-            with gzip.open(file_path, mode='wb') as f:
-                pickle.dump(data, f, **kwargs)  # noqa
-        elif ext.endswith((".pkl.xz", ".pkl.lzma", ".pickle.xz", ".pickle.lzma")):
-            with lzma.open(file_path, mode='wb') as f:
-                pickle.dump(data, f, **kwargs)  # noqa
-        elif ext.endswith((".pkl.bz2", ".pickle.bz2")):
-            with bz2.BZ2File(file_path, mode='wb') as f:
-                pickle.dump(data, f, **kwargs)  # noqa
-        else:
-            with open(file_path, mode='wb') as f:
-                pickle.dump(data, f, **kwargs)  # noqa
+        with _open_pickle_file(file_path, mode='wb', compresslevel=compresslevel,
+                               n_threads=n_threads) as f:
+            _dump_pickle(data, f, out_of_band=out_of_band, **kwargs)
 
         if verbose:
             print("Done.")
@@ -681,6 +689,7 @@ def save_joblib(data, path_to_file, verbose=False, print_kwargs=None, raise_erro
         _print_failure_message(e=e, prefix="Failed.", verbose=verbose, raise_error=raise_error)
 
 
+@_lazy_check_dependencies(pa='pyarrow', pa_feather='pyarrow.feather')
 def save_feather(data, path_to_file, index=True, verbose=False, print_kwargs=None,
                  raise_error=False, **kwargs):
     """
@@ -692,8 +701,8 @@ def save_feather(data, path_to_file, index=True, verbose=False, print_kwargs=Non
         If the index is not a standard range, or if ``index=True``, it will be
         automatically reset and saved as a column.
 
-    :param data: The dataframe to be saved.
-    :type data: pandas.DataFrame
+    :param data: The dataframe to be saved; a ``pyarrow.Table`` is written as is.
+    :type data: pandas.DataFrame | pyarrow.Table
     :param path_to_file: The path where the Feather file will be saved.
     :type path_to_file: str | pathlib.Path
     :param index: Whether to include the index as a column.
@@ -707,10 +716,13 @@ def save_feather(data, path_to_file, index=True, verbose=False, print_kwargs=Non
     :type print_kwargs: dict | None
     :param raise_error: Whether to raise an exception if saving fails; defaults to ``False``.
     :type raise_error: bool
-    :param kwargs: [Optional] Additional parameters for `pandas.DataFrame.to_feather()`_.
+    :param kwargs: [Optional] Additional parameters for `pandas.DataFrame.to_feather()`_
+        or `pyarrow.feather.write_feather()`_.
 
     .. _`pandas.DataFrame.to_feather()`:
         https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.to_feather.html
+    .. _`pyarrow.feather.write_feather()`:
+        https://arrow.apache.org/docs/python/generated/pyarrow.feather.write_feather.html
 
     **Examples**::
 
@@ -740,17 +752,23 @@ def save_feather(data, path_to_file, index=True, verbose=False, print_kwargs=Non
         path_to_file, verbose=verbose, return_info=True, **(print_kwargs or {}))
 
     try:
-        # Check if index is the default integer range [0, 1, ..., n-1]
-        is_default_index = (list(data.index) == list(range(len(data))) and data.index.name is None)
-
-        # Decide whether to reset (keep as column), drop, or leave as is
-        if index is True or (index is None and not is_default_index):
-            data.reset_index().to_feather(file_path, **kwargs)
-        elif index is False and not is_default_index:
-            # Discard the non-default index
-            data.reset_index(drop=True).to_feather(file_path, **kwargs)
+        if isinstance(data, pa.Table):  # noqa
+            # Write the table directly (it has no index), without converting it to pandas
+            pa_feather.write_feather(data, file_path, **kwargs)  # noqa
+
         else:
-            data.to_feather(file_path, **kwargs)
+            # Check if index is the default integer range [0, 1, ..., n-1]
+            is_default_index = (
+                list(data.index) == list(range(len(data))) and data.index.name is None)
+
+            # Decide whether to reset (keep as column), drop, or leave as is
+            if index is True or (index is None and not is_default_index):
+                data.reset_index().to_feather(file_path, **kwargs)
+            elif index is False and not is_default_index:
+                # Discard the non-default index
+                data.reset_index(drop=True).to_feather(file_path, **kwargs)
+            else:
+                data.to_feather(file_path, **kwargs)
 
         if verbose:
             print("Done.")
@@ -1440,8 +1458,10 @@ def get_save_func(file_ext):
     """
 
     _mapping = {
-        (".pickle", ".pickle.bz2", ".pickle.gz", ".pickle.gzip", ".pickle.lzma", ".pickle.xz",
-         ".pkl", ".pkl.bz2", ".pkl.gz", ".pkl.gzip", ".pkl.lzma", ".pkl.xz"): save_pickle,
+        (".pickle", ".pickle.bz2", ".pickle.gz", ".pickle.gzip", ".pickle.lz4", ".pickle.lzma",
+         ".pickle.xz", ".pickle.zst", ".pickle.zstd",
+         ".pkl", ".pkl.bz2", ".pkl.gz", ".pkl.gzip", ".pkl.lz4", ".pkl.lzma", ".pkl.xz", ".pkl.zst",
+         ".pkl.zstd"): save_pickle,
         (".csv", ".xlsx", ".xls", ".txt", ".ods"): save_spreadsheets,
         (".json",): save_json,
         (".fea", ".feather"): save_feather,
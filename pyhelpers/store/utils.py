@@ -2,10 +2,14 @@
 Utilities that support the main submodules of :mod:`~pyhelpers.store`.
 """
 
+import bz2
 import contextlib
 import functools
+import gzip
 import inspect
 import logging
+import lzma
+import pickle  # nosec
 import sys
 import textwrap
 import warnings
@@ -542,6 +546,137 @@ def _is_parquet_geospatial(path, pq_module):
         return bool(file_ext == ".geoparquet")
 
 
+def _open_pickle_file(path_to_file, mode='rb', compresslevel=None, n_threads=None):
+    """
+    Open a pickle file, which is (de)compressed according to its extension if need be.
+
+    :param path_to_file: Pathname of the pickle file.
+    :type path_to_file: str | os.PathLike
+    :param mode: Mode in which the file is opened, either ``'rb'`` (default) or ``'wb'``.
+    :type mode: str
+    :param compresslevel: Compression level when writing a compressed file;
+        when ``compresslevel=None`` (default), the default level of the codec is used.
+    :type compresslevel: int | None
+    :param n_threads: Number of threads for writing a `Zstandard`_ file; when ``n_threads=None``
+        (default), all logical CPUs are used; ``0`` disables multi-threaded compression.
+    :type n_threads: int | None
+    :return: File object.
+    :rtype: typing.BinaryIO
+
+    .. _`Zstandard`: https://python-zstandard.readthedocs.io/
+
+    .. note::
+
+        Files ending with ``".zst"``, ``".zstd"`` and ``".lz4"`` require the optional
+        dependencies `zstandard <https://pypi.org/project/zstandard/>`_ and
+        `lz4 <https://pypi.org/project/lz4/>`_ respectively.
+    """
+
+    path_str = str(path_to_file).lower()
+    writing = 'w' in mode
+
+    if path_str.endswith((".zst", ".zstd")):
+        zstandard = _check_dependencies('zstandard')
+        if writing:
+            cctx = zstandard.ZstdCompressor(
+                level=3 if compresslevel is None else compresslevel,
+                threads=-1 if n_threads is None else n_threads)
+            return zstandard.open(path_to_file, mode=mode, cctx=cctx)
+        return zstandard.open(path_to_file, mode=mode)
+
+    level_kwargs = {} if compresslevel is None or not writing else {'compresslevel': compresslevel}
+
+    if path_str.endswith(".lz4"):
+        lz4_frame = _check_dependencies('lz4.frame')
+        if level_kwargs:
+            level_kwargs = {'compression_level': compresslevel}
+        return lz4_frame.open(path_to_file, mode=mode, **level_kwargs)
+    if path_str.endswith((".gz", ".gzip")):
+        return gzip.open(path_to_file, mode=mode, **level_kwargs)
+    if path_str.endswith((".xz", ".lzma")):
+        return lzma.open(path_to_file, mode=mode, preset=level_kwargs.get('compresslevel'))
+    if path_str.endswith(".bz2"):
+        return bz2.open(path_to_file, mode=mode, **level_kwargs)
+    return open(path_to_file, mode=mode)
+
+
+_OOB_PICKLE_TAG = 'pyhelpers.store:pickle-out-of-band'
+
+
+def _dump_pickle(data, f, out_of_band=False, **kwargs):
+    """
+    Write data to a pickle file object, using protocol 5 unless otherwise specified.
+
+    With protocol 5, contiguous buffers (e.g. of NumPy arrays and pandas dataframes) are written
+    straight to the file without being copied into the pickle stream. If ``out_of_band=True``,
+    the buffers are taken out of band: a header listing their sizes is written first, followed by
+    the raw buffers and then the pickle stream itself. Such files can only be read by
+    :func:`~pyhelpers.store.utils._load_pickle`.
+
+    :param data: Data to be pickled.
+    :type data: typing.Any
+    :param f: File object opened for writing in binary mode.
+    :type f: typing.BinaryIO
+    :param out_of_band: Whether to write the buffers out of band; defaults to ``False``.
+    :type out_of_band: bool
+    :param kwargs: [Optional] Additional parameters for `pickle.dump()`_.
+
+    .. _`pickle.dump()`: https://docs.python.org/3/library/pickle.html#pickle.dump
+    """
+
+    kwargs.setdefault('protocol', 5)
+
+    if not out_of_band:
+        pickle.dump(data, f, **kwargs)  # noqa
+        return
+
+    if kwargs['protocol'] < 5:
+        raise ValueError("Out-of-band buffers require pickle protocol 5 or higher.")
+
+    buffers = []
+    stream = pickle.dumps(data, buffer_callback=buffers.append, **kwargs)
+    views = [buf.raw() for buf in buffers]
+
+    pickle.dump((_OOB_PICKLE_TAG, [view.nbytes for view in views]), f, protocol=5)
+    for view in views:
+        f.write(view)
+    f.write(stream)
+
+
+def _load_pickle(f, **kwargs):
+    """
+    Read data from a pickle file object written by :func:`~pyhelpers.store.utils._dump_pickle`.
+
+    :param f: File object opened for reading in binary mode.
+    :type f: typing.BinaryIO
+    :param kwargs: [Optional] Additional parameters for `pickle.load()`_.
+    :return: Data retrieved from the file object.
+    :rtype: typing.Any
+
+    .. _`pickle.load()`: https://docs.python.org/3/library/pickle.html#pickle.load
+    """
+
+    data = pickle.load(f, **kwargs)  # nosec
+
+    if type(data) is tuple and len(data) == 2 and isinstance(data[0], str) \
+            and data[0] == _OOB_PICKLE_TAG:
+        buffers = []
+        for nbytes in data[1]:
+            # Read into writable buffers so that the restored arrays are not read-only
+            buf = bytearray(nbytes)
+            view = memoryview(buf)
+            while view:
+                n = f.readinto(view)
+                if not n:
+                    raise EOFError("The pickle file ended before all its buffers were read.")
+                view = view[n:]
+            buffers.append(buf)
+
+        data = pickle.load(f, buffers=buffers, **kwargs)  # nosec
+
+    return data
+
+
 @contextlib.contextmanager
 def suppress_gpkg_warnings():
     # noinspection PyShadowingNames
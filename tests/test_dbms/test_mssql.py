@@ -0,0 +1,249 @@
+"""Test the module :mod:`~pyhelpers.dbms.mssql`."""
+
+import datetime
+import decimal
+import sqlite3
+import types
+import uuid
+
+import pandas as pd
+import pytest
+import shapely
+import sqlalchemy
+
+from pyhelpers.dbms import MSSQL
+from pyhelpers.dbms.mssql import _ExportManifest, _fetch_arrow, _geometry_to_wkb, _input_sizes, \
+    _iter_arrow_batches
+
+
+class _Cursor:
+    def __init__(self, description, rows):
+        self.description = description
+        self._rows = iter(rows)
+
+    def fetchmany(self, size):
+        return [row for _, row in zip(range(size), self._rows)]
+
+
+def test__fetch_arrow():
+    import pyarrow as pa
+
+    description = [
+        ('i', int, None, 10, 10, 0, True),
+        ('d', decimal.Decimal, None, 5, 5, 2, True),
+        ('t', datetime.datetime, None, 23, 23, 3, True),
+        ('u', uuid.UUID, None, 36, 36, 0, True),
+    ]
+    u = uuid.uuid4()
+    rows = [
+        (1, decimal.Decimal('1.25'), datetime.datetime(2020, 1, 1), u),
+        (None, None, None, None),
+        (3, decimal.Decimal('3.50'), datetime.datetime(2020, 1, 3), u),
+    ]
+
+    table = _fetch_arrow(_Cursor(description, rows), batch_size=2)
+    assert table.num_rows == 3
+    assert table.schema.types == [
+        pa.int64(), pa.decimal128(5, 2), pa.timestamp('us'), pa.string()]
+    assert table.column('u').to_pylist() == [str(u), None, str(u)]
+    assert table.column('i').null_count == 1
+
+    table = _fetch_arrow(_Cursor(description, []))
+    assert table.num_rows == 0 and table.column_names == ['i', 'd', 't', 'u']
+
+    cursor = sqlite3.connect(':memory:').execute("SELECT 1 AS a, 'x' AS b UNION SELECT 2, 'y'")
+    table = _fetch_arrow(cursor, batch_size=1)
+    assert table.to_pydict() == {'a': [1, 2], 'b': ['x', 'y']}
+
+    # The types of a given schema are kept even if all the values are null
+    description = [(x, None, None, None, None, None, True) for x in ('a', 'b')]
+    schema = pa.schema([('a', pa.int64()), ('b', pa.null())])
+    batch = next(_iter_arrow_batches(_Cursor(description, [(None, 'x')]), schema=schema))
+    assert batch.schema.types == [pa.int64(), pa.string()]
+
+
+def test__input_sizes():
+    assert _input_sizes([(1, 'ab', None), (2, 'abc', None)]) == [None, (-9, 3, 0), None]
+    assert _input_sizes([('', 1.5)]) == [(-9, 1, 0), None]
+    assert _input_sizes([('a' * 4001,)]) == [(-9, 0, 0)]
+    # Characters outside the Basic Multilingual Plane take two UTF-16 code units
+    assert _input_sizes([('a\U0001F600',)]) == [(-9, 3, 0)]
+    assert _input_sizes([('a' * 3999 + '\U0001F600',)]) == [(-9, 0, 0)]
+    assert _input_sizes([('a',), (1,)]) == [None]
+    assert _input_sizes([(b'ab',), (None,)]) == [(-3, 2, 0)]
+    assert _input_sizes([(b'a' * 8001,)]) == [(-3, 0, 0)]
+
+
+def test__geometry_to_wkb():
+    point = shapely.Point(1 / 3, 2.0)
+    for values in ([point, None], [point.wkt, float('nan')], [shapely.to_wkb(point), None]):
+        wkb = _geometry_to_wkb(pd.Series(values, name='g'))
+        assert wkb.name == 'g'
+        assert shapely.from_wkb(wkb[0]).equals(shapely.from_wkt(point.wkt))
+        assert wkb[1] is None
+
+
+def test_mssql_insert_fast_executemany():
+    class _FastCursor:
+        def __init__(self):
+            self.fast_executemany, self.calls, self.closed = False, [], False
+
+        def setinputsizes(self, sizes):
+            self.calls.append(('setinputsizes', sizes))
+
+        def executemany(self, sql, rows):
+            self.calls.append((sql, rows))
+
+        def close(self):
+            self.closed = True
+
+    cursor = _FastCursor()
+    sql_db_engine = types.SimpleNamespace(connection=types.SimpleNamespace(cursor=lambda: cursor))
+    sql_table = types.SimpleNamespace(schema='dbo', name='t')
+
+    rows = [(i, str(i)) for i in range(5)]
+    row_count = MSSQL.mssql_insert_fast_executemany(
+        sql_table, sql_db_engine, ['a', 'b'], iter(rows), batch_size=2)
+
+    assert row_count == 5
+    assert cursor.fast_executemany and cursor.closed
+    assert cursor.calls[1] == ('INSERT INTO [dbo].[t] ([a], [b]) VALUES (?, ?)', rows[:2])
+    assert [len(x[1]) for x in cursor.calls[1::2]] == [2, 2, 1]
+
+    cursor = _FastCursor()
+    MSSQL.mssql_insert_fast_executemany(
+        sql_table, sql_db_engine, ['a', 'g'], iter([(1, b'\x01')]), geom_column_names=['g'],
+        srid=27700)
+    assert cursor.calls[1][0] == \
+        'INSERT INTO [dbo].[t] ([a], [g]) VALUES (?, geometry::STGeomFromWKB(?, 27700))'
+
+
+def test__bulk_insert_query():
+    sql_query = MSSQL._bulk_insert_query("/data/o'k.csv", '[dbo].[t]', batch_size=100)
+    assert sql_query.startswith("BULK INSERT [dbo].[t] FROM '/data/o''k.csv' WITH (FORMAT = 'CSV'")
+    assert sql_query.endswith("FIRSTROW = 1, KEEPNULLS, TABLOCK, BATCHSIZE = 100);")
+
+    sql_query = MSSQL._bulk_insert_query('a.dat', '[dbo].[t]', format_file='a.fmt', tablock=False)
+    assert sql_query == \
+        "BULK INSERT [dbo].[t] FROM 'a.dat' WITH (FORMATFILE = 'a.fmt', FIRSTROW = 1, KEEPNULLS);"
+
+
+def test_iter_table(tmp_path):
+    mssql = object.__new__(MSSQL)
+    mssql.engine = sqlalchemy.create_engine(f'sqlite:///{tmp_path / "test.db"}')
+    pd.DataFrame({'a': range(5), 'b': list('vwxyz')}).to_sql('t', mssql.engine, index=False)
+    mssql._read_table_query = lambda **kwargs: (['b', 'a'], 'SELECT a, b FROM t;')
+
+    chunks = mssql.iter_table('t', chunk_size=2, save_as='.csv', data_dir=tmp_path)
+    assert isinstance(chunks, types.GeneratorType)
+    chunks = list(chunks)
+    assert [len(x) for x in chunks] == [2, 2, 1]
+    assert chunks[0].columns.to_list() == ['b', 'a']
+    assert sorted(x.name for x in (tmp_path / 't').iterdir()) == [
+        'part-00000.csv', 'part-00001.csv', 'part-00002.csv']
+    assert pd.read_csv(tmp_path / 't' / 'part-00002.csv').iloc[0, 0] == 'z'
+
+    chunks = mssql.read_table('t', chunk_size=3, iterator=True)
+    assert pd.concat(chunks, ignore_index=True).equals(mssql.read_table('t'))
+
+    # Re-export a smaller table into the same directory
+    pd.DataFrame({'a': [9], 'b': ['q']}).to_sql('t', mssql.engine, index=False, if_exists='replace')
+    chunks = list(mssql.iter_table('t', chunk_size=2, save_as='.csv', data_dir=tmp_path))
+    assert sorted(x.name for x in (tmp_path / 't').iterdir()) == ['part-00000.csv']
+    assert pd.read_csv(tmp_path / 't' / 'part-00000.csv')['a'].to_list() == [9]
+
+
+@pytest.mark.parametrize('n_columns', [1, 2, 5])
+def test_import_data_chunk_size(n_columns):
+    mssql = object.__new__(MSSQL)
+    imported = {}
+    mssql._import_data = lambda **kwargs: imported.update(kwargs)
+
+    data = pd.DataFrame({f'c{i}': range(3000) for i in range(n_columns)})
+    mssql.import_data(data, 't', method='multi', confirmation_required=False)
+    # At most 1,000 rows of values and 2,100 parameters in a multi-row INSERT
+    assert imported['chunk_size'] == min(1000, 2099 // n_columns)
+
+    mssql.import_data(data, 't', method='multi', chunk_size='adaptive')
+    assert imported['chunk_size'].max_size == min(1000, 2099 // n_columns)
+
+
+def test__upsert_query():
+    sql_query = MSSQL._upsert_query('[dbo].[t]', '[dbo].[s]', ['id', 'x'], ['id'])
+    assert sql_query == \
+        'MERGE INTO [dbo].[t] WITH (HOLDLOCK) AS t USING [dbo].[s] AS s ON t.[id] = s.[id] ' \
+        'WHEN MATCHED THEN UPDATE SET t.[x] = s.[x] ' \
+        'WHEN NOT MATCHED BY TARGET THEN INSERT ([id], [x]) VALUES (s.[id], s.[x]);'
+
+    sql_query = MSSQL._upsert_query('[t]', '[s]', ['a', 'b'], ['a', 'b'])
+    assert 'WHEN MATCHED' not in sql_query
+    assert 'ON t.[a] = s.[a] AND t.[b] = s.[b]' in sql_query
+
+    sql_query = MSSQL._staging_table_query('[dbo].[t]', '[dbo].[s]', ['id', 'x'])
+    assert sql_query == 'SELECT TOP 0 [id], [x] INTO [dbo].[s] FROM [dbo].[t];'
+
+
+def test_read_columns(tmp_path):
+    mssql = object.__new__(MSSQL)
+    mssql.engine = sqlalchemy.create_engine(f'sqlite:///{tmp_path / "test.db"}')
+    geoms = [shapely.Point(0.1, 0.2), None, shapely.LineString([(0, 0), (1 / 3, 2 / 3)])]
+    pd.DataFrame({'g': shapely.to_wkb(geoms)}).to_sql('t', mssql.engine, index=False)
+
+    assert MSSQL._dtype_read_fmt('geometry', as_wkb=True) == '[{x}].STAsBinary() AS [{x}]'
+    mssql._read_column_names = lambda **kwargs: (['g'], '[g]')
+    mssql._table_name = lambda table_name, schema_name: table_name
+
+    data = mssql.read_columns('t', ['g'], dtype='geometry')
+    assert data['g'].iloc[1] is None
+    assert shapely.equals_exact(data['g'].iloc[2], geoms[2], tolerance=0)  # No loss via WKT
+
+    chunks = list(mssql.read_columns('t', ['g'], dtype='geometry', chunk_size=2, iterator=True))
+    assert [len(x) for x in chunks] == [2, 1]
+    assert chunks[0]['g'].iloc[0] == geoms[0]
+
+
+def test_export_table(tmp_path):
+    mssql = object.__new__(MSSQL)
+    mssql.engine = sqlalchemy.create_engine(f'sqlite:///{tmp_path / "test.db"}')
+    sqlalchemy.event.listen(mssql.engine, 'connect', lambda dbapi_conn, _: dbapi_conn.execute(
+        f"ATTACH DATABASE '{tmp_path / 'dbo.db'}' AS dbo"))
+    with mssql.engine.begin() as connection:
+        connection.exec_driver_sql('CREATE TABLE dbo.t (id INTEGER PRIMARY KEY, val TEXT);')
+        connection.exec_driver_sql(
+            'INSERT INTO dbo.t VALUES ' + ', '.join(f"({i}, 'v{i}')" for i in range(10)))
+
+    mssql.get_primary_keys = lambda **kwargs: ['id']
+    mssql.get_row_count = lambda **kwargs: 10
+    mssql.get_column_names = lambda **kwargs: ['id', 'val']
+    mssql._read_table_query = lambda table_name, schema_name, column_names, conditions: (
+        column_names, f'SELECT [id], [val] FROM [dbo].[t] {conditions or ""};')
+
+    dataset_dir = mssql.export_table('t', data_dir=tmp_path, partition_size=4, chunk_size=3)
+    assert sorted(x.name for x in (tmp_path / 't').iterdir()) == [
+        '_manifest.json', 'part-00000.parquet', 'part-00001.parquet', 'part-00002.parquet']
+    data = pd.read_parquet(dataset_dir)
+    assert data['id'].to_list() == list(range(10))
+    assert data['val'].iloc[-1] == 'v9'
+
+    manifest = _ExportManifest(tmp_path / 't' / '_manifest.json')
+    assert manifest.info['key_column'] == 'id'
+    assert [manifest.get(x)['row_count'] for x in manifest.partition_names()] == [4, 3, 3]
+    assert manifest.get('part-00001')['upper_bound'] == 6
+
+    # Resume an interrupted export
+    manifest.update('part-00001', status='in_progress')
+    (tmp_path / 't' / 'part-00002.parquet').unlink()
+    mtime = (tmp_path / 't' / 'part-00000.parquet').stat().st_mtime_ns
+    mssql.export_table('t', data_dir=tmp_path)
+    assert (tmp_path / 't' / 'part-00000.parquet').stat().st_mtime_ns == mtime
+    assert pd.read_parquet(dataset_dir)['id'].to_list() == list(range(10))
+
+    # Start over, removing the temporary file left by a crashed export
+    (tmp_path / 't' / '.part-00003.parquet.tmp').write_bytes(b'')
+    mssql.export_table('t', data_dir=tmp_path, partition_size=10, overwrite=True)
+    assert sorted(x.name for x in (tmp_path / 't').iterdir()) == [
+        '_manifest.json', 'part-00000.parquet']
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,704 @@
+"""Test the module :mod:`~pyhelpers.dbms.postgresql`."""
+
+import asyncio
+import contextlib
+import functools
+import io
+import os
+import struct
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+import sqlalchemy
+
+from pyhelpers.dbms import AsyncPostgreSQL, PostgreSQL
+from pyhelpers.dbms._base import (
+    _AdaptiveChunkSize, _add_to_span, _Base, _cached_metadata, _invalidates_metadata,
+    _MetadataCache,
+)
+from pyhelpers.dbms.postgresql import (
+    _cached_query, _CopyPipe, _csv_record_end, _encode_binary_copy_rows, _iter_copy_data,
+    _iter_csv_blocks, _IterableIO, _pg_column_type, _QueryCache,
+)
+
+
+def test__iterable_io():
+    buffer = _IterableIO(['abc', 'de', '', 'fgh'])
+    assert buffer.read(4) == 'abcd'
+    assert buffer.read() == 'efgh'
+    assert buffer.read(1) == b''
+
+    buffer = _IterableIO([b'ab', b'cd'])
+    assert buffer.read(3) == b'abc'
+    assert buffer.read(3) == b'd'
+    assert buffer.n_read == 4
+
+
+def test__encode_binary_copy_rows():
+    data = _encode_binary_copy_rows([(1, 'a'), (None, 'b')], ['integer', 'text'])
+    assert data == (struct.pack('>hii', 2, 4, 1) + struct.pack('>i', 1) + b'a' +
+                    struct.pack('>hi', 2, -1) + struct.pack('>i', 1) + b'b')
+
+    # Fixed-width columns without nulls
+    data = _encode_binary_copy_rows([(1, 1.5, True)], ['bigint', 'double precision', 'boolean'])
+    assert data == struct.pack('>hiqidi?', 3, 8, 1, 8, 1.5, 1, True)
+
+    data = _encode_binary_copy_rows([('2000-01-02',)], ['date'])
+    assert data == struct.pack('>hii', 1, 4, 1)
+
+
+def test__iter_copy_data():
+    chunks = list(_iter_copy_data([(1, 'a'), (2, 'b,c'), (3, None)], batch_size=2))
+    assert chunks == ['1,a\r\n2,"b,c"\r\n', '3,\r\n']
+
+    chunks = list(_iter_copy_data([(1,)], batch_size=2, pg_types=['integer']))
+    assert chunks[0].startswith(b'PGCOPY\n\xff\r\n\x00')
+    assert chunks[-1] == b'\xff\xff'
+
+
+def test__copy_pipe():
+    pipe = _CopyPipe(chunk_size=4, max_chunks=2)
+
+    def _write():
+        pipe.write(b'a,b\n')
+        for i in range(100):
+            pipe.write(f'{i},{i * 2}\n'.encode())
+        pipe.close_writer()
+
+    writer = threading.Thread(target=_write)
+    writer.start()
+    chunks = list(pd.read_csv(pipe.reader, chunksize=30))
+    writer.join()
+    assert [len(x) for x in chunks] == [30, 30, 30, 10]
+    assert pd.concat(chunks)['b'].sum() == 9900
+
+    pipe = _CopyPipe()
+    pipe.close_writer(error=ValueError('Failed.'))
+    with pytest.raises(ValueError, match='Failed.'):
+        pipe.reader.read()
+
+    pipe = _CopyPipe(chunk_size=1, max_chunks=1)
+    pipe.close()
+    with pytest.raises(BrokenPipeError):
+        pipe.write(b'a')
+    assert pipe.broken
+    with pytest.raises(BrokenPipeError):
+        pipe.reader.read()
+
+    # A reader in a worker thread gets all the data after the main thread has returned
+    code = textwrap.dedent("""
+        import threading, time
+        from pyhelpers.dbms.postgresql import _CopyPipe
+
+        pipe = _CopyPipe(chunk_size=1, max_chunks=1)
+
+        def _write():
+            time.sleep(0.5)
+            for i in range(20):
+                pipe.write(f'{i}\\n'.encode())
+            pipe.close_writer()
+
+        def _read():
+            print(len(pipe.reader.read().splitlines()))
+
+        threading.Thread(target=_write).start()
+        threading.Thread(target=_read).start()
+        """)
+    result = subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True, timeout=60, check=True)
+    assert result.stdout.strip() == '20'
+
+
+def test__csv_record_end():
+    assert _csv_record_end(b'a,b\n1,"x\ny"\n2,"z') == 12
+    assert _csv_record_end(b'a,"b\nc') == 0
+    assert _csv_record_end(b'a,"""b"""\n') == 10
+
+
+def test__iter_csv_blocks():
+    data = b'h1,h2\n1,"a\nb"\n2,"""q"""\n3,x\n'
+    header, body = data[:6], data[6:]
+
+    for block_size in range(1, len(data) + 1):
+        blocks = list(_iter_csv_blocks(io.BytesIO(data), block_size=block_size))
+        assert all(x.startswith(header) for x in blocks)
+        assert b''.join(x[len(header):] for x in blocks) == body
+
+
+def test__create_engine(tmp_path):
+    url = f'sqlite:///{tmp_path / "test.db"}'
+
+    dbms, dbms_ = _Base(), _Base()
+    engine = dbms._create_engine(url)
+    assert dbms_._create_engine(url) is engine
+
+    dbms_._set_pool_options(pool_size=2, pool_pre_ping=True)
+    assert dbms_.pool_options == {'pool_size': 2, 'pool_pre_ping': True}
+    engine_ = dbms_._create_engine(url)
+    assert engine_ is not engine
+    assert engine_.pool.size() == 2
+
+    _Base.dispose_engines()
+    assert dbms._create_engine(url) is not engine
+
+
+def test__adaptive_chunk_size():
+    data = pd.DataFrame({'a': range(1000), 'b': ['x' * 100] * 1000})
+
+    chunker = _AdaptiveChunkSize(memory_budget=1e-5, initial_size=10, min_size=1)
+    chunker.estimate(data)
+    max_rows = chunker.size
+    assert 1 < max_rows < 1000  # Within the memory budget of about 10 KB
+
+    chunker = _AdaptiveChunkSize(batch_latency=1.0, initial_size=100, min_size=10, max_size=300)
+    chunker.estimate(data)
+    chunker.update(100, 0.1)  # i.e. 1,000 rows/sec
+    assert chunker.size == 200  # At most doubled
+    chunker.update(200, 0.1)
+    assert chunker.size == 300  # Capped
+    chunker.update(300, 30)
+    assert chunker.size == 150  # At most halved
+
+    chunks = list(_AdaptiveChunkSize(initial_size=300).split([data, data.iloc[:0]]))
+    assert pd.concat(chunks[:-1]).equals(data)
+    assert len(chunks[0]) == 300 and len(chunks[1]) == 600
+    assert chunks[-1].empty
+
+
+def test__metadata_cache():
+    cache = _MetadataCache(ttl=None, max_size=2)
+    cache.put(('db', 's', 't1', 'f', ''), [1])
+    cache.put(('db', 's', None, 'f', ''), [2])
+    value = cache.get(('db', 's', 't1', 'f', ''))[1]
+    value.append(0)  # A copy is returned
+    assert cache.get(('db', 's', 't1', 'f', '')) == (True, [1])
+    cache.put(('db', 's', 't2', 'f', ''), [3])  # Evicts the least recently used
+    assert cache.get(('db', 's', None, 'f', '')) == (False, None)
+
+    cache.invalidate('db', 's', 't1')
+    assert len(cache) == 1
+    cache.suspend()
+    assert cache.get(('db', 's', 't2', 'f', '')) == (False, None)
+    cache.resume()
+    assert cache.get(('db', 's', 't2', 'f', '')) == (True, [3])
+
+    cache = _MetadataCache(ttl=0)
+    cache.put(('db', 's', 't1', 'f', ''), 1)
+    assert cache.get(('db', 's', 't1', 'f', '')) == (False, None)
+
+
+def test__cached_metadata():
+    class _DBMS(_Base):
+        DEFAULT_SCHEMA = 'public'
+
+        def __init__(self):
+            super().__init__()
+            self.tables = set()
+
+        @_cached_metadata
+        def table_exists(self, table_name, schema_name=None):
+            return (self._schema_name(schema_name), table_name) in self.tables
+
+        @_invalidates_metadata
+        def create_table(self, table_name, schema_name=None):
+            assert not self.table_exists(table_name, schema_name)
+            self.tables.add((self._schema_name(schema_name), table_name))
+
+    dbms = _DBMS()
+    assert not dbms.table_exists('t')
+    dbms.tables.add(('public', 't'))
+    assert dbms.table_exists('t')  # The cache is disabled
+
+    dbms = _DBMS()
+    dbms.enable_metadata_cache()
+    assert not dbms.table_exists('t')
+    dbms.tables.add(('public', 't'))
+    assert not dbms.table_exists('t')
+    dbms.clear_metadata_cache('t')
+    assert dbms.table_exists('t')
+
+    assert not dbms.table_exists('t', 'test_schema')
+    dbms.create_table('t', 'test_schema')
+    assert dbms.table_exists('t', 'test_schema')
+
+
+def test__pg_column_type():
+    data = pd.DataFrame({
+        'a': [1, 2], 'b': pd.Series([1, 2], dtype='int32'), 'c': [1.5, None], 'd': [True, False],
+        'e': pd.to_datetime(['2020-01-01', None]),
+        'f': pd.to_datetime(['2020-01-01'] * 2, utc=True),
+        'g': [pd.Timestamp('2020-01-01').date(), None], 'h': ['x', None]})
+
+    pg_types = [_pg_column_type(v) for _, v in data.items()]
+    assert pg_types == [
+        'BIGINT', 'INTEGER', 'DOUBLE PRECISION', 'BOOLEAN', 'TIMESTAMP WITHOUT TIME ZONE',
+        'TIMESTAMP WITH TIME ZONE', 'DATE', 'TEXT']
+
+
+def test__read_arrow(monkeypatch):
+    pa = pytest.importorskip('pyarrow')
+
+    postgres = object.__new__(PostgreSQL)
+    postgres._arrow_column_types = lambda sql_query: {'x': pa.decimal128(5, 2)}
+    postgres._read_copy_stream = lambda copy_sql, parser, iterate=False: parser(io.BytesIO(
+        b'x,y\n1.10,\n2.25,\n3.00,a\n4.50,b\n'))
+    monkeypatch.setattr(
+        'pyhelpers.dbms.postgresql._iter_csv_blocks',
+        functools.partial(_iter_csv_blocks, block_size=12))
+
+    # Column "y" is all NULL in the first block, which must not fix its type as null
+    tables = list(postgres._read_arrow('SELECT * FROM t', chunksize=3))
+    assert [table.num_rows for table in tables] == [3, 1]
+    table = pa.concat_tables(tables)
+    assert table.schema.types == [pa.decimal128(5, 2), pa.string()]
+    assert table.column('y').to_pylist() == [None, None, 'a', 'b']
+    assert str(table.column('x')[1]) == '2.25'
+
+
+def test_import_many(capsys):
+    postgres = object.__new__(PostgreSQL)
+    postgres.address = 'testdb'
+    postgres._table_name = lambda table_name, schema_name: f'"{schema_name}"."{table_name}"'
+    postgres.get_schema_info = lambda names_only: ['public']
+    created_schemas, imported, barrier = [], {}, threading.Barrier(2, timeout=5)
+    postgres.create_schema = lambda schema_name, **kwargs: created_schemas.append(schema_name)
+
+    def _import_data(data, table_name, schema_name, **kwargs):
+        if table_name == 'bad':
+            raise ValueError("Invalid data.")
+        if table_name == 't3':
+            imported[(schema_name, table_name)] = None
+        barrier.wait()  # Both tables are imported at the same time
+        imported[(schema_name, table_name)] = kwargs['method']
+
+    postgres.import_data = _import_data
+
+    data = pd.DataFrame({'a': [1, 2]})
+    summary = postgres.import_many(
+        {'t1': data, ('s', 't2'): data.iloc[:1], 'bad': data}, n_workers=3,
+        confirmation_required=False, verbose=True)
+
+    assert created_schemas == ['s']
+    assert imported == {('public', 't1'): 'copy', ('s', 't2'): 'copy'}
+    assert summary['table_name'].to_list() == ['t1', 't2', 'bad']
+    assert summary['row_count'].to_list() == [2, 1, 2]
+    assert summary['error'].isna().to_list() == [True, True, False]
+    assert summary['error'].iloc[2] == 'Invalid data.'
+    assert summary['elapsed_time'].iloc[:2].notna().all()
+    # One line per table, whichever order the imports finish in
+    assert sorted(capsys.readouterr().out.splitlines()) == [
+        'Importing data into "public"."bad" ... Failed. Invalid data.',
+        'Importing data into "public"."t1" ... Done.',
+        'Importing data into "s"."t2" ... Done.']
+
+    # The imports yet to start are canceled once one has failed
+    imported.clear()
+    with pytest.raises(ValueError, match='Invalid data'):
+        postgres.import_many(
+            {'bad': data, 't3': data}, n_workers=1, confirmation_required=False,
+            raise_error=True)
+    assert imported == {}
+
+
+def test__upsert_query():
+    sql_query = PostgreSQL._upsert_query('"public"."t"', '"public"."s"', ['id', 'x'], ['id'])
+    assert sql_query == \
+        'INSERT INTO "public"."t" ("id", "x") SELECT "id", "x" FROM "public"."s" ' \
+        'ON CONFLICT ("id") DO UPDATE SET "x" = EXCLUDED."x";'
+
+    sql_query = PostgreSQL._upsert_query('"t"', '"s"', ['id'], ['id'])
+    assert sql_query.endswith('ON CONFLICT ("id") DO NOTHING;')
+
+    sql_query = PostgreSQL._staging_table_query('"public"."t"', '"public"."s"', ['id', 'x'])
+    assert sql_query == \
+        'CREATE UNLOGGED TABLE "public"."s" AS SELECT "id", "x" FROM "public"."t" WITH NO DATA;'
+
+
+def test__upsert_data(tmp_path):
+    postgres = object.__new__(PostgreSQL)
+    postgres.engine = sqlalchemy.create_engine(f'sqlite:///{tmp_path / "test.db"}')
+    with postgres.engine.begin() as connection:
+        connection.exec_driver_sql(
+            'CREATE TABLE t (id INTEGER PRIMARY KEY, x TEXT, n INTEGER, d DATE);')
+        connection.exec_driver_sql(
+            "INSERT INTO t VALUES (1, 'a', 1, '2020-01-01'), (2, 'b', 2, '2020-01-02');")
+
+    statements = []
+    sqlalchemy.event.listen(
+        postgres.engine, 'before_cursor_execute',
+        lambda conn, cursor, statement, *args: statements.append(statement))
+
+    postgres.get_primary_keys = lambda table_name, schema_name: ['id']
+    postgres._table_name = lambda table_name, schema_name: f'"{table_name}"'
+    postgres._staging_table_query = lambda **kwargs: PostgreSQL._staging_table_query(
+        **kwargs).replace('UNLOGGED ', '').replace(' WITH NO DATA', ' WHERE false')
+    # SQLite requires a WHERE clause in an "INSERT ... SELECT" with an upsert clause
+    postgres._upsert_query = lambda **kwargs: PostgreSQL._upsert_query(**kwargs).replace(
+        ' ON CONFLICT', ' WHERE true ON CONFLICT')
+
+    import_kwargs = {'schema': None, 'index': False, 'dtype': None, 'method': None,
+                     'chunksize': None}
+    data = pd.DataFrame({'id': [2, 3], 'x': ['B', 'c']})
+    postgres._upsert_data(data, 't', None, import_kwargs)
+
+    table = pd.read_sql('SELECT id, x FROM t ORDER BY id', postgres.engine)
+    assert table.to_dict('list') == {'id': [1, 2, 3], 'x': ['a', 'B', 'c']}
+    assert sqlalchemy.inspect(postgres.engine).get_table_names() == ['t']  # No staging table
+
+    # Columns of nulls (which pandas would create as TEXT) take the types of the table
+    statements.clear()
+    data = pd.DataFrame({'id': [1, 4], 'x': ['A', 'd'], 'n': [None, None], 'd': [None, None]})
+    postgres._upsert_data(data, 't', None, import_kwargs)
+    create_statements = [x for x in statements if x.startswith('CREATE')]
+    assert len(create_statements) == 1
+    assert create_statements[0].endswith('AS SELECT "id", "x", "n", "d" FROM "t" WHERE false;')
+    table = pd.read_sql('SELECT * FROM t ORDER BY id', postgres.engine)
+    assert table['n'].isna().to_list() == [True, False, True, True]
+    assert table['d'].iloc[1] == '2020-01-02'
+
+    postgres.get_primary_keys = lambda table_name, schema_name: []
+    with pytest.raises(ValueError, match='no primary key'):
+        postgres._upsert_data(data, 't', None, import_kwargs)
+
+    with pytest.raises(ValueError, match="if_exists='upsert'` is not supported for _Base"):
+        object.__new__(_Base)._upsert_data(data, 't', None, import_kwargs)
+
+
+def test__span(tmp_path, caplog):
+    postgres = object.__new__(PostgreSQL)
+    postgres.instrumentation_hooks = []
+    with postgres._span('a') as span:  # Not recorded without a hook
+        _add_to_span(rows=1)
+    assert span.elapsed is None and span.attributes == {}
+
+    spans = []
+    postgres.add_instrumentation_hook(spans.append)
+    postgres.add_instrumentation_hook(lambda x: 1 / 0)  # Failures of hooks are ignored
+    with postgres._span('a', table_name='t') as span:
+        with postgres._span('b'):
+            _add_to_span(rows=2, bytes=10)
+            _add_to_span(rows=3)
+        with pytest.raises(KeyError):
+            with postgres._span('c'):
+                raise KeyError
+    assert [x.path for x in spans] == ['a/b', 'a/c', 'a']
+    assert spans[0].attributes == {'rows': 5, 'bytes': 10}
+    assert spans[-1].counts == {} and spans[-1].attributes == {'table_name': 't'}
+    assert isinstance(spans[1].error, KeyError)
+    assert span.elapsed >= spans[0].elapsed + spans[1].elapsed
+    assert 'Instrumentation hook' in caplog.text
+
+    postgres.remove_instrumentation_hook()
+    postgres.add_instrumentation_hook()
+    with caplog.at_level('INFO', logger='pyhelpers.dbms'):
+        with postgres._span('d', rows=1):
+            pass
+    assert 'd: ' in caplog.text and 'rows=1' in caplog.text
+    postgres.remove_instrumentation_hook('logging')
+    assert postgres.instrumentation_hooks == []
+
+    postgres.engine = sqlalchemy.create_engine(f'sqlite:///{tmp_path / "test.db"}')
+    postgres.address = ''
+    postgres._schema_name = lambda schema_name: schema_name
+    postgres._table_name = lambda table_name, schema_name: f'"{table_name}"'
+    postgres.schema_exists = lambda schema_name: True
+    postgres.table_exists = lambda table_name, schema_name: False
+
+    spans = []
+    postgres.add_instrumentation_hook(spans.append)
+    data = [pd.DataFrame({'a': range(3)}), {'a': [3, 4]}]
+    postgres._import_data(data, 't', method=None, confirmation_required=False)
+    assert [x.path for x in spans] == [
+        'import_data/catalog_check',
+        'import_data/build_chunk', 'import_data/write_chunk',
+        'import_data/build_chunk', 'import_data/write_chunk',
+        'import_data/build_chunk',
+        'import_data']
+    assert spans[-1].attributes == {'table_name': '"t"', 'rows': 5}
+    assert [x.attributes.get('rows') for x in spans if x.name == 'write_chunk'] == [3, 2]
+
+    postgres.table_exists = lambda table_name, schema_name: True
+    postgres.get_primary_keys = lambda table_name, schema_name: ['a']
+    postgres._staging_table_query = lambda table_name, staging_table_name, column_names: (
+        f'CREATE TABLE {staging_table_name} AS SELECT * FROM {table_name} WHERE false')
+    postgres._upsert_query = lambda table_name, staging_table_name, column_names, primary_keys: (
+        f'INSERT INTO {table_name} SELECT * FROM {staging_table_name}')
+    spans.clear()
+    postgres._import_data(
+        pd.DataFrame({'a': [5]}), 't', if_exists='upsert', method=None,
+        confirmation_required=False)
+    # Only the counts of the staging table's write are added to the enclosing span
+    assert spans[-1].attributes == {'table_name': '"t"', 'rows': 1}
+
+
+@pytest.mark.parametrize('file_format', ['parquet', 'feather'])
+def test__query_cache(tmp_path, file_format):
+    pa = pytest.importorskip('pyarrow')
+
+    cache = _QueryCache(cache_dir=tmp_path, ttl=None, file_format=file_format)
+    data = pd.DataFrame({'a': [1, 2], 'b': ['x', None]}, index=pd.Index(['i', 'j'], name='k'))
+
+    key = cache.key('SELECT 1', {'index_col': 'k'})
+    assert cache.get(key) == (False, None)
+    cache.put(key, data, state=[['public', 't', 1, 2, 0, 0, 2]])
+    cached, data_ = cache.get(key, state=[['public', 't', 1, 2, 0, 0, 2]])
+    assert cached and data_.equals(data)
+    assert cache.get(key, state=[['public', 't', 1, 3, 0, 0, 3]]) == (False, None)  # Modified
+    assert not os.listdir(tmp_path)
+
+    table = pa.table({'a': [1, 2]})
+    cache.put(key, table)
+    assert cache.get(key)[1].equals(table)
+    cache.put('iterator', iter([data]))  # Not cached
+    assert len(os.listdir(tmp_path)) == 2
+
+    cache.ttl = 0
+    time.sleep(0.01)
+    assert cache.get(key) == (False, None)  # Expired
+
+    cache.ttl, cache.max_size = None, 0
+    cache.put(key, data)
+    assert not os.listdir(tmp_path)  # Evicted
+
+    (tmp_path / f'other.{file_format}').write_bytes(b'')
+    cache.max_size = 1
+    cache.put(key, data)
+    cache.clear()
+    assert os.listdir(tmp_path) == [f'other.{file_format}']  # Not written by the cache
+
+
+def test__cached_query(tmp_path):
+    pytest.importorskip('pyarrow')
+
+    postgres = object.__new__(PostgreSQL)
+    postgres.engine = sqlalchemy.create_engine(f'sqlite:///{tmp_path / "test.db"}')
+    postgres.address = 'test.db'
+    pd.DataFrame({'a': [1, 2]}).to_sql('t', postgres.engine, index=False)
+
+    state = [['main', 't', 1, 2, 0, 0, 2]]
+    postgres._query_table_state = lambda sql_query: state
+    postgres._table_name = lambda table_name, schema_name: f'"{table_name}"'
+    postgres.enable_query_cache(cache_dir=tmp_path / 'cache')
+
+    data = postgres.read_table('t')
+    with postgres.engine.begin() as connection:
+        connection.exec_driver_sql('INSERT INTO t VALUES (3);')
+    assert postgres.read_table('t').equals(data)  # Cached
+    assert len(postgres.read_table('t', conditions='WHERE a > 0')) == 3
+    assert sum(len(x) for x in postgres.read_table('t', chunk_size=1)) == 3  # Not cached
+
+    state = [['main', 't', 1, 3, 0, 0, 3]]
+    assert len(postgres.read_table('t')) == 3
+
+    def read_sql_query(self, sql_query):
+        return pd.read_sql(sql_query, self.engine)
+
+    read_sql_query = _cached_query(lambda dbms, arguments: arguments['sql_query'])(read_sql_query)
+    query = "SELECT a, 'x  y' AS b FROM t"
+    assert read_sql_query(postgres, query)['b'].iloc[0] == 'x  y'
+    n_cached = len(os.listdir(tmp_path / 'cache'))
+    assert read_sql_query(postgres, f' {query}; ').equals(read_sql_query(postgres, query))
+    assert read_sql_query(postgres, query.replace('x  y', 'x y'))['b'].iloc[0] == 'x y'
+    assert len(os.listdir(tmp_path / 'cache')) == n_cached + 2
+
+    state = []  # No user tables, e.g. `SELECT now()`
+    assert read_sql_query(postgres, "SELECT 1 AS a")['a'].iloc[0] == 1
+    assert len(os.listdir(tmp_path / 'cache')) == n_cached + 2  # Not cached
+
+    postgres.clear_query_cache()
+    assert not os.listdir(tmp_path / 'cache')
+    postgres.disable_query_cache()
+    assert postgres.query_cache is None
+
+
+class _AsyncConnection:
+    """A fake `asyncpg` connection, recording the statements run on it."""
+
+    def __init__(self, tables=(), records=(), column_names=(), csv_data=b''):
+        self.tables, self.records, self.column_names = set(tables), records, column_names
+        self.csv_data = csv_data
+        self.statements, self.copied = [], []
+
+    async def execute(self, sql_query, *args):
+        self.statements.append(sql_query)
+        return 'OK'
+
+    async def fetchval(self, sql_query, *args):
+        self.statements.append(sql_query)
+        return (args[0] if len(args) == 1 else args) in self.tables  # A schema or a table
+
+    async def fetch(self, sql_query, *args):
+        self.statements.append(sql_query)
+        return self.records
+
+    async def prepare(self, sql_query):
+        self.statements.append(sql_query)
+        attributes = [types.SimpleNamespace(name=x) for x in self.column_names]
+
+        async def _fetch(*args):
+            return self.records
+
+        return types.SimpleNamespace(fetch=_fetch, get_attributes=lambda: attributes)
+
+    async def copy_from_query(self, sql_query, *args, output, **kwargs):
+        self.statements.append(sql_query)
+        output.write(self.csv_data)
+
+    async def copy_records_to_table(self, table_name, schema_name, records, columns):
+        self.copied.append((schema_name, table_name, records, columns))
+
+    @contextlib.asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def close(self):
+        pass
+
+
+class _AsyncPool:
+    def __init__(self, connection):
+        self.connection = connection
+        self.closed = False
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        yield self.connection
+
+    async def close(self):
+        self.closed = True
+
+
+def _async_postgres(connection):
+    postgres = AsyncPostgreSQL(password='x', database_name='testdb')
+    postgres.pool = _AsyncPool(connection)
+    return postgres
+
+
+def test_async_postgresql_connect(monkeypatch):
+    asyncpg = pytest.importorskip('asyncpg')
+
+    postgres = AsyncPostgreSQL(password='x', database_name='testdb')
+    assert postgres.pool is None and postgres.address == 'postgres:***@localhost:5432/testdb'
+
+    connection, pools = _AsyncConnection(), []
+
+    async def _create_pool(database_name):
+        if not pools:  # The database does not exist at first
+            pools.append(None)
+            raise asyncpg.InvalidCatalogNameError('database "testdb" does not exist')
+        pools.append(_AsyncPool(connection))
+        return pools[-1]
+
+    async def _connect(**kwargs):
+        assert kwargs['database'] == 'postgres'
+        return connection
+
+    postgres._create_pool = _create_pool
+    monkeypatch.setattr(asyncpg, 'connect', _connect)
+
+    async def _main():
+        async with postgres:
+            await postgres.connect()  # The pool is created only once
+            assert postgres.pool is pools[-1]
+
+    asyncio.run(_main())
+    assert connection.statements == ['CREATE DATABASE "testdb";']
+    assert len(pools) == 2 and pools[-1].closed and postgres.pool is None
+
+
+def test_async_postgresql_import_data():
+    data = pd.DataFrame(
+        {'a': [1.5, np.nan], 'b': pd.array(['x', pd.NA], dtype='string')},
+        index=pd.Index(['i', 'j'], name='k'))
+
+    # A new table, with the index imported as a column and missing values as NULL
+    connection = _AsyncConnection()
+    postgres = _async_postgres(connection)
+    n_rows = asyncio.run(postgres.import_data(data, 't', schema_name='s', index=True))
+    assert n_rows == 2
+    assert connection.statements[1:] == [
+        'CREATE SCHEMA IF NOT EXISTS "s";',
+        'CREATE TABLE "s"."t" ("k" TEXT, "a" DOUBLE PRECISION, "b" TEXT);']
+    assert connection.copied == [('s', 't', [('i', 1.5, 'x'), ('j', None, None)], ['k', 'a', 'b'])]
+
+    # An existing table, in the default schema
+    for if_exists, n_rows, statements in [
+            ('fail', 0, []),
+            ('append', 2, []),
+            ('replace', 2, [
+                'DROP TABLE "public"."t";',
+                'CREATE SCHEMA IF NOT EXISTS "public";',
+                'CREATE TABLE "public"."t" ("a" DOUBLE PRECISION, "b" TEXT);'])]:
+        connection = _AsyncConnection(tables=[('public', 't')])
+        postgres = _async_postgres(connection)
+        assert asyncio.run(postgres.import_data(data, 't', if_exists=if_exists)) == n_rows
+        assert connection.statements[1:] == statements
+        assert [x[2] for x in connection.copied] == \
+            ([[(1.5, 'x'), (None, None)]] if n_rows else [])
+
+    with pytest.raises(AssertionError, match='`if_exists` must be one of'):
+        asyncio.run(postgres.import_data(data, 't', if_exists='upsert'))
+
+
+def test_async_postgresql_read_sql_query():
+    connection = _AsyncConnection(
+        records=[(2, 'b'), (1, 'a')], column_names=['id', 'x'], csv_data=b'id,x\n1,a\n2,\n')
+    postgres = _async_postgres(connection)
+
+    data = asyncio.run(postgres.read_sql_query('SELECT * FROM t WHERE id > $1', 0))
+    assert data.to_dict('list') == {'id': [1, 2], 'x': ['a', np.nan]}
+
+    data = asyncio.run(postgres.read_sql_query('SELECT * FROM t', method='fetch'))
+    assert data.to_dict('list') == {'id': [2, 1], 'x': ['b', 'a']}
+
+    with pytest.raises(ValueError, match="`method` must be 'copy' or 'fetch'"):
+        asyncio.run(postgres.read_sql_query('SELECT 1', method='stream'))
+
+    # Tables are named as by PostgreSQL
+    connection.statements.clear()
+    data = asyncio.run(postgres.read_table(
+        't', schema_name='s', conditions='WHERE id > 0', sorted_by='id'))
+    assert connection.statements == ['SELECT * FROM "s"."t" WHERE id > 0']
+    assert data['id'].to_list() == [1, 2]
+
+    postgres_ = object.__new__(PostgreSQL)
+    for table_name, schema_name in [('t', None), ('t', 's'), ('My Table', 'My Schema')]:
+        assert postgres._table_name(table_name, schema_name) == \
+            postgres_._table_name(table_name, schema_name)
+
+
+def test_async_postgresql_catalog():
+    connection = _AsyncConnection(
+        tables=['public', ('public', 't')], records=[('public', 't1'), ('public', 't2')])
+    postgres = _async_postgres(connection)
+
+    assert asyncio.run(postgres.schema_exists(None))
+    assert not asyncio.run(postgres.schema_exists('s'))
+    assert asyncio.run(postgres.table_exists('t'))
+    assert not asyncio.run(postgres.table_exists('t', schema_name='s'))
+    assert not asyncio.run(postgres.table_exists('public'))
+
+    assert asyncio.run(postgres.get_table_names(['public', 's'])) == {'public': ['t1', 't2']}
+    connection.records = [('id',), ('x',)]
+    assert asyncio.run(postgres.get_column_names('t')) == ['id', 'x']
+
+    connection.statements.clear()
+    asyncio.run(postgres.create_table('t', 'id INT', schema_name='s'))
+    asyncio.run(postgres.drop_table('t', schema_name='s'))
+    asyncio.run(postgres.drop_schema(['s', 'information_schema']))  # Built-in ones are kept
+    assert connection.statements == [
+        'CREATE SCHEMA IF NOT EXISTS "s";',
+        'CREATE TABLE IF NOT EXISTS "s"."t" (id INT);',
+        'DROP TABLE IF EXISTS "s"."t" CASCADE;',
+        'DROP SCHEMA IF EXISTS "s" CASCADE;']
+
+
+if __name__ == '__main__':
+    pytest.main()
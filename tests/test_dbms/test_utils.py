@@ -1,9 +1,14 @@
 """Test the module :mod:`~pyhelpers.dbms`."""
 
+import datetime
+import decimal
+
+import pandas as pd
 import pytest
 
 from pyhelpers.dbms import PostgreSQL
 from pyhelpers.dbms.utils import *
+from pyhelpers.dbms.utils import _get_col_type, _MigrationCheckpoint
 
 
 def test_make_database_address():
@@ -29,5 +34,44 @@ def test_add_sql_query_condition():
     assert query_ == 'SELECT * FROM a_table WHERE t1."COL_NAME_1"=\'A\''
 
 
+def test__migration_checkpoint(tmp_path):
+    path_to_file = tmp_path / "checkpoint" / "manifest.json"
+
+    checkpoint = _MigrationCheckpoint(path_to_file)
+    assert checkpoint.get('a_table') is None
+
+    watermarks = {
+        'a': 10, 'b': b'\x00\x01', 'c': datetime.datetime(2020, 1, 2, 3, 4, 5),
+        'd': datetime.date(2020, 1, 2), 'e': decimal.Decimal('1.50'), 'f': 'abc'}
+    for table_name, watermark in watermarks.items():
+        checkpoint.update(table_name, status='in_progress', watermark=watermark, row_count=1)
+
+    checkpoint = _MigrationCheckpoint(path_to_file)
+    for table_name, watermark in watermarks.items():
+        state = checkpoint.get(table_name)
+        assert state['status'] == 'in_progress'
+        assert state['watermark'] == watermark
+        assert type(state['watermark']) is type(watermark)
+
+    checkpoint.update('a', status='done')
+    assert _MigrationCheckpoint(path_to_file).get('a')['status'] == 'done'
+    assert not path_to_file.with_suffix('.json.tmp').exists()
+
+
+def test__get_col_type():
+    class _MSSQL:
+        @staticmethod
+        def has_dtypes(table_name, dtypes):
+            yield 'hierarchyid', True, ['h']
+            yield 'varbinary', False, []
+
+    source_data = pd.DataFrame({'h': ['/1/', '\\x2F', None], 'v': [1, 2, 3]})
+    source_data_, col_type = _get_col_type(_MSSQL(), 't', source_data)
+    assert source_data_['h'].iloc[:2].to_list() == ['/1/', '\\\\x2F']
+    assert source_data_['h'].isna().iloc[2]
+    assert source_data['h'].iloc[1] == '\\x2F'
+    assert list(col_type) == ['h']
+
+
 if __name__ == '__main__':
     pytest.main()
@@ -0,0 +1,114 @@
+"""
+Tests the :mod:`~pyhelpers.store.caching` submodule.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyhelpers._cache import example_dataframe
+from pyhelpers.store.caching import _evict_lru_files, _update_hash, cached_to_disk
+
+
+def _digest(obj):
+    hasher = hashlib.blake2b(digest_size=16)
+    _update_hash(hasher, obj)
+    return hasher.hexdigest()
+
+
+def test__update_hash():
+    dat = example_dataframe()
+    assert _digest(dat) == _digest(dat.copy())
+    assert _digest(dat) != _digest(dat.iloc[::-1])
+    assert _digest(dat) != _digest(dat.rename(columns={'Longitude': 'X'}))
+    assert _digest(dat) != _digest(dat.astype('float32'))
+    assert _digest(pd.DataFrame({'a': [[1], [2]]})) != _digest(pd.DataFrame({'a': [[1], [3]]}))
+
+    arr = np.arange(6)
+    assert _digest(arr) == _digest(arr.copy()) != _digest(arr.reshape(2, 3))
+    assert _digest(arr.reshape(2, 3).T) == _digest(np.ascontiguousarray(arr.reshape(2, 3).T))
+
+    assert _digest({'a': 1, 'b': 2}) == _digest({'b': 2, 'a': 1})
+    assert _digest(1) != _digest(1.0) != _digest(True)
+    assert _digest([1, 2]) != _digest((1, 2))
+
+    with pytest.raises(TypeError, match='Unable to hash'):
+        _digest(x for x in range(3))
+
+
+def test__evict_lru_files(tmp_path):
+    for i in range(4):
+        path_to_file = tmp_path / f"{i}.pkl"
+        path_to_file.write_bytes(b"x" * 100)
+        os.utime(path_to_file, (i, i))
+    (tmp_path / "4.tmp-1-1.pkl").write_bytes(b"x" * 100)
+
+    evicted = _evict_lru_files(tmp_path, max_size=250, keep=tmp_path / "0.pkl")
+    assert sorted(os.path.basename(x) for x in evicted) == ["1.pkl", "2.pkl"]
+    assert sorted(os.listdir(tmp_path)) == ["0.pkl", "3.pkl", "4.tmp-1-1.pkl"]
+
+
+@pytest.mark.parametrize('fmt', ['pickle', 'parquet', 'feather', 'joblib'])
+def test_cached_to_disk(fmt, tmp_path):
+    calls = []
+
+    @cached_to_disk(cache_dir=tmp_path, fmt=fmt, ignore='verbose')
+    def scale(df, factor=2, verbose=False):
+        calls.append((factor, verbose))
+        return df * factor
+
+    dat = example_dataframe()
+    result = scale(dat)
+    assert scale(dat, 2, verbose=True).equals(result)
+    assert scale(df=dat.copy(), factor=2).equals(result)
+    assert len(calls) == 1 and len(os.listdir(tmp_path)) == 1
+    ext = ".pkl" if fmt in {'pickle', 'feather'} else f".{fmt}"  # Feather files keep no index
+    assert os.listdir(tmp_path)[0].endswith(ext)
+
+    assert scale(dat, factor=3).equals(dat * 3)
+    assert len(calls) == 2 and len(os.listdir(tmp_path)) == 2
+
+    scale.cache_clear()
+    assert not os.listdir(tmp_path) and scale.cache_dir == tmp_path
+
+
+def test_cached_to_disk_non_dataframe(tmp_path):
+    @cached_to_disk(cache_dir=tmp_path, fmt='parquet')
+    def to_dict(arr):
+        return {'sum': arr.sum(), 'arr': arr}
+
+    dat = to_dict(np.arange(10))
+    dat_ = to_dict(np.arange(10))
+    assert dat_['sum'] == 45 and np.array_equal(dat_['arr'], dat['arr'])
+    assert [x.endswith(".pkl") for x in os.listdir(tmp_path)] == [True]
+
+    with pytest.raises(ValueError, match='`fmt` must be one of'):
+        cached_to_disk(fmt='csv')(to_dict)
+
+
+def test_cached_to_disk_eviction(tmp_path):
+    @cached_to_disk(cache_dir=tmp_path, max_size=3500)
+    def make_array(n):
+        return np.zeros(n // 8)
+
+    cached_files = []
+    for i, n in enumerate([1000, 1008]):
+        make_array(n)
+        cached_files += [x for x in tmp_path.iterdir() if x not in cached_files]
+        os.utime(cached_files[-1], (i, i))
+
+    make_array(1000)  # A cache hit marks the first result as recently used
+    make_array(2000)
+    # The least recently used result is evicted to keep the cache within 3500 bytes
+    assert cached_files[0].exists() and not cached_files[1].exists()
+    assert len(os.listdir(tmp_path)) == 2
+
+    cached_files[0].write_bytes(b"Corrupted")
+    assert make_array(1000).shape == (125,)  # Recomputed after failing to load
+
+
+if __name__ == '__main__':
+    pytest.main()
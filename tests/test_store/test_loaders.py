@@ -14,8 +14,8 @@ import sklearn.linear_model
 from shapely.geometry import Point
 
 from pyhelpers._cache import _format_display_path, _get_relative_path, example_dataframe
-from pyhelpers.store.loaders import load_csr_matrix, load_data, load_geopackage, load_parquet, \
-    load_spreadsheets
+from pyhelpers.store.loaders import load_csr_matrix, load_csv, load_data, load_feather, \
+    load_geopackage, load_many, load_parquet, load_spreadsheets
 
 
 def test_load_spreadsheets(capfd):
@@ -38,6 +38,34 @@ def test_load_spreadsheets(capfd):
         assert all(isinstance(x, pd.DataFrame) for x in wb_data)
 
 
+@pytest.mark.parametrize(
+    'ext', [".csv", ".csv.gz", ".csv.bz2", ".csv.xz", ".csv.gzip", ".txt.lzma"])
+def test_load_csv(ext, tmp_path):
+    original_data = example_dataframe()
+    path_to_csv = tmp_path / f"dat{ext}"
+    compression = {'.gzip': 'gzip', '.lzma': 'xz'}.get(path_to_csv.suffix, 'infer')
+    original_data.to_csv(path_to_csv, compression=compression)
+
+    csv_dat = load_data(path_to_csv, index_col=0)
+    assert csv_dat.equals(original_data)  # Parsed by pandas, rather than as strings
+    assert next(load_csv(path_to_csv, index_col=0, chunksize=10)).equals(original_data)
+
+    csv_chunks = load_csv(path_to_csv, index_col='City', chunksize=3)
+    assert [len(x) for x in csv_chunks] == [3, 1]
+
+    # Fallback to csv.reader(), given a parameter that pandas.read_csv() does not accept
+    csv_chunks = list(load_csv(path_to_csv, index_col=0, iterator=True, strict=True))
+    assert len(csv_chunks) == 1
+    assert csv_chunks[0].index.to_list() == original_data.index.to_list()
+    assert csv_chunks[0].iloc[0, 0] == str(original_data.iloc[0, 0])
+
+    csv_dat = load_csv(path_to_csv, header=None, strict=True)
+    assert csv_dat.shape == (5, 3)
+    assert csv_dat.index.to_list() == list(range(5))
+
+    assert load_csv(tmp_path / "missing.csv", chunksize=2) is None
+
+
 @pytest.mark.parametrize('engine', ['not-an-engine', None, 'pyarrow', 'fastparquet'])
 @pytest.mark.parametrize('file_ext', [".parquet", ".geoparquet"])
 @pytest.mark.parametrize('data_type', ['df', 'gdf'])
@@ -74,6 +102,40 @@ def test_load_parquet(engine, file_ext, data_type, tmp_path, capfd):
     assert retrieved_data.equals(original_data)
 
 
+def test_load_feather(tmp_path):
+    original_data = example_dataframe()
+    path_to_feather = tmp_path / "dat.feather"
+    original_data.reset_index().to_feather(path_to_feather)
+
+    feather_dat = load_feather(path_to_feather, index_col=0, columns=['City', 'Latitude'])
+    assert feather_dat.equals(original_data[['Latitude']])
+
+    feather_dat = load_feather(
+        path_to_feather, index_col='City', memory_map=True, dtype_backend='pyarrow')
+    assert all(isinstance(x, pd.ArrowDtype) for x in feather_dat.dtypes)
+    assert feather_dat.index.to_list() == original_data.index.to_list()
+
+    feather_tbl = load_feather(path_to_feather, columns=['Longitude'], as_table=True)
+    assert feather_tbl.column_names == ['Longitude']
+    assert feather_tbl.num_rows == len(original_data)
+
+
+def test_load_parquet_projection(tmp_path):
+    original_data = example_dataframe()
+    path_to_parquet = tmp_path / "dat.parquet"
+    original_data.to_parquet(path_to_parquet, row_group_size=2)
+
+    parquet_dat = load_data(
+        path_to_parquet, columns=['Latitude'], filters=[('Latitude', '>', 53)], memory_map=True)
+    assert parquet_dat.equals(original_data.loc[['Manchester', 'Leeds'], ['Latitude']])
+
+    parquet_tbl = load_parquet(path_to_parquet, columns=['Longitude'], as_table=True)
+    assert parquet_tbl.column_names == ['Longitude']
+
+    parquet_dat = load_parquet(path_to_parquet, dtype_backend='pyarrow')
+    assert all(isinstance(x, pd.ArrowDtype) for x in parquet_dat.dtypes)
+
+
 def test_load_geopackage(tmp_path):
     """
     Test loading single and multi-layer GeoPackage files.
@@ -224,5 +286,34 @@ def test_load_data(file_ext, engine, capfd, caplog):
         assert retrieved_data is None
 
 
+@pytest.mark.parametrize('backend', ['thread', 'process'])
+def test_load_many(backend, tmp_path):
+    original_data = example_dataframe()
+    for i in range(4):
+        original_data.iloc[i:i + 1].to_parquet(tmp_path / f"part-{i}.parquet")
+    (tmp_path / "sub").mkdir()
+    original_data[['Latitude']].iloc[:1].to_parquet(tmp_path / "sub" / "part.parquet")
+    (tmp_path / "notes.md").write_text("Not loaded")
+
+    dat = load_many(tmp_path, n_workers=2, backend=backend)
+    assert list(dat) == [(tmp_path / f"part-{i}.parquet").as_posix() for i in range(4)]
+
+    dat, info = load_many(
+        [tmp_path / "sub" / "part.parquet", str(tmp_path / "part-*.parquet")], concat=True,
+        backend=backend, ret_info=True, columns=['Latitude'])
+    expected_data = original_data[['Latitude']]
+    assert dat.equals(pd.concat([expected_data.iloc[:1], expected_data]))
+    assert info['error'].isna().all() and len(info) == 5
+
+    dat = load_many(str(tmp_path / "**" / "*.parquet"), concat=True, backend=backend)
+    assert dat.shape == (5, 2) and dat['Longitude'].isna().sum() == 1  # Aligned columns
+
+    dat, info = load_many([tmp_path / "notes.md", tmp_path / "part-0.parquet"], ret_info=True)
+    assert list(dat) == [str(tmp_path / "part-0.parquet")]
+    assert isinstance(info['error'].iloc[0], ValueError)
+    with pytest.raises(ValueError, match='not recognized'):
+        load_many(tmp_path / "notes.md", raise_error=True)
+
+
 if __name__ == '__main__':
     pytest.main()
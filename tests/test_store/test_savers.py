@@ -52,6 +52,27 @@ def test_save_pickle(ext, tmp_path, capfd):
         save_pickle(dat, path_to_file=path_to_file, raise_error=True)
 
 
+@pytest.mark.parametrize('ext', [".pkl.gz", ".pkl.zst", ".pkl.lz4"])
+@pytest.mark.parametrize('out_of_band', [False, True])
+def test_save_pickle_compression(ext, out_of_band, tmp_path):
+    if ext == ".pkl.zst":
+        pytest.importorskip('zstandard')
+    elif ext == ".pkl.lz4":
+        pytest.importorskip('lz4')
+
+    path_to_file = tmp_path / f"test_save_pickle{ext}"
+    dat = {'df': example_dataframe(), 'arr': np.arange(100)}
+
+    save_pickle(dat, path_to_file, compresslevel=1, n_threads=2, out_of_band=out_of_band,
+                raise_error=True)
+    dat_ = load_pickle(path_to_file, raise_error=True)
+    assert dat_['df'].equals(dat['df']) and np.array_equal(dat_['arr'], dat['arr'])
+    assert dat_['arr'].flags.writeable
+
+    with pytest.raises(ValueError, match='protocol 5'):
+        save_pickle(dat, path_to_file, out_of_band=True, protocol=4, raise_error=True)
+
+
 @pytest.mark.parametrize('ext', [".csv", ".xlsx", ".xls", ".pkl", ".ods", ".odt"])
 @pytest.mark.parametrize('engine', [None, 'xlwt', 'openpyxl'])
 @pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
@@ -184,6 +205,14 @@ def test_save_feather(index, tmp_path, capfd):
     out, _ = capfd.readouterr()
     assert f'Updating "{filename}"' in out and "Done." in out
 
+    import pyarrow as pa
+    import pyarrow.feather
+
+    save_feather(pa.Table.from_pandas(dat), path_to_file=path_to_file, verbose=True)
+    out, _ = capfd.readouterr()
+    assert f'Updating "{filename}"' in out and "Done." in out
+    assert pyarrow.feather.read_table(path_to_file).num_rows == len(dat)
+
     dat = threading.Thread(target=lambda: print("Hello"))
     with pytest.raises(Exception):
         # noinspection PyTypeChecker